@@ -16,10 +16,10 @@ if ! command -v python3 &> /dev/null; then
     exit 1
 fi
 
-# Vérifie Pygame
-if ! python3 -c "import pygame" 2>/dev/null; then
-    echo "📦 Installation de Pygame..."
-    pip3 install pygame
+# Vérifie Pygame et NumPy
+if ! python3 -c "import pygame, numpy" 2>/dev/null; then
+    echo "📦 Installation de Pygame et NumPy..."
+    pip3 install pygame numpy
 fi
 
 echo "✅ Prêt!"
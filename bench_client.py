@@ -0,0 +1,588 @@
+#!/usr/bin/env python3
+"""
+📊 Benchmarks du client Space Battle (sans fenêtre: SDL_VIDEODRIVER=dummy)
+Usage: python bench_client.py [lasers] [particules] [texte] [sprites] [fond] [etoiles] [rotations] [collisions] [hud] [qualite]
+"""
+
+import math
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import numpy as np
+import pygame
+
+from client import (SpaceBattleClient, Spaceship, MAP_WIDTH, MAP_HEIGHT, SCREEN_WIDTH, SCREEN_HEIGHT,
+                    CYAN, FLAME_GREEN, SpaceArena, draw_hull, hull_key)
+from particles import ParticlePool
+import textcache
+from textcache import TextCache
+from sprites import sprite_cache
+from starfield import StarField
+from rotations import rotation_cache
+from spatial import SpatialGrid
+from quality import QUALITY_TIERS
+
+FPS = 60  # Budget d'une image
+
+
+def make_client(num_ships=4):
+    """Client hors ligne avec un vaisseau local et quelques adversaires immobiles"""
+    client = SpaceBattleClient("127.0.0.1")
+    client.player_id = 1
+    client.local_ship = Spaceship(1, MAP_WIDTH / 2, MAP_HEIGHT / 2, "blue")
+    for i in range(2, num_ships + 2):
+        client.other_ships[i] = Spaceship(i, random.uniform(0, MAP_WIDTH), random.uniform(0, MAP_HEIGHT), "red")
+    client.camera_x = MAP_WIDTH / 2 - SCREEN_WIDTH / 2
+    client.camera_y = MAP_HEIGHT / 2 - SCREEN_HEIGHT / 2
+    return client
+
+
+# ═══════════════════════════════════════════════════
+# Référence: un objet Python par laser (ancien code client)
+# ═══════════════════════════════════════════════════
+
+class LegacyLaser:
+    def __init__(self, x, y, angle, owner_id):
+        self.x = x
+        self.y = y
+        self.vx = math.cos(angle) * 10
+        self.vy = math.sin(angle) * 10
+        self.owner_id = owner_id
+        self.lifetime = 120
+        self.size = 3
+
+
+def legacy_frame(client, lasers):
+    lasers_to_remove = []
+    for laser in lasers:
+        laser.x += laser.vx
+        laser.y += laser.vy
+        laser.lifetime -= 1
+        hit = False
+        for ship in client.other_ships.values():
+            if ship.is_dead or ship.id == laser.owner_id:
+                continue
+            if math.sqrt((laser.x - ship.x)**2 + (laser.y - ship.y)**2) < ship.size + laser.size:
+                lasers_to_remove.append(laser)
+                hit = True
+                break
+        if not hit and (laser.lifetime <= 0 or laser.x < 0 or laser.x > MAP_WIDTH
+                        or laser.y < 0 or laser.y > MAP_HEIGHT):
+            lasers_to_remove.append(laser)
+    for laser in lasers_to_remove:
+        if laser in lasers:
+            lasers.remove(laser)
+    
+    for laser in lasers:
+        lx = laser.x - client.camera_x
+        ly = laser.y - client.camera_y
+        if 0 <= lx <= SCREEN_WIDTH and 0 <= ly <= SCREEN_HEIGHT:
+            pygame.draw.circle(client.screen, CYAN, (int(lx), int(ly)), 3)
+            trail_x = lx - laser.vx * 2
+            trail_y = ly - laser.vy * 2
+            pygame.draw.line(client.screen, (0, 150, 200), (int(trail_x), int(trail_y)), (int(lx), int(ly)), 2)
+
+
+def random_shot():
+    return (random.randint(2, 5), random.uniform(0, MAP_WIDTH), random.uniform(0, MAP_HEIGHT),
+            random.uniform(-math.pi, math.pi))
+
+
+def bench_lasers(counts=(50, 500, 5000), frames=120):
+    """Temps par image (mise à jour + dessin des lasers), nombre de lasers maintenu constant"""
+    print(f"\n🔫 Lasers: ms par image (mise à jour + dessin), budget {1000 / FPS:.1f} ms à {FPS} FPS")
+    print(f"   {'lasers':>7} {'objets':>9} {'numpy':>9}")
+    
+    for count in counts:
+        random.seed(count)
+        client = make_client()
+        
+        lasers = []
+        elapsed = 0.0
+        for _ in range(frames):
+            while len(lasers) < count:
+                owner, x, y, angle = random_shot()
+                lasers.append(LegacyLaser(x, y, angle, owner))
+            start = time.perf_counter()
+            legacy_frame(client, lasers)
+            elapsed += time.perf_counter() - start
+        legacy_ms = elapsed / frames * 1000
+        
+        random.seed(count)
+        shot_id = 0
+        elapsed = 0.0
+        for _ in range(frames):
+            while client.lasers.count < count:
+                owner, x, y, angle = random_shot()
+                shot_id += 1
+                client.lasers.spawn(owner, shot_id, x, y, angle)
+            start = time.perf_counter()
+            client.update_lasers()
+            client.draw_lasers()
+            elapsed += time.perf_counter() - start
+        numpy_ms = elapsed / frames * 1000
+        
+        print(f"   {count:>7} {legacy_ms:>7.2f}ms {numpy_ms:>7.2f}ms")
+
+
+# ═══════════════════════════════════════════════════
+# Référence: un dict par particule de flamme (ancien code client)
+# ═══════════════════════════════════════════════════
+
+def legacy_flame(x, y):
+    return {
+        'x': x + random.uniform(-5, 5),
+        'y': y + random.uniform(-5, 5),
+        'vx': random.uniform(-5, 5),
+        'vy': random.uniform(-5, 5),
+        'life': random.randint(10, 25),
+        'max_life': 25,
+        'size': random.uniform(4, 10),
+        'color_type': random.choice(['orange', 'yellow', 'red'])
+    }
+
+
+def legacy_particles_frame(client, particles):
+    particles_to_remove = []
+    for particle in particles:
+        particle['x'] += particle['vx']
+        particle['y'] += particle['vy']
+        particle['vx'] *= 0.92
+        particle['vy'] *= 0.92
+        particle['size'] *= 0.95
+        particle['life'] -= 1
+        if particle['life'] <= 0 or particle['size'] < 1:
+            particles_to_remove.append(particle)
+    for particle in particles_to_remove:
+        particles.remove(particle)
+    
+    for particle in particles:
+        px = particle['x'] - client.camera_x
+        py = particle['y'] - client.camera_y
+        if 0 <= px <= SCREEN_WIDTH and 0 <= py <= SCREEN_HEIGHT:
+            life_ratio = particle['life'] / particle['max_life']
+            if particle['color_type'] == 'orange':
+                color = (255, int(140 * life_ratio), 0)
+            elif particle['color_type'] == 'yellow':
+                color = (255, int(255 * life_ratio), 0)
+            else:
+                color = (255, int(50 * life_ratio), 0)
+            size = int(particle['size'])
+            if size > 0:
+                glow_surf = pygame.Surface((size * 4, size * 4), pygame.SRCALPHA)
+                pygame.draw.circle(glow_surf, (*color, int(100 * life_ratio)), (size * 2, size * 2), size * 2)
+                pygame.draw.circle(glow_surf, (*color, int(200 * life_ratio)), (size * 2, size * 2), size)
+                client.screen.blit(glow_surf, (px - size * 2, py - size * 2))
+
+
+def bench_particles(counts=(100, 1000, 5000), frames=120):
+    """Temps par image (mise à jour + dessin des flammes), population renouvelée à chaque image"""
+    print(f"\n🔥 Particules: ms par image (mise à jour + dessin), budget {1000 / FPS:.1f} ms à {FPS} FPS")
+    print(f"   {'particules':>10} {'dicts':>9} {'réserve':>9}")
+    
+    # Toutes les particules dans l'écran: le pire cas pour le dessin
+    cx = MAP_WIDTH / 2
+    cy = MAP_HEIGHT / 2
+    
+    for count in counts:
+        # Une vie moyenne de ~17 images: on émet count/17 particules par image
+        per_frame = max(1, count // 17)
+        random.seed(count)
+        client = make_client()
+        
+        particles = []
+        elapsed = 0.0
+        for _ in range(frames):
+            start = time.perf_counter()
+            particles.extend(legacy_flame(cx, cy) for _ in range(per_frame))
+            legacy_particles_frame(client, particles)
+            elapsed += time.perf_counter() - start
+        legacy_ms = elapsed / frames * 1000
+        legacy_alive = len(particles)
+        
+        np.random.seed(count)
+        client.flame_particles = ParticlePool(max(256, count * 2))
+        elapsed = 0.0
+        for _ in range(frames):
+            start = time.perf_counter()
+            client.flame_particles.emit(
+                x=cx + np.random.uniform(-5, 5, per_frame),
+                y=cy + np.random.uniform(-5, 5, per_frame),
+                vx=np.random.uniform(-5, 5, per_frame),
+                vy=np.random.uniform(-5, 5, per_frame),
+                life=np.random.randint(10, 26, per_frame),
+                max_life=25,
+                size=np.random.uniform(4, 10, per_frame),
+                kind=np.random.randint(0, len(FLAME_GREEN), per_frame)
+            )
+            client.update_flame_particles()
+            client.draw_flame_particles()
+            elapsed += time.perf_counter() - start
+        pool_ms = elapsed / frames * 1000
+        
+        print(f"   {legacy_alive:>10} {legacy_ms:>7.2f}ms {pool_ms:>7.2f}ms"
+              f"   ({len(client.flame_particles)} dans la réserve)")
+
+
+class UncachedText:
+    """Référence: police chargée et texte rendu à chaque appel (ancien code client)"""
+    def render(self, text, size, color):
+        return pygame.font.Font(None, size).render(text, True, color)
+
+
+def bench_text(counts=(4, 16, 64), frames=120):
+    """Temps d'une image complète (draw) avec des vaisseaux nommés à l'écran, sans puis avec le cache"""
+    print(f"\n🔤 Texte: ms par image complète, budget {1000 / FPS:.1f} ms à {FPS} FPS")
+    print(f"   {'vaisseaux':>9} {'sans cache':>11} {'cache':>9}  hits/misses")
+    
+    for count in counts:
+        random.seed(count)
+        client = make_client(count)
+        for i, ship in client.other_ships.items():
+            ship.name = f"Pilote {i}"
+            ship.x = client.camera_x + random.uniform(50, SCREEN_WIDTH - 50)
+            ship.y = client.camera_y + random.uniform(80, SCREEN_HEIGHT - 50)
+        
+        results = []
+        for cache in (UncachedText(), TextCache()):
+            textcache.text_cache = cache
+            client.draw()  # Premier rendu hors mesure
+            start = time.perf_counter()
+            for _ in range(frames):
+                client.draw()
+            results.append((time.perf_counter() - start) / frames * 1000)
+        
+        stats = textcache.text_cache.stats()
+        print(f"   {count:>9} {results[0]:>9.2f}ms {results[1]:>7.2f}ms  {stats['hits']}/{stats['misses']}")
+    
+    textcache.text_cache = TextCache()
+
+
+def bench_sprites(counts=(4, 16, 64), frames=120):
+    """Image complète avec vaisseaux protégés (bouclier), nébuleuses et zones de boost à l'écran"""
+    print(f"\n🌟 Sprites: ms par image complète, budget {1000 / FPS:.1f} ms à {FPS} FPS")
+    print(f"   {'vaisseaux':>9} {'recréés':>9} {'cache':>9}  sprites créés/image")
+    
+    for count in counts:
+        random.seed(count)
+        client = make_client(count)
+        for ship in client.other_ships.values():
+            ship.spawn_protected = True
+            ship.x = client.camera_x + random.uniform(50, SCREEN_WIDTH - 50)
+            ship.y = client.camera_y + random.uniform(80, SCREEN_HEIGHT - 50)
+        # Deux nébuleuses dans le champ de la caméra
+        for nebula in client.arena.nebulas[:2]:
+            nebula['x'] = client.camera_x + random.uniform(0, SCREEN_WIDTH)
+            nebula['y'] = client.camera_y + random.uniform(0, SCREEN_HEIGHT)
+        
+        # Sans cache: chaque sprite est redessiné à chaque image (comme avant)
+        start = time.perf_counter()
+        for _ in range(frames):
+            sprite_cache.clear()
+            client.arena.update()
+            client.draw()
+        rebuilt_ms = (time.perf_counter() - start) / frames * 1000
+        
+        client.draw()
+        misses = sprite_cache.misses
+        start = time.perf_counter()
+        for _ in range(frames):
+            client.arena.update()
+            client.draw()
+        cached_ms = (time.perf_counter() - start) / frames * 1000
+        created = (sprite_cache.misses - misses) / frames
+        
+        print(f"   {count:>9} {rebuilt_ms:>7.2f}ms {cached_ms:>7.2f}ms  {created:.2f}")
+
+
+def bench_background(frames=300):
+    """Fond + arène puis image complète, caméra qui balaie la map (nébuleuses et murs à l'écran)"""
+    print(f"\n🏟️  Fond: ms par image, budget {1000 / FPS:.1f} ms à {FPS} FPS")
+    random.seed(0)
+    client = make_client()
+    
+    def pan(frame):
+        # Aller-retour en diagonale sur toute la map
+        t = abs((frame % 200) / 100 - 1)
+        client.camera_x = t * (MAP_WIDTH - SCREEN_WIDTH)
+        client.camera_y = t * (MAP_HEIGHT - SCREEN_HEIGHT)
+    
+    elapsed = 0.0
+    for frame in range(frames):
+        pan(frame)
+        client.arena.update()
+        start = time.perf_counter()
+        client.arena.draw_background(client.screen, client.camera_x, client.camera_y)
+        client.arena.draw_arena(client.screen, client.camera_x, client.camera_y)
+        elapsed += time.perf_counter() - start
+    arena_ms = elapsed / frames * 1000
+    
+    elapsed = 0.0
+    for frame in range(frames):
+        pan(frame)
+        client.arena.update()
+        start = time.perf_counter()
+        client.draw()
+        elapsed += time.perf_counter() - start
+    frame_ms = elapsed / frames * 1000
+    
+    print(f"   fond + arène {arena_ms:>6.2f}ms   image complète {frame_ms:>6.2f}ms")
+    
+    # Très grande map: caméra à la vitesse max d'un vaisseau en boost (15 px/image)
+    size = 20000
+    arena = SpaceArena(size, size)
+    speed = 15
+    times = []
+    x = y = 0.0
+    for frame in range(frames * 4):
+        x = min(size - SCREEN_WIDTH, x + speed)
+        y = min(size - SCREEN_HEIGHT, y + speed * 0.6)
+        start = time.perf_counter()
+        arena.draw_background(client.screen, x, y)
+        times.append((time.perf_counter() - start) * 1000)
+    times.sort()
+    stats = arena.background.stats()
+    print(f"   map {size}x{size}: médiane {times[len(times) // 2]:.2f}ms, "
+          f"p99 {times[int(len(times) * 0.99)]:.2f}ms, pire {times[-1]:.2f}ms, "
+          f"{stats['chunks']} morceaux en cache ({stats['bytes'] / 1024 / 1024:.0f} Mo), "
+          f"{stats['prefetched']}/{stats['rendered']} préchargés")
+
+
+def legacy_stars(count):
+    return [{
+        'x': random.randint(0, MAP_WIDTH),
+        'y': random.randint(0, MAP_HEIGHT),
+        'size': random.randint(1, 3),
+        'brightness': random.randint(100, 255),
+        'twinkle_speed': random.uniform(0.02, 0.08)
+    } for _ in range(count)]
+
+
+def legacy_stars_frame(screen, stars, camera_x, camera_y, frame):
+    for star in stars:
+        sx = (star['x'] - camera_x) % SCREEN_WIDTH
+        sy = (star['y'] - camera_y) % SCREEN_HEIGHT
+        twinkle = math.sin(frame * star['twinkle_speed']) * 0.3 + 0.7
+        brightness = int(star['brightness'] * twinkle)
+        pygame.draw.circle(screen, (brightness, brightness, brightness), (int(sx), int(sy)), star['size'])
+
+
+def bench_stars(frames=300):
+    """Champ d'étoiles seul: une boucle Python par étoile contre les tableaux NumPy (parallaxe)"""
+    print(f"\n✨ Étoiles: ms par image, budget {1000 / FPS:.1f} ms à {FPS} FPS")
+    random.seed(0)
+    np.random.seed(0)
+    client = make_client()
+    screen = client.screen
+    
+    def timed(draw):
+        start = time.perf_counter()
+        for frame in range(frames):
+            draw(frame * 3.0, frame * 2.0, frame)
+        return (time.perf_counter() - start) / frames * 1000
+    
+    stars = legacy_stars(200)
+    print(f"   {'boucle, 200 étoiles':<34} {timed(lambda x, y, f: legacy_stars_frame(screen, stars, x, y, f)):>6.2f}ms")
+    
+    fields = [
+        ("numpy, 200 étoiles (1 plan)", StarField(SCREEN_WIDTH, SCREEN_HEIGHT, ((1.0, 200, 3),))),
+        (f"numpy, {len(StarField(SCREEN_WIDTH, SCREEN_HEIGHT))} étoiles (défaut, 3 plans)",
+         StarField(SCREEN_WIDTH, SCREEN_HEIGHT)),
+        ("numpy, 5000 étoiles (4 plans)", StarField(SCREEN_WIDTH, SCREEN_HEIGHT,
+                                                    ((0.2, 2500, 1), (0.4, 1500, 1), (0.7, 700, 2), (1.0, 300, 3)))),
+    ]
+    for label, field in fields:
+        print(f"   {label:<34} {timed(lambda x, y, f: field.draw(screen, x, y, f)):>6.2f}ms")
+
+
+def legacy_asteroid(screen, asteroid, ax, ay):
+    points = []
+    for angle, dist in asteroid['points']:
+        real_angle = angle + asteroid['rotation']
+        points.append((ax + math.cos(real_angle) * asteroid['radius'] * dist,
+                       ay + math.sin(real_angle) * asteroid['radius'] * dist))
+    pygame.draw.polygon(screen, (80, 70, 60), points)
+    pygame.draw.polygon(screen, (120, 110, 100), points, 3)
+    for i in range(3):
+        cx = ax + math.cos(asteroid['rotation'] + i * 2) * asteroid['radius'] * 0.4
+        cy = ay + math.sin(asteroid['rotation'] + i * 2) * asteroid['radius'] * 0.4
+        pygame.draw.circle(screen, (60, 50, 40), (int(cx), int(cy)), asteroid['radius'] // 6)
+
+
+def bench_rotations(counts=(4, 16, 64), frames=300):
+    """Coques et astéroïdes: polygones recalculés à chaque image contre sprites pivotés d'avance"""
+    print(f"\n🌀 Rotations: ms par image (vaisseaux + 12 astéroïdes), budget {1000 / FPS:.1f} ms à {FPS} FPS")
+    random.seed(0)
+    client = make_client()
+    screen = client.screen
+    asteroids = client.arena.asteroids
+    
+    stats = rotation_cache.stats()
+    print(f"   cache: {stats['shapes']} formes, {stats['frames']} images, "
+          f"{stats['bytes'] / 1024 / 1024:.1f} Mo, construit en {stats['build_ms']:.0f} ms")
+    
+    print(f"   {'vaisseaux':>9} {'polygones':>10} {'sprites':>9}")
+    for count in counts:
+        ships = [(random.uniform(50, SCREEN_WIDTH - 50), random.uniform(50, SCREEN_HEIGHT - 50),
+                  random.uniform(-math.pi, math.pi), (255, 50, 50)) for _ in range(count)]
+        spots = [(random.uniform(100, SCREEN_WIDTH - 100), random.uniform(100, SCREEN_HEIGHT - 100))
+                 for _ in asteroids]
+        
+        start = time.perf_counter()
+        for frame in range(frames):
+            for asteroid, (ax, ay) in zip(asteroids, spots):
+                asteroid['rotation'] += asteroid['rot_speed']
+                legacy_asteroid(screen, asteroid, ax, ay)
+            for x, y, angle, color in ships:
+                draw_hull(screen, x, y, angle + frame * 0.05, 20, color)
+        legacy_ms = (time.perf_counter() - start) / frames * 1000
+        
+        start = time.perf_counter()
+        for frame in range(frames):
+            for asteroid, (ax, ay) in zip(asteroids, spots):
+                asteroid['rotation'] += asteroid['rot_speed']
+                rotation_cache.blit(screen, asteroid['sprite'], asteroid['rotation'], ax, ay)
+            for x, y, angle, color in ships:
+                rotation_cache.blit(screen, hull_key(20, color), angle + frame * 0.05, x, y)
+        sprite_ms = (time.perf_counter() - start) / frames * 1000
+        
+        print(f"   {count:>9} {legacy_ms:>8.2f}ms {sprite_ms:>7.2f}ms")
+    stats = rotation_cache.stats()
+    print(f"   après: {stats['frames']} images, {stats['bytes'] / 1024 / 1024:.1f} Mo, "
+          f"{stats['built']} dessinées, {stats['evictions']} évincées")
+
+
+def bench_collisions(counts=(10, 1000, 100000), queries=2000):
+    """Collision vaisseau/obstacle: parcours de tous les obstacles contre la grille spatiale"""
+    print(f"\n🪨 Collisions: µs par requête (vaisseau de rayon 20), un obstacle par carré de 200 px")
+    print(f"   {'obstacles':>9} {'parcours':>10} {'grille':>9} {'construction':>13}")
+    
+    for count in counts:
+        random.seed(count)
+        side = 200 * math.sqrt(count)
+        obstacles = [{'x': random.uniform(0, side), 'y': random.uniform(0, side), 'radius': random.randint(30, 80)}
+                     for _ in range(count)]
+        points = [(random.uniform(0, side), random.uniform(0, side)) for _ in range(queries)]
+        
+        # Ancien code: check_asteroid_collision sur la liste
+        start = time.perf_counter()
+        linear_hits = 0
+        for x, y in points:
+            for obstacle in obstacles:
+                if math.sqrt((x - obstacle['x'])**2 + (y - obstacle['y'])**2) < obstacle['radius'] + 20:
+                    linear_hits += 1
+                    break
+        linear_us = (time.perf_counter() - start) / queries * 1e6
+        
+        start = time.perf_counter()
+        grid = SpatialGrid(cell_size=200)
+        for i, obstacle in enumerate(obstacles):
+            grid.insert(i, obstacle['x'], obstacle['y'], obstacle['radius'])
+        build_ms = (time.perf_counter() - start) * 1000
+        
+        start = time.perf_counter()
+        grid_hits = 0
+        for x, y in points:
+            if grid.query_circle(x, y, 20):
+                grid_hits += 1
+        grid_us = (time.perf_counter() - start) / queries * 1e6
+        
+        assert grid_hits == linear_hits
+        print(f"   {count:>9} {linear_us:>8.1f}µs {grid_us:>7.1f}µs {build_ms:>11.1f}ms")
+
+
+def bench_hud(counts=(4, 16, 64), frames=300):
+    """HUD + minimap: tout redessiné à chaque image, puis panneaux en cache (joueurs en mouvement)"""
+    print(f"\n🖥️ HUD: ms par image (HUD + minimap), budget {1000 / FPS:.1f} ms à {FPS} FPS")
+    print(f"   {'vaisseaux':>9} {'redessiné':>10} {'cache':>9}  rendus/image")
+    
+    for count in counts:
+        random.seed(count)
+        client = make_client(count)
+        client.current_round = 1
+        client.time_remaining = 180
+        client.boost_amount = 50
+        panels = (client.round_panel, client.stats_panel, client.scoreboard_panel, client.arena.minimap)
+        
+        def frame(i):
+            # Une image à 60 FPS: le timer perd 1/60 s, les vaisseaux bougent
+            client.time_remaining -= 1 / FPS
+            for ship in client.other_ships.values():
+                ship.x = (ship.x + 3) % MAP_WIDTH
+            client._draw_hud()
+            client.arena.draw_minimap(client.screen, client.local_ship.x, client.local_ship.y, client.other_ships)
+        
+        results = []
+        for invalidate in (True, False):
+            redraws = sum(panel.redraws for panel in panels)
+            start = time.perf_counter()
+            for i in range(frames):
+                if invalidate:
+                    for panel in panels:
+                        panel.invalidate()
+                frame(i)
+            results.append((time.perf_counter() - start) / frames * 1000)
+        per_frame = (sum(panel.redraws for panel in panels) - redraws) / frames
+        
+        print(f"   {count:>9} {results[0]:>8.2f}ms {results[1]:>7.2f}ms  {per_frame:.2f}")
+
+
+def bench_quality(count=16, frames=200):
+    """Image complète à chaque palier de qualité (boost actif, vaisseaux protégés, nébuleuses à l'écran)"""
+    print(f"\n🎚️  Qualité: ms par image complète, budget {1000 / FPS:.1f} ms à {FPS} FPS")
+    random.seed(count)
+    client = make_client(count)
+    client.send_message = lambda message: None
+    for ship in client.other_ships.values():
+        ship.spawn_protected = True
+        ship.x = client.camera_x + random.uniform(50, SCREEN_WIDTH - 50)
+        ship.y = client.camera_y + random.uniform(80, SCREEN_HEIGHT - 50)
+    for nebula in client.arena.nebulas[:2]:
+        nebula['x'] = client.camera_x + random.uniform(0, SCREEN_WIDTH)
+        nebula['y'] = client.camera_y + random.uniform(0, SCREEN_HEIGHT)
+    client.arena.background.clear()
+    
+    for tier, settings in enumerate(QUALITY_TIERS):
+        client.quality.tier = tier
+        client.apply_quality()
+        client.draw()  # Morceaux du fond redessinés hors mesure
+        
+        start = time.perf_counter()
+        for _ in range(frames):
+            # Flammes de plusieurs boosts à l'écran (12 par image)
+            client.flame_particles.emit(
+                x=client.local_ship.x + np.random.uniform(-200, 200, 12),
+                y=client.local_ship.y + np.random.uniform(-200, 200, 12),
+                vx=np.random.uniform(-3, 3, 12), vy=np.random.uniform(-3, 3, 12),
+                life=60, max_life=60, size=np.random.uniform(4, 10, 12), kind=np.random.randint(0, 3, 12)
+            )
+            client.update_flame_particles()
+            client.draw()
+        elapsed = (time.perf_counter() - start) / frames * 1000
+        print(f"   {tier} {settings['name']:<9} {elapsed:>6.2f}ms  ({len(client.flame_particles)} flammes)")
+
+
+BENCHMARKS = {
+    "lasers": bench_lasers,
+    "particules": bench_particles,
+    "texte": bench_text,
+    "sprites": bench_sprites,
+    "fond": bench_background,
+    "etoiles": bench_stars,
+    "rotations": bench_rotations,
+    "collisions": bench_collisions,
+    "hud": bench_hud,
+    "qualite": bench_quality,
+}
+
+
+if __name__ == "__main__":
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        BENCHMARKS[name]()
+    pygame.quit()
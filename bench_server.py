@@ -0,0 +1,920 @@
+#!/usr/bin/env python3
+"""
+📊 Benchmarks du serveur Space Battle
+Usage: python bench_server.py [boucle] [protocole] [delta] [interet] [udp] [salles] [projectiles] [lent]
+                              [regroupement] [reception] [commandes] [minuteries]
+"""
+
+import contextlib
+import io
+import json
+import math
+import multiprocessing
+import os
+import selectors
+import socket
+import statistics
+import sys
+import random
+import threading
+import time
+import timeit
+import tracemalloc
+
+from server import SpaceBattleServer, ClientConnection, Player, HealthPickup
+from protocol import (PROTOCOL_JSON, PROTOCOL_BINARY, encode, decode_frames, diff_state,
+                      apply_delta, encode_datagram, decode_datagram, FrameReader)
+from udp_proxy import LossyUDPProxy
+from projectiles import ProjectileSystem, SHIP_RADIUS
+from scheduler import TimerHeap
+
+BENCH_PORT = 3599
+
+
+# ═══════════════════════════════════════════════════
+# Serveur de référence: un thread par joueur
+# ═══════════════════════════════════════════════════
+
+class ThreadedSpaceBattleServer(SpaceBattleServer):
+    """Ancien modèle: thread d'acceptation + un thread par joueur + envois bloquants (une salle)"""
+
+    def start(self):
+        self.server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.server_socket.bind(('0.0.0.0', self.port))
+        self.server_socket.listen(128)
+        self.running = True
+        self.room = self.create_room()
+        threading.Thread(target=self.accept_connections, daemon=True).start()
+        self.game_loop()
+
+    def accept_connections(self):
+        while self.running:
+            client_socket, address = self.server_socket.accept()
+            player_id = self.room.next_player_id
+            self.room.next_player_id += 1
+            client_socket.send((json.dumps({"type": "welcome", "player_id": player_id,
+                                            "color": "blue"}) + '\n').encode())
+            player_name = None
+            client_socket.settimeout(10)
+            data = client_socket.recv(4096)
+            client_socket.settimeout(None)
+            for line in data.decode().strip().split('\n'):
+                if line.strip():
+                    player_name = json.loads(line).get("name")
+                    break
+            conn = ClientConnection(client_socket, address, player_id)
+            conn.room = self.room
+            player = Player(player_id, conn, address, player_name)
+            conn.player = player
+            self.room.players[player_id] = player
+            self.room.protect(player)
+            if not self.room.game_started:
+                self.room.start_game()
+            threading.Thread(target=self.handle_player, args=(conn,), daemon=True).start()
+
+    def handle_player(self, conn):
+        buffer = ""
+        try:
+            while self.running:
+                data = conn.sock.recv(4096)
+                if not data:
+                    break
+                buffer += data.decode()
+                while '\n' in buffer:
+                    line, buffer = buffer.split('\n', 1)
+                    if line.strip():
+                        self.room.process_message(conn.player, json.loads(line))
+        except OSError:
+            pass
+        conn.player.active = False
+
+    def game_loop(self):
+        last_update = time.time()
+        while self.running:
+            current_time = time.time()
+            self.room.update(current_time)
+            if current_time - last_update >= 1 / self.tick_rate:
+                self.room.send_game_state()
+                last_update = current_time
+            time.sleep(0.01)
+
+    def send_to(self, conn, data, replaceable=False):
+        try:
+            conn.sock.send(data)
+        except OSError:
+            conn.player.active = False
+
+    def close_connection(self, conn):
+        if self.room.players.pop(conn.player_id, None):
+            conn.sock.close()
+
+
+class ImmediateSendServer(SpaceBattleServer):
+    """Ancien envoi: chaque message part aussitôt (un appel système par message)"""
+
+    def send_to(self, conn, data, replaceable=False):
+        super().send_to(conn, data, replaceable)
+        self.flush_pending()
+
+
+def run_server(server_class, port, max_players):
+    """Lance un serveur dans un processus séparé (sortie console coupée)"""
+    sys.stdout = open(os.devnull, 'w')
+    server_class(port=port, max_players=max_players).start()
+
+
+def start_server(server_class, max_players):
+    """Démarre un serveur sur un port neuf; renvoie (processus, port)"""
+    global BENCH_PORT
+    BENCH_PORT += 1
+    process = multiprocessing.Process(target=run_server,
+                                      args=(server_class, BENCH_PORT, max_players), daemon=True)
+    process.start()
+    return process, BENCH_PORT
+
+
+def open_client(port, name):
+    """Connexion complète d'un faux joueur: attend le welcome puis envoie le nom"""
+    for _ in range(100):
+        try:
+            sock = socket.create_connection(('127.0.0.1', port))
+            break
+        except ConnectionRefusedError:
+            time.sleep(0.05)
+    buffer = b""
+    while b'\n' not in buffer:
+        buffer += sock.recv(4096)
+    sock.sendall((json.dumps({"type": "set_name", "name": name}) + '\n').encode())
+    return sock
+
+
+class Drainer:
+    """Vide les sockets des faux joueurs; mesure l'arrivée des game_state sur une sonde"""
+    def __init__(self, sockets, probe):
+        self.selector = selectors.DefaultSelector()
+        for sock in sockets:
+            sock.setblocking(False)
+            self.selector.register(sock, selectors.EVENT_READ)
+        self.probe = probe
+        self.probe_buffer = b""
+        self.arrivals = []
+        self.running = True
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def run(self):
+        while self.running:
+            for key, _ in self.selector.select(0.1):
+                try:
+                    data = key.fileobj.recv(1 << 16)
+                except (BlockingIOError, OSError):
+                    continue
+                if key.fileobj is self.probe:
+                    now = time.perf_counter()
+                    self.probe_buffer += data
+                    while b'\n' in self.probe_buffer:
+                        line, self.probe_buffer = self.probe_buffer.split(b'\n', 1)
+                        if b'"game_state"' in line:
+                            self.arrivals.append(now)
+
+    def stop(self):
+        self.running = False
+        self.thread.join()
+
+
+def bench_event_loop(player_counts=(4, 32, 128), duration=3.0):
+    """Connexions/seconde et gigue du tick: boucle selectors vs un thread par joueur"""
+    print("\n🔁 Boucle réseau: connexions/s et gigue du tick (cible 50 ms)")
+    print(f"   {'serveur':<10} {'joueurs':>7} {'conn/s':>9} {'gigue σ':>9} {'p99 écart':>10}")
+
+    for label, server_class in (("threads", ThreadedSpaceBattleServer), ("selectors", SpaceBattleServer)):
+        for count in player_counts:
+            process, port = start_server(server_class, count)
+            first = open_client(port, "Bot0")
+
+            start = time.perf_counter()
+            sockets = [first] + [open_client(port, f"Bot{i}") for i in range(1, count)]
+            conn_rate = (count - 1) / (time.perf_counter() - start)
+
+            drainer = Drainer(sockets, sockets[0])
+            time.sleep(duration)
+            drainer.stop()
+
+            intervals = [b - a for a, b in zip(drainer.arrivals, drainer.arrivals[1:])]
+            deviations = sorted(abs(i - 0.05) * 1000 for i in intervals) or [0.0]
+            jitter = statistics.pstdev(intervals) * 1000 if len(intervals) > 1 else 0.0
+            p99 = deviations[int(len(deviations) * 0.99) - 1 if len(deviations) > 1 else 0]
+            print(f"   {label:<10} {count:>7} {conn_rate:>9.0f} {jitter:>7.2f}ms {p99:>8.2f}ms")
+
+            process.terminate()
+            process.join()
+            for sock in sockets:
+                sock.close()
+
+
+def make_match(num_players, num_pickups=2):
+    """Salle d'un serveur hors ligne remplie de joueurs à des positions aléatoires"""
+    room = SpaceBattleServer(max_players=num_players).create_room()
+    for i in range(1, num_players + 1):
+        player = Player(i, None, None, f"Pilote{i}")
+        player.x = random.uniform(0, 2000)
+        player.y = random.uniform(0, 1500)
+        player.angle = random.uniform(-3.14, 3.14)
+        player.vx = random.uniform(-8, 8)
+        player.vy = random.uniform(-8, 8)
+        player.score = random.randint(0, 500)
+        room.players[i] = player
+    for i in range(1, num_pickups + 1):
+        room.health_pickups[i] = HealthPickup(i, random.randint(200, 1800), random.randint(200, 1300))
+    room.round_active = True
+    return room
+
+
+def game_state_message(room):
+    """Construit le game_state comme send_game_state sans l'envoyer"""
+    return room.build_game_state()
+
+
+def bench_protocol(player_counts=(4, 16, 64, 256), tick_rate=20):
+    """Octets/seconde et coût encodage/décodage: JSON vs binaire"""
+    print("\n📦 Protocole: game_state + move à 20 Hz (total serveur = par client × joueurs)")
+    print(f"   {'joueurs':>7} {'format':<7} {'state o':>8} {'move o':>7} {'ko/s/client':>12} "
+          f"{'ko/s total':>11} {'enc µs':>8} {'dec µs':>8}")
+
+    for count in player_counts:
+        room = make_match(count)
+        state = game_state_message(room)
+        move = {"type": "move", "x": 1234.5678, "y": 876.54321, "angle": 1.2345678,
+                "vx": 3.14159, "vy": -2.71828}
+
+        for protocol in (PROTOCOL_JSON, PROTOCOL_BINARY):
+            state_bytes = encode(state, protocol)
+            move_bytes = encode(move, protocol)
+            per_client = (len(state_bytes) + len(move_bytes)) * tick_rate / 1024
+            total = per_client * count
+
+            number = max(10, 2000 // count)
+            enc = timeit.timeit(lambda: encode(state, protocol), number=number) / number * 1e6
+            dec = timeit.timeit(lambda: decode_frames(bytearray(state_bytes)), number=number) / number * 1e6
+
+            print(f"   {count:>7} {protocol:<7} {len(state_bytes):>8} {len(move_bytes):>7} "
+                  f"{per_client:>12.1f} {total:>11.1f} {enc:>8.1f} {dec:>8.1f}")
+
+
+def bench_delta(player_counts=(4, 16, 64), ticks=100, ack_delay=3, tick_rate=20):
+    """Octets/seconde par client: snapshots complets vs deltas sur base acquittée"""
+    print(f"\n🧊 Deltas: o/s par client (acquittement reçu {ack_delay} ticks plus tard)")
+    print(f"   {'joueurs':>7} {'en mouvement':>13} {'format':<7} {'complet':>9} {'delta':>9}")
+
+    for count in player_counts:
+        for moving in (0, 1, count):
+            for protocol in (PROTOCOL_JSON, PROTOCOL_BINARY):
+                room = make_match(count)
+                history = []
+                full_bytes = delta_bytes = 0
+                for tick in range(ticks):
+                    for player in list(room.players.values())[:moving]:
+                        player.x += player.vx
+                        player.y += player.vy
+                    state = game_state_message(room)
+                    full_bytes += len(encode(state, protocol))
+                    if len(history) > ack_delay:
+                        delta = diff_state(history[-ack_delay - 1], state)
+                        delta_bytes += len(encode(delta, protocol)) if delta else 0
+                    else:
+                        delta_bytes += len(encode(state, protocol))  # Keyframe initiale
+                    history.append(state)
+
+                seconds = ticks / tick_rate
+                print(f"   {count:>7} {moving:>13} {protocol:<7} "
+                      f"{full_bytes / seconds:>9.0f} {delta_bytes / seconds:>9.0f}")
+
+
+def bench_interest(player_counts=(16, 64, 256), map_size=(8000, 6000), ticks=100,
+                   ack_delay=3, tick_rate=20):
+    """Octets/seconde par client avec et sans zone d'intérêt (tous les joueurs bougent)"""
+    print(f"\n🎯 Zone d'intérêt: map {map_size[0]}x{map_size[1]}, binaire + deltas, o/s par client")
+    print(f"   {'joueurs':>7} {'sans ZI':>10} {'avec ZI':>10} {'µs sans':>9} {'µs avec':>9}")
+
+    for count in player_counts:
+        results = []
+        for interest in (False, True):
+            random.seed(count)
+            room = make_match(count)
+            room.map_width, room.map_height = map_size
+            room.interest_management = interest
+            sent = [0]
+
+            def count_bytes(conn, data, replaceable=False):
+                sent[0] += len(data)
+            room.server.send_to = count_bytes
+
+            for player in room.players.values():
+                player.x = random.uniform(0, map_size[0])
+                player.y = random.uniform(0, map_size[1])
+                player.connection = ClientConnection(None, None, player.id)
+                player.connection.protocol = PROTOCOL_BINARY
+                player.connection.delta = True
+
+            start = time.perf_counter()
+            for _ in range(ticks):
+                for player in room.players.values():
+                    player.x = min(map_size[0], max(0, player.x + player.vx))
+                    player.y = min(map_size[1], max(0, player.y + player.vy))
+                room.send_game_state()
+                for player in room.players.values():
+                    if room.snapshot_seq > ack_delay:
+                        player.connection.acked_seq = room.snapshot_seq - ack_delay
+            elapsed = (time.perf_counter() - start) / ticks * 1e6
+
+            results.append((sent[0] / count / (ticks / tick_rate), elapsed))
+
+        print(f"   {count:>7} {results[0][0]:>10.0f} {results[1][0]:>10.0f} "
+              f"{results[0][1]:>9.0f} {results[1][1]:>9.0f}")
+
+
+class UdpBot:
+    """Faux joueur: handshake TCP, positions/snapshots/acks en UDP via le proxy"""
+    def __init__(self, port, udp_port, name):
+        self.tcp = socket.create_connection(('127.0.0.1', port))
+        buffer = bytearray()
+        while b'\n' not in buffer:
+            buffer += self.tcp.recv(4096)
+        welcome = decode_frames(buffer)[0]
+        self.player_id = welcome["player_id"]
+        self.token = welcome["udp_token"]
+        self.tcp.sendall(encode({"type": "set_name", "name": name, "protocol": PROTOCOL_BINARY,
+                                 "delta": True}))
+
+        self.udp = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.udp_addr = ('127.0.0.1', udp_port)
+        self.send_seq = 0
+        self.recv_seq = 0
+        self.stale = 0
+        self.udp_ready = False
+        self.snapshots = {}
+        self.last_seq = 0
+        self.applied = 0
+        self.on_state = None
+        self.running = True
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def send(self, message):
+        self.send_seq += 1
+        payload = encode(message, PROTOCOL_BINARY) if message else b""
+        self.udp.sendto(encode_datagram(self.token, self.send_seq, payload), self.udp_addr)
+
+    def handle(self, message):
+        if message.get("type") == "udp_ready":
+            self.udp_ready = True
+            return
+        if message.get("type") == "game_state_delta":
+            base = self.snapshots.get(message["base"])
+            if base is None:
+                return
+            message = apply_delta(base, message)
+        if message.get("type") != "game_state" or message["seq"] <= self.last_seq:
+            return
+        self.last_seq = message["seq"]
+        self.snapshots[message["seq"]] = message
+        self.applied += 1
+        self.send({"type": "ack", "seq": message["seq"]})
+        if self.on_state:
+            self.on_state(message)
+
+    def run(self):
+        selector = selectors.DefaultSelector()
+        selector.register(self.tcp, selectors.EVENT_READ)
+        selector.register(self.udp, selectors.EVENT_READ)
+        tcp_buffer = bytearray()
+        while self.running:
+            if not self.udp_ready:
+                self.send(None)
+            for key, _ in selector.select(0.1):
+                if key.fileobj is self.tcp:
+                    tcp_buffer += self.tcp.recv(1 << 16)
+                    for message in decode_frames(tcp_buffer):
+                        self.handle(message)
+                    continue
+                datagram = decode_datagram(self.udp.recv(65536))
+                if datagram is None:
+                    continue
+                _, seq, payload = datagram
+                if seq <= self.recv_seq:
+                    self.stale += 1
+                    continue
+                self.recv_seq = seq
+                for message in decode_frames(bytearray(payload)):
+                    self.handle(message)
+
+    def stop(self):
+        self.running = False
+        self.thread.join()
+        self.tcp.close()
+        self.udp.close()
+
+
+def bench_udp(losses=(0.0, 0.1, 0.3), latency=0.04, jitter=0.02, duration=5.0):
+    """Canal UDP à travers l'injecteur: snapshots reçus, datagrammes périmés, délai des positions"""
+    print(f"\n📡 UDP via injecteur (latence {latency * 1000:.0f} ms ± {jitter * 1000:.0f} ms)")
+    print(f"   {'perte':>6} {'snapshots/s':>12} {'périmés':>8} {'délai méd.':>11} {'délai p95':>10}")
+
+    for loss in losses:
+        process, port = start_server(SpaceBattleServer, 4)
+        time.sleep(0.3)
+        proxy = LossyUDPProxy(port + 1000, ('127.0.0.1', port), loss, latency, jitter)
+        proxy.start()
+
+        observer = UdpBot(port, port + 1000, "Observateur")
+        mover = UdpBot(port, port + 1000, "Pilote")
+        while not (observer.udp_ready and mover.udp_ready):
+            time.sleep(0.05)
+        time.sleep(0.3)
+
+        # Le pilote avance de 0,5 px par message; on mesure quand l'observateur le voit
+        sent_at = {}
+        delays = []
+
+        def on_state(state):
+            for player in state["players"]:
+                x = round(player["x"] * 2) / 2
+                if player["id"] == mover.player_id and x in sent_at:
+                    delays.append(time.perf_counter() - sent_at.pop(x))
+        observer.on_state = on_state
+
+        observer.send({"type": "move", "x": 1000.0, "y": 750.0, "angle": 0.0, "vx": 0.0, "vy": 0.0})
+        start = time.perf_counter()
+        applied_before = observer.applied
+        x = 1000.0
+        while time.perf_counter() - start < duration:
+            x += 0.5
+            sent_at[x] = time.perf_counter()
+            mover.send({"type": "move", "x": x, "y": 750.0, "angle": 0.0, "vx": 0.0, "vy": 0.0})
+            time.sleep(0.05)
+        rate = (observer.applied - applied_before) / duration
+
+        delays.sort()
+        median = delays[len(delays) // 2] * 1000 if delays else float('nan')
+        p95 = delays[int(len(delays) * 0.95)] * 1000 if delays else float('nan')
+        print(f"   {loss:>6.0%} {rate:>12.1f} {observer.stale:>8} {median:>9.0f}ms {p95:>8.0f}ms")
+
+        observer.stop()
+        mover.stop()
+        proxy.stop()
+        process.terminate()
+        process.join()
+
+
+def bench_rooms(room_counts=(10, 100, 1000), players_per_room=4, ticks=40):
+    """Coût d'une salle inactive: mémoire, temps de tick et octets envoyés"""
+    print(f"\n🚪 Salles: coût par salle (vide, puis {players_per_room} joueurs immobiles, binaire + deltas)")
+    print(f"   {'salles':>7} {'joueurs':>8} {'mémoire':>10} {'µs/tick':>9} {'o/s':>8}")
+
+    for count in room_counts:
+        for players in (0, players_per_room):
+            server = SpaceBattleServer(max_players=players_per_room, max_rooms=count)
+            sent = [0]
+
+            def count_bytes(conn, data, replaceable=False):
+                sent[0] += len(data)
+            server.send_to = count_bytes
+
+            tracemalloc.start()
+            before = tracemalloc.get_traced_memory()[0]
+            with contextlib.redirect_stdout(io.StringIO()):
+                for _ in range(count):
+                    room = server.create_room()
+                    for i in range(players):
+                        conn = room.reserve_slot(None, None)
+                        conn.protocol = PROTOCOL_BINARY
+                        conn.delta = True
+                        room.add_player(conn, f"Pilote{i}")
+            memory = (tracemalloc.get_traced_memory()[0] - before) / count
+            tracemalloc.stop()
+
+            sent[0] = 0
+            elapsed = 0.0
+            with contextlib.redirect_stdout(io.StringIO()):
+                for _ in range(ticks):
+                    start = time.perf_counter()
+                    now = time.time()
+                    server.update_game(now)
+                    server.send_game_state()
+                    elapsed += time.perf_counter() - start
+                    for room in server.rooms.values():
+                        for player in room.players.values():
+                            player.connection.acked_seq = room.snapshot_seq
+
+            per_tick = elapsed / ticks / count * 1e6
+            rate = sent[0] / count / (ticks / server.tick_rate)
+            print(f"   {count:>7} {players:>8} {memory / 1024:>8.1f}ko {per_tick:>9.1f} {rate:>8.0f}")
+
+
+def bench_projectiles(counts=(100, 1000, 5000, 20000), num_players=4, repeats=20, dt=0.05):
+    """Un tick de projectiles (mouvement, expiration, touches): NumPy vs boucle Python"""
+    print(f"\n🔫 Projectiles: coût d'un tick ({num_players} vaisseaux, budget 50 ms)")
+    print(f"   {'lasers':>7} {'numpy µs':>10} {'python µs':>10} {'touches':>8}")
+
+    for count in counts:
+        random.seed(count)
+        ids = list(range(1, num_players + 1))
+        xs = [random.uniform(0, 2000) for _ in ids]
+        ys = [random.uniform(0, 1500) for _ in ids]
+        shots = [(random.choice(ids), random.uniform(0, 2000), random.uniform(0, 1500),
+                  random.uniform(-math.pi, math.pi)) for _ in range(count)]
+
+        template = ProjectileSystem()
+        for shot_id, (owner, x, y, angle) in enumerate(shots):
+            template.spawn(owner, shot_id, x, y, angle)
+
+        elapsed = 0.0
+        for _ in range(repeats):
+            system = ProjectileSystem(template.capacity)
+            for name in ProjectileSystem.FIELDS:
+                getattr(system, name)[:] = getattr(template, name)
+            system.count = template.count
+            start = time.perf_counter()
+            hits = system.step(dt, 2000, 1500, ids, xs, ys)
+            elapsed += time.perf_counter() - start
+        numpy_us = elapsed / repeats * 1e6
+
+        # Référence: un objet par laser, distance à chaque vaisseau (ancien code client)
+        python_repeats = max(1, repeats * 1000 // count)
+        elapsed = 0.0
+        for _ in range(python_repeats):
+            lasers = [[owner, x, y, math.cos(angle) * 600, math.sin(angle) * 600, 2.0]
+                      for owner, x, y, angle in shots]
+            start = time.perf_counter()
+            remaining = []
+            for laser in lasers:
+                laser[1] += laser[3] * dt
+                laser[2] += laser[4] * dt
+                laser[5] -= dt
+                hit = False
+                for pid, px, py in zip(ids, xs, ys):
+                    if pid != laser[0] and math.sqrt((laser[1] - px) ** 2 + (laser[2] - py) ** 2) < SHIP_RADIUS + 3:
+                        hit = True
+                        break
+                if not hit and laser[5] > 0 and 0 <= laser[1] <= 2000 and 0 <= laser[2] <= 1500:
+                    remaining.append(laser)
+            elapsed += time.perf_counter() - start
+        python_us = elapsed / python_repeats * 1e6
+
+        print(f"   {count:>7} {numpy_us:>10.0f} {python_us:>10.0f} {len(hits):>8}")
+
+
+def open_stalled_client(port, name):
+    """Faux joueur qui ne lit plus rien après le welcome (petit tampon de réception)"""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+    for _ in range(100):
+        try:
+            sock.connect(('127.0.0.1', port))
+            break
+        except ConnectionRefusedError:
+            time.sleep(0.05)
+    buffer = b""
+    while b'\n' not in buffer:
+        buffer += sock.recv(4096)
+    sock.sendall((json.dumps({"type": "set_name", "name": name}) + '\n').encode())
+    return sock
+
+
+def was_disconnected(sock, timeout=2.0):
+    """Vide le socket pendant au plus timeout secondes: True si le serveur l'a fermé"""
+    deadline = time.time() + timeout
+    sock.settimeout(timeout)
+    try:
+        while time.time() < deadline:
+            if not sock.recv(1 << 16):
+                return True
+    except ConnectionResetError:
+        return True
+    except socket.timeout:
+        pass
+    return False
+
+
+def bench_slow_client(players=32, duration=10.0):
+    """Un client qui ne lit plus: gigue du tick chez les autres, et sort du client bloqué"""
+    print(f"\n🐢 Client bloqué: gigue du tick des {players} autres joueurs (cible 50 ms), {duration:.0f}s")
+    print(f"   {'serveur':<10} {'gigue σ':>9} {'p99 écart':>10} {'snapshots':>10}  client bloqué")
+
+    for label, server_class in (("threads", ThreadedSpaceBattleServer), ("selectors", SpaceBattleServer)):
+        process, port = start_server(server_class, players + 1)
+        sockets = [open_client(port, f"Bot{i}") for i in range(players)]
+        stalled = open_stalled_client(port, "Bloqué")
+
+        drainer = Drainer(sockets, sockets[0])
+        time.sleep(duration)
+        drainer.stop()
+
+        intervals = [b - a for a, b in zip(drainer.arrivals, drainer.arrivals[1:])]
+        deviations = sorted(abs(i - 0.05) * 1000 for i in intervals) or [0.0]
+        jitter = statistics.pstdev(intervals) * 1000 if len(intervals) > 1 else 0.0
+        p99 = deviations[int(len(deviations) * 0.99) - 1 if len(deviations) > 1 else 0]
+        outcome = "déconnecté" if was_disconnected(stalled) else "toujours connecté"
+        print(f"   {label:<10} {jitter:>7.2f}ms {p99:>8.2f}ms {len(drainer.arrivals):>10}  {outcome}")
+
+        process.terminate()
+        process.join()
+        for sock in sockets + [stalled]:
+            sock.close()
+
+
+def run_counting_server(server_class, port, max_players, pipe):
+    """Serveur dans un thread; chaque nom reçu sur pipe renvoie cet attribut (ou son appel) du serveur"""
+    sys.stdout = open(os.devnull, 'w')
+    server = server_class(port=port, max_players=max_players)
+    threading.Thread(target=server.start, daemon=True).start()
+    while True:
+        value = getattr(server, pipe.recv())
+        pipe.send(value() if callable(value) else value)
+
+
+class EchoDrainer(Drainer):
+    """Vide les sockets; note l'arrivée sur la sonde des échos de tir d'un joueur donné"""
+    def __init__(self, sockets, probe, shooter_id):
+        self.shooter_id = shooter_id
+        self.echoes = {}  # shot_id -> arrivée
+        super().__init__(sockets, probe)
+
+    def run(self):
+        while self.running:
+            for key, _ in self.selector.select(0.1):
+                try:
+                    data = key.fileobj.recv(1 << 16)
+                except (BlockingIOError, OSError):
+                    continue
+                if key.fileobj is self.probe:
+                    now = time.perf_counter()
+                    self.probe_buffer += data
+                    while b'\n' in self.probe_buffer:
+                        line, self.probe_buffer = self.probe_buffer.split(b'\n', 1)
+                        if b'"player_shoot"' in line:
+                            message = json.loads(line)
+                            if message["player_id"] == self.shooter_id:
+                                self.echoes[message["shot_id"]] = now
+
+
+def bench_coalescing(player_counts=(4, 64), duration=4.0, shot_interval=0.2):
+    """Appels système d'envoi du serveur et latence d'un tir (chaque joueur tire 5 fois/s)"""
+    global BENCH_PORT
+    print("\n📦 Regroupement: appels d'envoi TCP du serveur par seconde, latence tir -> écho chez un autre joueur")
+    print(f"   {'serveur':<10} {'joueurs':>7} {'appels/s':>9} {'médiane':>9} {'p99':>9}")
+
+    for count in player_counts:
+        for label, server_class in (("immédiat", ImmediateSendServer), ("regroupé", SpaceBattleServer)):
+            BENCH_PORT += 1
+            pipe, child_pipe = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=run_counting_server,
+                                              args=(server_class, BENCH_PORT, count, child_pipe), daemon=True)
+            process.start()
+            sockets = [open_client(BENCH_PORT, f"Bot{i}") for i in range(count)]
+            # La sonde est le joueur 1, le tireur chronométré le joueur 2
+            drainer = EchoDrainer(sockets, sockets[0], shooter_id=2)
+            time.sleep(0.5)
+
+            pipe.send("send_calls")
+            calls_before = pipe.recv()
+            sent_at = {}
+            shot_id = 0
+            start = time.perf_counter()
+            while time.perf_counter() - start < duration:
+                shot_id += 1
+                for i, sock in enumerate(sockets[1:], start=2):
+                    message = {"type": "shoot", "shot_id": shot_id, "x": 0, "y": 0,
+                               "angle": random.uniform(-math.pi, math.pi)}
+                    if i == 2:
+                        sent_at[shot_id] = time.perf_counter()
+                    sock.sendall((json.dumps(message) + '\n').encode())
+                time.sleep(shot_interval)
+            elapsed = time.perf_counter() - start
+            pipe.send("send_calls")
+            calls = (pipe.recv() - calls_before) / elapsed
+            time.sleep(0.2)
+            drainer.stop()
+
+            latencies = sorted((drainer.echoes[i] - sent_at[i]) * 1000 for i in sent_at if i in drainer.echoes)
+            latencies = latencies or [0.0]
+            median = latencies[len(latencies) // 2]
+            p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+            print(f"   {label:<10} {count:>7} {calls:>9.0f} {median:>7.2f}ms {p99:>7.2f}ms")
+
+            process.terminate()
+            process.join()
+            for sock in sockets:
+                sock.close()
+
+
+class ChunkSource:
+    """Faux socket: rend un flux par morceaux d'au plus chunk octets (ce que le noyau a reçu)"""
+    def __init__(self, data, chunk):
+        self.view = memoryview(data)
+        self.chunk = chunk
+        self.offset = 0
+
+    def recv(self, size):
+        size = min(size, self.chunk)
+        data = self.view[self.offset:self.offset + size].tobytes()
+        self.offset += len(data)
+        return data
+
+    def recv_into(self, target):
+        size = min(len(target), self.chunk, len(self.view) - self.offset)
+        target[:size] = self.view[self.offset:self.offset + size]
+        self.offset += size
+        return size
+
+
+def receive_legacy(source):
+    """Ancienne réception: recv(4096), concaténation au tampon, messages retirés du début"""
+    buffer = bytearray()
+    count = 0
+    while True:
+        data = source.recv(4096)
+        if not data:
+            return count
+        buffer += data
+        count += len(decode_frames(buffer))
+
+
+def receive_reader(source):
+    """Réception avec FrameReader: recv_into dans le tampon préalloué"""
+    reader = FrameReader()
+    count = 0
+    while reader.recv_into(source):
+        count += len(reader.messages())
+    return count
+
+
+def bench_receive(bursts=(4096, 65536), megabytes=8, snapshot_players=64):
+    """Débit de réception: commandes des joueurs (serveur) et gros snapshots (client), par rafales"""
+    print(f"\n📥 Réception: débit de découpage d'un flux de {megabytes} Mo (rafales du noyau de 4 Ko et 64 Ko)")
+    print(f"   {'flux':<12} {'format':<7} {'rafale':>7} {'méthode':<12} {'Mo/s':>8} {'messages/s':>11}")
+
+    commands = [
+        {"type": "move", "x": 1234.5, "y": 876.5, "angle": 1.23, "vx": 3.1, "vy": -2.7},
+        {"type": "shoot", "shot_id": 42, "x": 1234.5, "y": 876.5, "angle": 1.23},
+        {"type": "ack", "seq": 123456},
+        {"type": "chat", "text": "gg à tous, très belle manche ✨"},
+    ]
+    snapshots = [game_state_message(make_match(snapshot_players))]
+    for name, messages in (("commandes", commands), (f"états {snapshot_players} j.", snapshots)):
+        for protocol in (PROTOCOL_JSON, PROTOCOL_BINARY):
+            pattern = b"".join(encode(message, protocol) for message in messages)
+            stream = pattern * max(1, megabytes * 1024 * 1024 // len(pattern))
+            expected = len(stream) // len(pattern) * len(messages)
+
+            for burst in bursts:
+                for label, receive in (("recv+concat", receive_legacy), ("recv_into", receive_reader)):
+                    start = time.perf_counter()
+                    count = receive(ChunkSource(stream, burst))
+                    elapsed = time.perf_counter() - start
+                    assert count == expected, (label, count, expected)
+                    print(f"   {name:<12} {protocol:<7} {burst // 1024:>5}Ko {label:<12} "
+                          f"{len(stream) / elapsed / 1e6:>8.1f} {count / elapsed:>11.0f}")
+
+
+def bench_commands(player_counts=(16, 64), duration=3.0, move_rates=(20, 60), samples=20):
+    """Moves fusionnés par le tick: 20/s comme le client, 60/s pour un client qui enverrait chaque image"""
+    global BENCH_PORT
+    print("\n📨 Commandes par tick (20 Hz): moves et 5 tirs/s par joueur, seul le dernier move est appliqué")
+    print(f"   {'joueurs':>7} {'moves/s':>8} {'moves/tick':>11} {'appliqués':>10} {'shoot/tick':>11} {'fusionnés':>10}")
+
+    for count, move_rate in [(count, rate) for rate in move_rates for count in player_counts]:
+        BENCH_PORT += 1
+        pipe, child_pipe = multiprocessing.Pipe()
+        process = multiprocessing.Process(target=run_counting_server,
+                                          args=(SpaceBattleServer, BENCH_PORT, count, child_pipe), daemon=True)
+        process.start()
+        sockets = [open_client(BENCH_PORT, f"Bot{i}") for i in range(count)]
+        drainer = Drainer(sockets, sockets[0])
+        time.sleep(0.5)
+
+        pipe.send("command_stats")
+        coalesced_before = pipe.recv()["coalesced_moves"]
+        ticks = []
+        frame = 0
+        start = time.perf_counter()
+        next_sample = start
+        while time.perf_counter() - start < duration:
+            frame += 1
+            for sock in sockets:
+                message = {"type": "move", "x": random.uniform(0, 2000), "y": random.uniform(0, 1500),
+                           "angle": 0.0, "vx": 1.0, "vy": 0.0}
+                data = json.dumps(message) + '\n'
+                if frame % (move_rate // 5) == 0:
+                    data += json.dumps({"type": "shoot", "shot_id": frame, "angle": random.uniform(-3, 3)}) + '\n'
+                sock.sendall(data.encode())
+            if time.perf_counter() >= next_sample:
+                pipe.send("command_stats")
+                ticks.append(pipe.recv()["tick"])
+                next_sample += duration / samples
+            time.sleep(max(0.0, start + frame / move_rate - time.perf_counter()))
+        pipe.send("command_stats")
+        coalesced = pipe.recv()["coalesced_moves"] - coalesced_before
+        elapsed = time.perf_counter() - start
+        drainer.stop()
+
+        moves = statistics.mean(tick.get("move", 0) for tick in ticks)
+        shoots = statistics.mean(tick.get("shoot", 0) for tick in ticks)
+        applied = moves - coalesced / (elapsed * 20)
+        print(f"   {count:>7} {move_rate:>8} {moves:>11.1f} {applied:>10.1f} {shoots:>11.1f} "
+              f"{coalesced / max(1, moves * elapsed * 20):>9.0%}")
+
+        process.terminate()
+        process.join()
+        for sock in sockets:
+            sock.close()
+
+
+def bench_timers(player_counts=(4, 64, 256), duration=120.0, tick_rate=20, deaths_per_minute=2):
+    """Événements datés sur une manche: vérification de chaque joueur à chaque tick vs tas de minuteries"""
+    print(f"\n⏰ Minuteries: coût par tick sur une manche de {duration:.0f} s "
+          f"({deaths_per_minute} morts/min par joueur, respawn et protection de 3 s)")
+    print(f"   {'joueurs':>7} {'sondage µs':>11} {'tas µs':>8} {'déclenchées/tick':>17}")
+
+    ticks = int(duration * tick_rate)
+    for count in player_counts:
+        random.seed(count)
+        deaths = [sorted(random.uniform(0, duration) for _ in range(int(deaths_per_minute * duration / 60)))
+                  for _ in range(count)]
+
+        # Ancien tick: chaque joueur et chaque échéance de la manche comparés à l'heure
+        class Pilot:
+            spawn_protected = False
+            protection_time = 0.0
+            is_dead = False
+            respawn_time = 0.0
+        pilots = [Pilot() for _ in range(count)]
+        next_death = [0] * count
+        round_checks = [0.0, 0.0, 0.0]  # Fin de manche, super balle, pickup
+        start = time.perf_counter()
+        for tick in range(ticks):
+            now = tick / tick_rate
+            for index, pilot in enumerate(pilots):
+                if next_death[index] < len(deaths[index]) and deaths[index][next_death[index]] <= now:
+                    next_death[index] += 1
+                    pilot.is_dead = True
+                    pilot.respawn_time = now + 3.0
+                if pilot.spawn_protected and now - pilot.protection_time > 3.0:
+                    pilot.spawn_protected = False
+                if pilot.is_dead and now >= pilot.respawn_time:
+                    pilot.is_dead = False
+                    pilot.spawn_protected = True
+                    pilot.protection_time = now
+            for index, due in enumerate(round_checks):
+                if now - due >= 15.0:
+                    round_checks[index] = now
+        polling = (time.perf_counter() - start) / ticks * 1e6
+
+        # Nouveau tick: seules les minuteries échues sont traitées
+        timers = TimerHeap()
+
+        def respawn(pilot, now):
+            pilot.is_dead = False
+            timers.schedule(now + 3.0, end_protection, pilot)
+
+        def end_protection(pilot):
+            pilot.spawn_protected = False
+
+        def round_event(now, interval):
+            timers.schedule(now + interval, round_event, now + interval, interval)
+
+        for interval in (duration, 15.0, 30.0):
+            timers.schedule(interval, round_event, interval, interval)
+        pilots = [Pilot() for _ in range(count)]
+        for pilot, times in zip(pilots, deaths):
+            for when in times:
+                timers.schedule(when + 3.0, respawn, pilot, when + 3.0)
+        start = time.perf_counter()
+        for tick in range(ticks):
+            timers.run_due(tick / tick_rate)
+        heap = (time.perf_counter() - start) / ticks * 1e6
+
+        print(f"   {count:>7} {polling:>11.1f} {heap:>8.1f} {timers.fired / ticks:>17.2f}")
+
+
+BENCHMARKS = {
+    "boucle": bench_event_loop,
+    "protocole": bench_protocol,
+    "delta": bench_delta,
+    "interet": bench_interest,
+    "udp": bench_udp,
+    "salles": bench_rooms,
+    "projectiles": bench_projectiles,
+    "lent": bench_slow_client,
+    "regroupement": bench_coalescing,
+    "reception": bench_receive,
+    "commandes": bench_commands,
+    "minuteries": bench_timers,
+}
+
+
+if __name__ == "__main__":
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        BENCHMARKS[name]()
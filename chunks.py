@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+🧱 SPACE BATTLE - FOND EN MORCEAUX
+Couche fixe découpée en carrés rendus à la demande, gardés en cache LRU (budget mémoire)
+et préchargés dans la direction du mouvement de la caméra
+"""
+
+import pygame
+
+from lru import SurfaceLRU
+
+CHUNK_SIZE = 512  # px
+CHUNK_CACHE_BYTES = 32 * 1024 * 1024  # ~32 morceaux de 512x512 en 32 bits
+PREFETCH_FRAMES = 30  # Anticipe la position de la caméra dans une demi-seconde
+PREFETCH_PER_FRAME = 1  # Morceaux préchargés au plus par image (pas d'à-coup)
+
+
+class ChunkedLayer:
+    """draw_chunk(surface, left, top) dessine la zone de la map qui commence en (left, top)"""
+    def __init__(self, draw_chunk, width: int, height: int, chunk_size=CHUNK_SIZE,
+                 max_bytes=CHUNK_CACHE_BYTES):
+        self.draw_chunk = draw_chunk
+        self.width = width
+        self.height = height
+        self.chunk_size = chunk_size
+        self.chunks = SurfaceLRU(max_bytes)  # (colonne, ligne) -> Surface
+        self.last_camera = None
+        self.prefetched = 0
+    
+    def chunk(self, col: int, row: int):
+        """Surface du morceau, rendue maintenant si absente"""
+        return self.chunks.get((col, row), lambda: self._render(col, row))
+    
+    def _render(self, col: int, row: int):
+        left = col * self.chunk_size
+        top = row * self.chunk_size
+        surface = pygame.Surface((min(self.chunk_size, self.width - left), min(self.chunk_size, self.height - top)))
+        if pygame.display.get_surface():
+            surface = surface.convert()  # Même format que l'écran: blit sans conversion
+        self.draw_chunk(surface, left, top)
+        return surface
+    
+    def keys_in(self, left, top, width, height):
+        """Morceaux qui touchent le rectangle (coordonnées map), limités à la map"""
+        size = self.chunk_size
+        first_col = max(0, int(left // size))
+        first_row = max(0, int(top // size))
+        last_col = min((self.width - 1) // size, int((left + width - 1) // size))
+        last_row = min((self.height - 1) // size, int((top + height - 1) // size))
+        return [(col, row) for row in range(first_row, last_row + 1) for col in range(first_col, last_col + 1)]
+    
+    def draw(self, screen, camera_x, camera_y, view_width, view_height):
+        """Copie les morceaux visibles puis en précharge quelques-uns devant la caméra"""
+        camera_x = int(camera_x)
+        camera_y = int(camera_y)
+        size = self.chunk_size
+        
+        screen.blits([
+            (self.chunk(col, row), (col * size - camera_x, row * size - camera_y))
+            for col, row in self.keys_in(camera_x, camera_y, view_width, view_height)
+        ], doreturn=False)
+        
+        if self.last_camera is not None:
+            self.prefetch(camera_x, camera_y, view_width, view_height)
+        self.last_camera = (camera_x, camera_y)
+    
+    def prefetch(self, camera_x, camera_y, view_width, view_height):
+        """Rend à l'avance les morceaux où la caméra sera bientôt, au vu de son déplacement"""
+        dx = (camera_x - self.last_camera[0]) * PREFETCH_FRAMES
+        dy = (camera_y - self.last_camera[1]) * PREFETCH_FRAMES
+        if dx == 0 and dy == 0:
+            return
+        
+        budget = PREFETCH_PER_FRAME
+        for key in self.keys_in(camera_x + dx, camera_y + dy, view_width, view_height):
+            if key in self.chunks:
+                continue
+            self.chunk(*key)
+            self.prefetched += 1
+            budget -= 1
+            if budget == 0:
+                return
+    
+    def clear(self):
+        self.chunks.clear()
+        self.last_camera = None
+    
+    def stats(self):
+        stats = self.chunks.stats()
+        return {
+            "chunks": stats["entries"],
+            "bytes": stats["bytes"],
+            "hits": stats["hits"],
+            "rendered": stats["misses"],
+            "prefetched": self.prefetched,
+            "evictions": stats["evictions"],
+        }
@@ -8,12 +8,27 @@ Contrôles: ZQSD + Souris + Espace pour tirer
 import pygame
 import socket
 import threading
-import json
 import math
 import sys
 import time
 import base64
 import random
+from collections import deque
+
+import numpy as np
+
+from protocol import (PROTOCOL_BINARY, PROTOCOL_JSON, MAX_DATAGRAM, encode, decode_frames,
+                      FrameReader, apply_delta, encode_datagram, decode_datagram)
+from projectiles import ProjectileSystem
+from particles import ParticlePool
+from textcache import render_text
+from sprites import sprite_cache, quantize, glow, layered_glow, overlay
+from chunks import ChunkedLayer
+from starfield import StarField
+from rotations import rotation_cache, ASTEROID_STEPS
+from spatial import SpatialGrid
+from hud import CachedPanel, MINIMAP_REFRESH_MS
+from quality import QualityGovernor, find_tier
 
 # Essaie d'importer PyAudio pour le voice chat
 try:
@@ -30,7 +45,17 @@ pygame.init()
 # Constantes
 SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 600
-FPS = 60
+SIM_RATE = 60  # Pas de simulation par seconde: vitesses et durées (en pas) sont réglées pour ce rythme
+SIM_DT = 1 / SIM_RATE
+MAX_SIM_STEPS = 5  # Pas rattrapés au plus par image (au-delà, le jeu ralentit au lieu de geler)
+MAX_FPS = 0  # Limite d'images par seconde à l'affichage (0: aucune)
+FONT_SIZE = 36  # Titres du HUD
+SMALL_FONT_SIZE = 24
+MINIMAP_SIZE = 150
+HUD_PANEL_WIDTH = 250  # Panneau manche/timer
+SCOREBOARD_WIDTH = 210
+SCOREBOARD_ROWS = 6
+SCOREBOARD_ROW_HEIGHT = 28
 
 # Couleurs
 BLACK = (0, 0, 0)
@@ -51,10 +76,17 @@ NEON_BLUE = (0, 200, 255)
 NEON_PURPLE = (180, 0, 255)
 NEON_GREEN = (0, 255, 100)
 
+# Flammes du boost: composante verte par type (orange, jaune, rouge), atténuée avec la vie
+FLAME_GREEN = (140, 255, 50)
+FLAME_CAPACITY = 512  # Réserve fixe de particules
+FLAME_LEVELS = 8  # Paliers de vie pour réutiliser les sprites de flamme
+
 # Taille de la map (plus grande que l'écran)
 MAP_WIDTH = 2000
 MAP_HEIGHT = 1500
 
+PICKUP_RADIUS = 40  # Rayon de collecte des soins (le serveur vérifie avec le même)
+
 COLOR_MAP = {
     "blue": BLUE,
     "red": RED,
@@ -63,6 +95,25 @@ COLOR_MAP = {
 }
 
 
+def draw_hull(surface, cx, cy, angle, size, color):
+    """Coque d'un vaisseau: triangle pointant dans la direction angle, contour blanc"""
+    points = [
+        (cx + math.cos(angle) * size, cy + math.sin(angle) * size),
+        (cx + math.cos(angle + 2.5) * size * 0.6, cy + math.sin(angle + 2.5) * size * 0.6),
+        (cx + math.cos(angle - 2.5) * size * 0.6, cy + math.sin(angle - 2.5) * size * 0.6)
+    ]
+    pygame.draw.polygon(surface, color, points)
+    pygame.draw.polygon(surface, WHITE, points, 2)
+
+
+def hull_key(size, color):
+    """Déclare (une fois) les sprites pivotés d'une coque et renvoie leur clé"""
+    key = ("ship", size, color)
+    rotation_cache.register(key, lambda surface, cx, cy, angle: draw_hull(surface, cx, cy, angle, size, color),
+                            size * 2 + 4)
+    return key
+
+
 class Spaceship:
     """Vaisseau spatial"""
     def __init__(self, player_id, x, y, color):
@@ -82,40 +133,6 @@ class Spaceship:
         self.deaths = 0
         self.is_dead = False
         
-    def draw(self, screen, is_local=False):
-        """Dessine le vaisseau"""
-        # Triangle pointant dans la direction
-        points = [
-            (self.x + math.cos(self.angle) * self.size,
-             self.y + math.sin(self.angle) * self.size),
-            (self.x + math.cos(self.angle + 2.5) * self.size * 0.6,
-             self.y + math.sin(self.angle + 2.5) * self.size * 0.6),
-            (self.x + math.cos(self.angle - 2.5) * self.size * 0.6,
-             self.y + math.sin(self.angle - 2.5) * self.size * 0.6)
-        ]
-        
-        pygame.draw.polygon(screen, self.color, points)
-        
-        if is_local:
-            pygame.draw.circle(screen, CYAN, (int(self.x), int(self.y)), self.size + 5, 2)
-        
-        # Barre de santé
-        bar_width = 40
-        bar_height = 5
-        bar_x = self.x - bar_width // 2
-        bar_y = self.y - self.size - 15
-        
-        pygame.draw.rect(screen, RED, (bar_x, bar_y, bar_width, bar_height))
-        pygame.draw.rect(screen, GREEN, (bar_x, bar_y, bar_width * self.health / 100, bar_height))
-        
-        # Affiche le nom au-dessus du vaisseau
-        font = pygame.font.Font(None, 20)
-        name_text = font.render(self.name, True, WHITE)
-        text_rect = name_text.get_rect(center=(self.x, self.y - self.size - 28))
-        # Fond noir pour meilleure lisibilité
-        pygame.draw.rect(screen, BLACK, text_rect.inflate(4, 2))
-        screen.blit(name_text, text_rect)
-        
     def update(self, data):
         """Met à jour depuis les données réseau"""
         self.x = data.get("x", self.x)
@@ -128,40 +145,6 @@ class Spaceship:
         self.spawn_protected = data.get("spawn_protected", False)
 
 
-class Laser:
-    """Projectile laser"""
-    def __init__(self, x, y, angle, owner_id, is_super=False):
-        self.x = x
-        self.y = y
-        self.angle = angle
-        self.is_super = is_super
-        self.speed = 12 if is_super else 10
-        self.vx = math.cos(angle) * self.speed
-        self.vy = math.sin(angle) * self.speed
-        self.owner_id = owner_id
-        self.lifetime = 150 if is_super else 120
-        self.size = 8 if is_super else 3
-        self.damage = 40 if is_super else 20
-        
-    def update(self):
-        self.x += self.vx
-        self.y += self.vy
-        self.lifetime -= 1
-        
-    def draw(self, screen):
-        # Super balle = plus grosse et orange
-        if self.is_super:
-            pygame.draw.circle(screen, ORANGE, (int(self.x), int(self.y)), self.size)
-            pygame.draw.circle(screen, YELLOW, (int(self.x), int(self.y)), self.size - 3)
-        else:
-            pygame.draw.circle(screen, CYAN, (int(self.x), int(self.y)), self.size)
-        
-    def is_dead(self):
-        return (self.lifetime <= 0 or 
-                self.x < 0 or self.x > MAP_WIDTH or
-                self.y < 0 or self.y > MAP_HEIGHT)
-
-
 class VoiceChat:
     """Gestion du chat vocal 🎤"""
     def __init__(self):
@@ -268,22 +251,15 @@ class VoiceChat:
 class SpaceArena:
     """Arène spatiale style Rocket League / Fortnite 🏟️"""
     
-    def __init__(self):
-        self.width = MAP_WIDTH
-        self.height = MAP_HEIGHT
-        
-        # Étoiles de fond (positions fixes)
-        self.stars = []
-        for _ in range(200):
-            self.stars.append({
-                'x': random.randint(0, self.width),
-                'y': random.randint(0, self.height),
-                'size': random.randint(1, 3),
-                'brightness': random.randint(100, 255),
-                'twinkle_speed': random.uniform(0.02, 0.08)
-            })
+    def __init__(self, width=MAP_WIDTH, height=MAP_HEIGHT, minimap_refresh_ms=MINIMAP_REFRESH_MS):
+        self.width = width
+        self.height = height
+        
+        # Étoiles de fond (plusieurs plans de profondeur)
+        self.stars = StarField(SCREEN_WIDTH, SCREEN_HEIGHT)
         
         # Nébuleuses (zones colorées)
+        self.show_nebulas = True
         self.nebulas = []
         for _ in range(5):
             self.nebulas.append({
@@ -305,6 +281,13 @@ class SpaceArena:
                 'rot_speed': random.uniform(-0.02, 0.02),
                 'points': self._generate_asteroid_points(random.randint(6, 10))
             })
+        for asteroid in self.asteroids:
+            self.register_asteroid(asteroid)
+        
+        # Index spatial des obstacles et bonus: ('asteroid' | 'boost' | 'pickup', n°)
+        self.index = SpatialGrid(cell_size=200)
+        for i, asteroid in enumerate(self.asteroids):
+            self.index.insert(("asteroid", i), asteroid['x'], asteroid['y'], asteroid['radius'])
         
         # Zones de boost
         self.boost_zones = [
@@ -314,9 +297,18 @@ class SpaceArena:
             {'x': self.width - 300, 'y': self.height - 300, 'radius': 50, 'color': NEON_GREEN, 'active': True, 'cooldown': 0},
             {'x': self.width // 2, 'y': self.height // 2, 'radius': 70, 'color': ORANGE, 'active': True, 'cooldown': 0},
         ]
+        for i, zone in enumerate(self.boost_zones):
+            self.index.insert(("boost", i), zone['x'], zone['y'], zone['radius'])
         
         self.time = 0
         
+        # Fond, nébuleuses, grille et murs ne bougent pas: dessinés une fois, morceau par morceau
+        # quand la caméra s'en approche (une seule couche de 20000x20000 ferait plusieurs Go)
+        self.background = ChunkedLayer(self.draw_static, self.width, self.height)
+        
+        # Minimap: redessinée à fréquence réduite, recopiée telle quelle entre deux rendus
+        self.minimap = CachedPanel(MINIMAP_SIZE, MINIMAP_SIZE, self._draw_minimap, refresh_ms=minimap_refresh_ms)
+        
     def _generate_asteroid_points(self, num_points):
         """Génère des points irréguliers pour un astéroïde"""
         points = []
@@ -341,61 +333,68 @@ class SpaceArena:
                 if zone['cooldown'] <= 0:
                     zone['active'] = True
     
-    def draw_background(self, screen, camera_x, camera_y):
-        """Dessine le fond de l'arène"""
-        # Fond dégradé spatial
-        screen.fill(DARK_BLUE)
+    def draw_static(self, surface, left, top):
+        """Dessine les éléments fixes de l'arène sur surface, qui couvre la map à partir de (left, top)"""
+        width, height = surface.get_size()
         
-        # Nébuleuses (effet de glow)
-        for nebula in self.nebulas:
-            nx = nebula['x'] - camera_x
-            ny = nebula['y'] - camera_y
-            
-            # Ne dessine que si visible
-            if -nebula['radius'] < nx < SCREEN_WIDTH + nebula['radius'] and \
-               -nebula['radius'] < ny < SCREEN_HEIGHT + nebula['radius']:
-                # Plusieurs cercles concentriques pour l'effet de glow
-                for i in range(5, 0, -1):
-                    radius = int(nebula['radius'] * (i / 5))
-                    alpha = nebula['alpha'] // i
-                    color = (*nebula['color'][:3],)
-                    # Surface avec alpha
-                    s = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
-                    pygame.draw.circle(s, (*color, alpha), (radius, radius), radius)
-                    screen.blit(s, (nx - radius, ny - radius))
-        
-        # Étoiles avec scintillement
-        for star in self.stars:
-            sx = star['x'] - camera_x
-            sy = star['y'] - camera_y
-            
-            # Wraparound pour les étoiles
-            sx = sx % SCREEN_WIDTH
-            sy = sy % SCREEN_HEIGHT
-            
-            # Scintillement
-            twinkle = math.sin(self.time * star['twinkle_speed']) * 0.3 + 0.7
-            brightness = int(star['brightness'] * twinkle)
-            color = (brightness, brightness, brightness)
-            
-            pygame.draw.circle(screen, color, (int(sx), int(sy)), star['size'])
-    
-    def draw_arena(self, screen, camera_x, camera_y):
-        """Dessine les éléments de l'arène"""
+        # Fond dégradé spatial
+        surface.fill(DARK_BLUE)
+        
+        # Nébuleuses (effet de glow), seulement celles qui touchent la zone
+        for nebula in self.nebulas if self.show_nebulas else ():
+            r = nebula['radius']
+            nx = nebula['x'] - left
+            ny = nebula['y'] - top
+            if -r < nx < width + r and -r < ny < height + r:
+                # Plusieurs cercles concentriques pour l'effet de glow (un seul sprite)
+                sprite = layered_glow(
+                    ((int(r * (i / 5)), nebula['alpha'] // i) for i in range(5, 0, -1)),
+                    nebula['color']
+                )
+                surface.blit(sprite, (nx - r, ny - r))
         
-        # Grille de fond (style Tron)
+        # Grille de fond (style Tron), lignes tous les 100 px de la map
         grid_spacing = 100
         grid_color = (30, 30, 80)
+        for x in range(-left % grid_spacing, width, grid_spacing):
+            pygame.draw.line(surface, grid_color, (x, 0), (x, height), 1)
+        for y in range(-top % grid_spacing, height, grid_spacing):
+            pygame.draw.line(surface, grid_color, (0, y), (width, y), 1)
+        
+        # Murs de l'arène (style néon), avec effet glow; pygame coupe ce qui sort de la surface
+        wall_thickness = 5
+        map_left, map_top = -left, -top
+        map_right, map_bottom = self.width - left, self.height - top
+        for glow_level in range(3, 0, -1):
+            glow_color = (NEON_BLUE[0] // glow_level, NEON_BLUE[1] // glow_level, NEON_BLUE[2] // glow_level)
+            thickness = wall_thickness + glow_level * 4
+            pygame.draw.line(surface, glow_color, (map_left, map_top), (map_right, map_top), thickness)
+            pygame.draw.line(surface, glow_color, (map_left, map_bottom), (map_right, map_bottom), thickness)
+            pygame.draw.line(surface, glow_color, (map_left, map_top), (map_left, map_bottom), thickness)
+            pygame.draw.line(surface, glow_color, (map_right, map_top), (map_right, map_bottom), thickness)
         
-        # Lignes verticales
-        start_x = int(-camera_x % grid_spacing)
-        for x in range(start_x, SCREEN_WIDTH, grid_spacing):
-            pygame.draw.line(screen, grid_color, (x, 0), (x, SCREEN_HEIGHT), 1)
+        # Coins lumineux
+        corner_size = 30
+        for cx, cy in ((map_left, map_top), (map_right, map_top), (map_left, map_bottom), (map_right, map_bottom)):
+            pygame.draw.circle(surface, NEON_PURPLE, (cx, cy), corner_size // 2)
+            pygame.draw.circle(surface, WHITE, (cx, cy), corner_size // 4)
+    
+    def set_nebulas(self, enabled: bool):
+        """Affiche ou masque les nébuleuses (la couche fixe est redessinée)"""
+        if enabled != self.show_nebulas:
+            self.show_nebulas = enabled
+            self.background.clear()
+    
+    def draw_background(self, screen, camera_x, camera_y):
+        """Dessine le fond de l'arène"""
+        # Couche fixe: les morceaux sous la caméra, copiés tels quels
+        self.background.draw(screen, camera_x, camera_y, SCREEN_WIDTH, SCREEN_HEIGHT)
         
-        # Lignes horizontales
-        start_y = int(-camera_y % grid_spacing)
-        for y in range(start_y, SCREEN_HEIGHT, grid_spacing):
-            pygame.draw.line(screen, grid_color, (0, y), (SCREEN_WIDTH, y), 1)
+        # Étoiles avec scintillement et parallaxe
+        self.stars.draw(screen, camera_x, camera_y, self.time)
+    
+    def draw_arena(self, screen, camera_x, camera_y):
+        """Dessine les éléments animés de l'arène (le reste est dans la couche fixe)"""
         
         # Zones de boost
         for zone in self.boost_zones:
@@ -406,21 +405,16 @@ class SpaceArena:
                 if zone['active']:
                     # Effet pulsant
                     pulse = math.sin(self.time * 0.1) * 0.3 + 0.7
-                    radius = int(zone['radius'] * pulse)
+                    radius = quantize(zone['radius'] * pulse, 2)
                     
-                    # Cercles concentriques
-                    for i in range(3, 0, -1):
-                        r = radius + (i * 10)
-                        alpha = 50 // i
-                        s = pygame.Surface((r * 2, r * 2), pygame.SRCALPHA)
-                        pygame.draw.circle(s, (*zone['color'], alpha), (r, r), r)
-                        screen.blit(s, (zx - r, zy - r))
+                    # Cercles concentriques (un sprite par palier de rayon)
+                    sprite = layered_glow(((radius + i * 10, 50 // i) for i in range(3, 0, -1)), zone['color'])
+                    screen.blit(sprite, (zx - radius - 30, zy - radius - 30))
                     
                     pygame.draw.circle(screen, zone['color'], (int(zx), int(zy)), radius, 3)
                     
                     # Icône boost
-                    font = pygame.font.Font(None, 24)
-                    text = font.render("⚡", True, WHITE)
+                    text = render_text("⚡", 24, WHITE)
                     screen.blit(text, (zx - 8, zy - 10))
                 else:
                     # Zone inactive (grisée)
@@ -432,128 +426,118 @@ class SpaceArena:
             ay = asteroid['y'] - camera_y
             
             if -100 < ax < SCREEN_WIDTH + 100 and -100 < ay < SCREEN_HEIGHT + 100:
-                # Dessine l'astéroïde avec ses points irréguliers
-                points = []
-                for angle, dist in asteroid['points']:
-                    real_angle = angle + asteroid['rotation']
-                    px = ax + math.cos(real_angle) * asteroid['radius'] * dist
-                    py = ay + math.sin(real_angle) * asteroid['radius'] * dist
-                    points.append((px, py))
-                
-                pygame.draw.polygon(screen, (80, 70, 60), points)
-                pygame.draw.polygon(screen, (120, 110, 100), points, 3)
-                
-                # Cratères
-                for i in range(3):
-                    cx = ax + math.cos(asteroid['rotation'] + i * 2) * asteroid['radius'] * 0.4
-                    cy = ay + math.sin(asteroid['rotation'] + i * 2) * asteroid['radius'] * 0.4
-                    pygame.draw.circle(screen, (60, 50, 40), (int(cx), int(cy)), asteroid['radius'] // 6)
-        
-        # Murs de l'arène (style néon)
-        wall_thickness = 5
-        
-        # Calcule les positions des murs par rapport à la caméra
-        left = -camera_x
-        top = -camera_y
-        right = self.width - camera_x
-        bottom = self.height - camera_y
-        
-        # Effet glow pour les murs
-        for glow in range(3, 0, -1):
-            glow_color = (NEON_BLUE[0] // glow, NEON_BLUE[1] // glow, NEON_BLUE[2] // glow)
-            thickness = wall_thickness + glow * 4
+                # Sprite pré-dessiné à l'angle le plus proche
+                rotation_cache.blit(screen, asteroid['sprite'], asteroid['rotation'], ax, ay)
+    
+    def register_asteroid(self, asteroid):
+        """Déclare les sprites pivotés d'un astéroïde (forme propre à chacun)"""
+        def draw(surface, cx, cy, rotation):
+            # Dessine l'astéroïde avec ses points irréguliers
+            points = []
+            for angle, dist in asteroid['points']:
+                real_angle = angle + rotation
+                points.append((cx + math.cos(real_angle) * asteroid['radius'] * dist,
+                               cy + math.sin(real_angle) * asteroid['radius'] * dist))
             
-            # Mur haut
-            if 0 <= top <= SCREEN_HEIGHT:
-                pygame.draw.line(screen, glow_color, (max(0, left), top), (min(SCREEN_WIDTH, right), top), thickness)
-            # Mur bas
-            if 0 <= bottom <= SCREEN_HEIGHT:
-                pygame.draw.line(screen, glow_color, (max(0, left), bottom), (min(SCREEN_WIDTH, right), bottom), thickness)
-            # Mur gauche
-            if 0 <= left <= SCREEN_WIDTH:
-                pygame.draw.line(screen, glow_color, (left, max(0, top)), (left, min(SCREEN_HEIGHT, bottom)), thickness)
-            # Mur droit
-            if 0 <= right <= SCREEN_WIDTH:
-                pygame.draw.line(screen, glow_color, (right, max(0, top)), (right, min(SCREEN_HEIGHT, bottom)), thickness)
+            pygame.draw.polygon(surface, (80, 70, 60), points)
+            pygame.draw.polygon(surface, (120, 110, 100), points, 3)
+            
+            # Cratères
+            for i in range(3):
+                crater_x = cx + math.cos(rotation + i * 2) * asteroid['radius'] * 0.4
+                crater_y = cy + math.sin(rotation + i * 2) * asteroid['radius'] * 0.4
+                pygame.draw.circle(surface, (60, 50, 40), (int(crater_x), int(crater_y)), asteroid['radius'] // 6)
         
-        # Coins lumineux
-        corner_size = 30
-        corners = [
-            (left, top),
-            (right, top),
-            (left, bottom),
-            (right, bottom)
-        ]
-        for cx, cy in corners:
-            if -50 < cx < SCREEN_WIDTH + 50 and -50 < cy < SCREEN_HEIGHT + 50:
-                pygame.draw.circle(screen, NEON_PURPLE, (int(cx), int(cy)), corner_size // 2)
-                pygame.draw.circle(screen, WHITE, (int(cx), int(cy)), corner_size // 4)
+        key = ("asteroid", asteroid['radius'], tuple(asteroid['points']))
+        rotation_cache.register(key, draw, asteroid['radius'] * 2 + 8, steps=ASTEROID_STEPS)
+        asteroid['sprite'] = key
     
     def draw_minimap(self, screen, player_x, player_y, other_players):
         """Dessine la minimap"""
-        minimap_size = 150
-        minimap_x = SCREEN_WIDTH - minimap_size - 10
-        minimap_y = SCREEN_HEIGHT - minimap_size - 10
-        
+        scale_x = MINIMAP_SIZE / self.width
+        scale_y = MINIMAP_SIZE / self.height
+        # Positions en pixels de minimap: la surface n'est redessinée que si un point a bougé
+        player = (int(player_x * scale_x), int(player_y * scale_y))
+        others = tuple((int(ship.x * scale_x), int(ship.y * scale_y), ship.color) for ship in other_players.values())
+        zones = tuple(zone['active'] for zone in self.boost_zones)
+        
+        minimap_x = SCREEN_WIDTH - MINIMAP_SIZE - 10
+        minimap_y = SCREEN_HEIGHT - MINIMAP_SIZE - 10
+        screen.blit(self.minimap.get(player, others, zones), (minimap_x, minimap_y))
+    
+    def _draw_minimap(self, surface, player, others, zones):
+        """Contenu de la minimap (coordonnées relatives à son coin)"""
         # Fond de la minimap
-        s = pygame.Surface((minimap_size, minimap_size), pygame.SRCALPHA)
-        pygame.draw.rect(s, (0, 0, 0, 150), (0, 0, minimap_size, minimap_size))
-        pygame.draw.rect(s, NEON_BLUE, (0, 0, minimap_size, minimap_size), 2)
-        screen.blit(s, (minimap_x, minimap_y))
+        pygame.draw.rect(surface, (0, 0, 0, 150), (0, 0, MINIMAP_SIZE, MINIMAP_SIZE))
+        pygame.draw.rect(surface, NEON_BLUE, (0, 0, MINIMAP_SIZE, MINIMAP_SIZE), 2)
         
         # Ratio de conversion
-        scale_x = minimap_size / self.width
-        scale_y = minimap_size / self.height
+        scale_x = MINIMAP_SIZE / self.width
+        scale_y = MINIMAP_SIZE / self.height
         
         # Astéroïdes sur la minimap
         for asteroid in self.asteroids:
-            ax = minimap_x + asteroid['x'] * scale_x
-            ay = minimap_y + asteroid['y'] * scale_y
-            pygame.draw.circle(screen, GRAY, (int(ax), int(ay)), 3)
+            ax = asteroid['x'] * scale_x
+            ay = asteroid['y'] * scale_y
+            pygame.draw.circle(surface, GRAY, (int(ax), int(ay)), 3)
         
         # Zones de boost sur la minimap
-        for zone in self.boost_zones:
-            if zone['active']:
-                zx = minimap_x + zone['x'] * scale_x
-                zy = minimap_y + zone['y'] * scale_y
-                pygame.draw.circle(screen, zone['color'], (int(zx), int(zy)), 4)
+        for zone, active in zip(self.boost_zones, zones):
+            if active:
+                zx = zone['x'] * scale_x
+                zy = zone['y'] * scale_y
+                pygame.draw.circle(surface, zone['color'], (int(zx), int(zy)), 4)
         
         # Autres joueurs
-        for ship in other_players.values():
-            px = minimap_x + ship.x * scale_x
-            py = minimap_y + ship.y * scale_y
-            pygame.draw.circle(screen, ship.color, (int(px), int(py)), 4)
+        for px, py, color in others:
+            pygame.draw.circle(surface, color, (px, py), 4)
         
         # Joueur local (plus grand, avec contour)
-        px = minimap_x + player_x * scale_x
-        py = minimap_y + player_y * scale_y
-        pygame.draw.circle(screen, WHITE, (int(px), int(py)), 6)
-        pygame.draw.circle(screen, CYAN, (int(px), int(py)), 6, 2)
+        pygame.draw.circle(surface, WHITE, player, 6)
+        pygame.draw.circle(surface, CYAN, player, 6, 2)
         
         # Label
-        font = pygame.font.Font(None, 20)
-        label = font.render("MINIMAP", True, NEON_BLUE)
-        screen.blit(label, (minimap_x + 5, minimap_y + 5))
+        label = render_text("MINIMAP", 20, NEON_BLUE)
+        surface.blit(label, (5, 5))
     
     def check_boost_collision(self, x, y):
         """Vérifie si le joueur touche une zone de boost"""
-        for zone in self.boost_zones:
-            if zone['active']:
-                dist = math.sqrt((x - zone['x'])**2 + (y - zone['y'])**2)
-                if dist < zone['radius']:
-                    zone['active'] = False
-                    zone['cooldown'] = 300  # 5 secondes à 60 FPS
-                    return True
+        for kind, i in self.index.query_point(x, y):
+            zone = self.boost_zones[i] if kind == "boost" else None
+            if zone and zone['active']:
+                zone['active'] = False
+                zone['cooldown'] = 300  # 5 secondes (pas de simulation)
+                return True
         return False
     
     def check_asteroid_collision(self, x, y, radius=20):
-        """Vérifie collision avec un astéroïde"""
-        for asteroid in self.asteroids:
-            dist = math.sqrt((x - asteroid['x'])**2 + (y - asteroid['y'])**2)
-            if dist < asteroid['radius'] + radius:
-                return asteroid
+        """Vérifie collision avec un astéroïde (le plus proche s'il y en a plusieurs)"""
+        for kind, i in self.index.query_circle(x, y, radius):
+            if kind == "asteroid":
+                return self.asteroids[i]
         return None
     
+    def check_pickup_collision(self, x, y):
+        """N° du pickup de santé sous le joueur, ou None"""
+        for kind, pickup_id in self.index.query_point(x, y):
+            if kind == "pickup":
+                return pickup_id
+        return None
+    
+    def add_pickup(self, pickup):
+        self.index.insert(("pickup", pickup["id"]), pickup["x"], pickup["y"], PICKUP_RADIUS)
+    
+    def remove_pickup(self, pickup_id):
+        self.index.remove(("pickup", pickup_id))
+    
+    def set_pickups(self, pickups):
+        """Aligne l'index sur les pickups connus (état complet reçu du serveur)"""
+        indexed = {obj_id[1] for obj_id in list(self.index.positions) if obj_id[0] == "pickup"}
+        for pickup_id in indexed - set(pickups):
+            self.remove_pickup(pickup_id)
+        for pickup_id in set(pickups) - indexed:
+            self.add_pickup(pickups[pickup_id])
+    
     def clamp_position(self, x, y, margin=20):
         """Limite la position aux bords de l'arène"""
         x = max(margin, min(self.width - margin, x))
@@ -563,12 +547,41 @@ class SpaceArena:
 
 class SpaceBattleClient:
     """Client du jeu"""
-    def __init__(self, server_ip, port=3500):
+    def __init__(self, server_ip, port=3500, protocol=PROTOCOL_BINARY, use_udp=True, udp_port=None, max_fps=MAX_FPS,
+                 quality=None, arena_size=(MAP_WIDTH, MAP_HEIGHT)):
         self.server_ip = server_ip
         self.port = port
         self.socket = None
+        self.reader = FrameReader()  # Tampon de réception TCP (rempli par recv_into)
         self.running = False
         
+        # Canal UDP pour les positions, snapshots et la voix (TCP pour le reste)
+        self.use_udp = use_udp
+        self.udp_port = udp_port  # Pour passer par un injecteur de pertes (udp_proxy.py)
+        self.udp_socket = None
+        self.udp_addr = None
+        self.udp_token = None
+        self.udp_ready = False  # Le serveur a reçu notre premier datagramme
+        self.udp_send_seq = 0
+        self.udp_send_lock = threading.Lock()  # Boucle de jeu, réception UDP et voix envoient des datagrammes
+        self.udp_recv_seq = 0
+        self.udp_stale = 0
+        
+        # Messages sortants regroupés, envoyés une fois par image (flush_outbox)
+        self.outbox = bytearray()  # TCP
+        self.datagram_outbox = bytearray()  # UDP: plusieurs messages par datagramme
+        self.outbox_lock = threading.Lock()  # La voix et les acks viennent d'autres threads
+        self.send_calls = 0
+        
+        # Protocole réseau (binaire si le serveur le propose au welcome)
+        self.preferred_protocol = protocol
+        self.protocol = PROTOCOL_JSON
+        
+        # Snapshots reçus (bases des game_state_delta), acquittés au serveur
+        self.snapshots = {}
+        self.max_snapshots = 32
+        self.last_snapshot_seq = 0
+        
         # Joueur local
         self.player_id = None
         self.local_ship = None
@@ -576,25 +589,45 @@ class SpaceBattleClient:
         # Autres joueurs
         self.other_ships = {}
         
-        # Projectiles
-        self.lasers = []
+        # Projectiles (tableaux NumPy, avancés en une passe par image)
+        self.lasers = ProjectileSystem()
+        self.next_shot_id = 1
+        
+        # Messages reçus par les threads TCP et UDP, traités dans l'ordre par la boucle de jeu
+        # (seul ce thread touche aux snapshots, aux vaisseaux, aux lasers et à l'arène)
+        self.inbox = deque()
         
         # Pygame
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption("🚀 Space Battle")
         self.clock = pygame.time.Clock()
-        self.font = pygame.font.Font(None, 36)
-        self.small_font = pygame.font.Font(None, 24)
+        self.max_fps = max_fps
+        
+        # Simulation à pas fixe: le temps réel écoulé est découpé en pas de SIM_DT,
+        # l'image affichée interpole entre l'état précédent et l'état courant
+        self.sim_accumulator = 0.0
+        self.sim_alpha = 1.0  # Fraction du pas en cours (0: état précédent, 1: état courant)
+        self.prev_camera = None
+        self.prev_ship = None
         
         # Voice chat
         self.voice_chat = VoiceChat()
         
-        # Arène
-        self.arena = SpaceArena()
+        # Coques de toutes les couleurs, pivotées d'avance (sauf avec --lazy-sprites)
+        for color in (*COLOR_MAP.values(), WHITE):
+            hull_key(20, color)
+        
+        # Arène (sa taille borne la caméra, les lasers et le point d'apparition; le welcome du serveur l'impose)
+        self.arena = SpaceArena(*arena_size)
+        stats = rotation_cache.stats()
+        print(f"🌀 Sprites pivotés: {stats['frames']} images, {stats['bytes'] / 1024 / 1024:.1f} Mo, "
+              f"{stats['build_ms']:.0f} ms" + (" (construits à la demande)" if rotation_cache.lazy else ""))
         
         # Caméra (pour suivre le joueur)
         self.camera_x = 0
         self.camera_y = 0
+        self.view_x = 0  # Caméra interpolée de l'image en cours de dessin
+        self.view_y = 0
         
         # Boost du joueur
         self.boost_amount = 0
@@ -602,11 +635,17 @@ class SpaceBattleClient:
         self.is_boosting = False
         
         # Particules de flammes
-        self.flame_particles = []
+        self.flame_particles = ParticlePool(FLAME_CAPACITY)
+        
+        # Qualité adaptative (quality: palier imposé, sinon choisi selon le temps des images)
+        self.quality = QualityGovernor(forced=quality)
+        self.show_shields = True
+        self.show_debug = False  # F3
+        self.apply_quality()
         
         # Protection au spawn (invincibilité)
         self.spawn_protection = True
-        self.spawn_protection_timer = 180  # 3 secondes à 60 FPS
+        self.spawn_protection_timer = 180  # 3 secondes (pas de simulation)
         self.spawn_protection_flash = 0
         
         # État de la partie
@@ -622,6 +661,13 @@ class SpaceBattleClient:
         self.super_bullet_flash = 0
         self.super_bullet_armed = False  # True quand E est pressé
         
+        # Panneaux du HUD, redessinés seulement quand ce qu'ils affichent change
+        self.round_panel = CachedPanel(HUD_PANEL_WIDTH, 50, self._draw_round_panel, alpha=False)
+        self.stats_panel = CachedPanel(240, 110, self._draw_stats_panel)
+        # Les lignes débordent du cadre de 35 + 6 x 28 px (titre et en-têtes font 57 px)
+        self.scoreboard_panel = CachedPanel(SCOREBOARD_WIDTH, 60 + SCOREBOARD_ROWS * SCOREBOARD_ROW_HEIGHT,
+                                            self._draw_scoreboard)
+        
         # Pickups de santé
         self.health_pickups = {}
         
@@ -639,23 +685,42 @@ class SpaceBattleClient:
             self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             self.socket.settimeout(5)  # Timeout de 5 secondes
             self.socket.connect((self.server_ip, self.port))
+            # Les messages partent déjà regroupés une fois par image: pas d'attente de Nagle
+            self.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
             print("✅ Socket connecté!")
             
             # Reçoit le message de bienvenue
             print("⏳ Attente du message de bienvenue...")
-            data = self.socket.recv(4096)
-            print(f"📦 Reçu {len(data)} bytes")
+            messages = []
+            while not messages:
+                if not self.reader.recv_into(self.socket):
+                    raise ConnectionError("connexion fermée avant le welcome")
+                messages = self.reader.messages()
+            print(f"📦 Reçu {self.reader.bytes_received} bytes")
             
             # Enlève le timeout après la connexion
             self.socket.settimeout(None)
             
-            # Parse le message (peut avoir un \n à la fin)
-            message_str = data.decode().strip()
-            welcome = json.loads(message_str)
+            welcome = messages[0]
             
             if welcome.get("type") == "welcome":
                 self.player_id = welcome["player_id"]
                 color = welcome["color"]
+                if self.preferred_protocol in welcome.get("protocols", []):
+                    self.protocol = self.preferred_protocol
+                
+                if self.use_udp and "udp_port" in welcome:
+                    self.udp_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+                    self.udp_socket.settimeout(0.5)
+                    self.udp_addr = (socket.gethostbyname(self.server_ip),
+                                     self.udp_port or welcome["udp_port"])
+                    self.udp_token = welcome["udp_token"]
+                
+                # L'arène a la taille de celle du serveur (respawn, portée des lasers, zone d'intérêt)
+                arena_size = (welcome.get("map_width", self.arena.width), welcome.get("map_height", self.arena.height))
+                if arena_size != (self.arena.width, self.arena.height):
+                    self.arena = SpaceArena(*arena_size)
+                    self.apply_quality()
                 
                 # Demande le nom au joueur
                 print(f"\n👤 Vous êtes le Joueur {self.player_id} ({color})")
@@ -670,14 +735,17 @@ class SpaceBattleClient:
                 # Envoie le nom au serveur
                 name_msg = {
                     "type": "set_name",
-                    "name": player_name
+                    "name": player_name,
+                    "protocol": self.protocol,
+                    "delta": True
                 }
                 self.send_message(name_msg)
+                self.flush_outbox()
                 
                 self.local_ship = Spaceship(
                     self.player_id,
-                    MAP_WIDTH // 2,
-                    MAP_HEIGHT // 2,
+                    self.arena.width // 2,
+                    self.arena.height // 2,
                     color
                 )
                 self.local_ship.name = player_name
@@ -719,6 +787,11 @@ class SpaceBattleClient:
         receive_thread = threading.Thread(target=self.receive_messages, daemon=True)
         receive_thread.start()
         
+        # Thread pour le canal UDP
+        if self.udp_socket:
+            udp_thread = threading.Thread(target=self.receive_datagrams, daemon=True)
+            udp_thread.start()
+        
         # Thread pour envoyer l'audio
         voice_thread = threading.Thread(target=self.voice_send_loop, daemon=True)
         voice_thread.start()
@@ -737,28 +810,17 @@ class SpaceBattleClient:
     
     def receive_messages(self):
         """Reçoit les messages du serveur"""
-        buffer = ""
         print("📡 Thread de réception démarré")
         
         while self.running:
             try:
-                data = self.socket.recv(4096).decode()
-                if not data:
+                if not self.reader.recv_into(self.socket):
                     print("📡 Connexion fermée par le serveur")
                     break
                 
-                buffer += data
-                
-                # Traite chaque ligne (message) séparément
-                while '\n' in buffer:
-                    line, buffer = buffer.split('\n', 1)
-                    if line.strip():
-                        try:
-                            message = json.loads(line)
-                            self.process_message(message)
-                        except json.JSONDecodeError as e:
-                            print(f"⚠️  JSON invalide: {e}")
-                            print(f"   Données: {line[:100]}")
+                # Chaque message complet (ligne JSON ou trame préfixée) part vers la boucle de jeu
+                for message in self.reader.messages():
+                    self.receive(message)
                             
             except socket.timeout:
                 continue
@@ -770,6 +832,87 @@ class SpaceBattleClient:
         print("📡 Thread de réception arrêté")
         self.running = False
     
+    def receive_datagrams(self):
+        """Reçoit les datagrammes UDP; ceux arrivés après un plus récent sont ignorés"""
+        self.send_datagram()  # Fait connaître notre adresse UDP au serveur
+        
+        while self.running:
+            try:
+                data, address = self.udp_socket.recvfrom(65536)
+            except socket.timeout:
+                if not self.udp_ready:
+                    self.send_datagram()  # Le premier datagramme a pu se perdre
+                continue
+            except OSError:
+                if not self.running:
+                    break
+                continue
+            
+            datagram = decode_datagram(data)
+            if address != self.udp_addr or datagram is None or datagram[0] != self.udp_token:
+                continue
+            
+            _, seq, payload = datagram
+            if seq <= self.udp_recv_seq:
+                self.udp_stale += 1
+                continue
+            self.udp_recv_seq = seq
+            
+            for message in decode_frames(bytearray(payload)):
+                self.receive(message)
+    
+    def receive(self, message):
+        """Appelé par les threads réseau: la voix est jouée tout de suite (écriture audio bloquante),
+        le reste attend la boucle de jeu"""
+        if message.get("type") == "voice":
+            self.play_voice(message)
+        else:
+            self.inbox.append(message)
+    
+    def process_inbox(self):
+        """Traite les messages reçus depuis l'image précédente, dans l'ordre d'arrivée"""
+        while self.inbox:
+            self.process_message(self.inbox.popleft())
+    
+    def play_voice(self, message):
+        """Joue l'audio d'un autre joueur"""
+        if message.get("player_id") != self.player_id:
+            audio_data = message.get("audio")
+            if audio_data:
+                self.voice_chat.play_audio(audio_data)
+    
+    def send_datagram(self, payload=b""):
+        """Envoie un datagramme numéroté au serveur"""
+        # Numéro et envoi sous verrou: des numéros en double ou partis dans le désordre
+        # seraient jetés comme périmés par le serveur
+        with self.udp_send_lock:
+            self.udp_send_seq += 1
+            self.send_calls += 1
+            try:
+                self.udp_socket.sendto(encode_datagram(self.udp_token, self.udp_send_seq, payload), self.udp_addr)
+            except OSError:
+                pass  # Canal non fiable: le prochain envoi remplacera celui-ci
+    
+    def send_unreliable(self, message):
+        """Envoie par UDP (positions, acks, voix) si le canal est ouvert, sinon par TCP"""
+        if not self.udp_ready:
+            self.send_message(message)
+            return
+        
+        data = encode(message, self.protocol)
+        if len(data) > MAX_DATAGRAM:
+            self.send_message(message)
+            return
+        
+        full = None
+        with self.outbox_lock:
+            if len(self.datagram_outbox) + len(data) > MAX_DATAGRAM:
+                full = bytes(self.datagram_outbox)
+                self.datagram_outbox.clear()
+            self.datagram_outbox += data
+        if full:
+            self.send_datagram(full)
+    
     def voice_send_loop(self):
         """Envoie l'audio du micro en continu"""
         while self.running and self.voice_chat.running:
@@ -779,14 +922,30 @@ class SpaceBattleClient:
                     "type": "voice",
                     "audio": audio_data
                 }
-                self.send_message(voice_msg)
+                self.send_unreliable(voice_msg)
             time.sleep(0.05)  # ~20 packets par seconde
     
     def process_message(self, message):
         """Traite un message du serveur"""
         msg_type = message.get("type")
         
+        if msg_type == "game_state_delta":
+            # Reconstruit le snapshot complet à partir de la base acquittée
+            base = self.snapshots.get(message.get("base"))
+            if base is None:
+                return  # Base inconnue: le serveur renverra un snapshot complet
+            message = apply_delta(base, message)
+            msg_type = "game_state"
+        
         if msg_type == "game_state":
+            # UDP et TCP peuvent livrer dans le désordre: on garde le plus récent
+            seq = message.get("seq")
+            if seq is not None:
+                if seq <= self.last_snapshot_seq:
+                    return
+                self.last_snapshot_seq = seq
+            self.store_snapshot(message)
+            
             # Met à jour l'état de la partie
             self.current_round = message.get("round", 0)
             self.total_rounds = message.get("total_rounds", 5)
@@ -796,9 +955,11 @@ class SpaceBattleClient:
             self.super_bullet_available = message.get("super_bullet_available", False)
             
             # Met à jour les pickups
-            self.health_pickups = {}
+            pickups = {}
             for pickup_data in message.get("health_pickups", []):
-                self.health_pickups[pickup_data["id"]] = pickup_data
+                pickups[pickup_data["id"]] = pickup_data
+            self.health_pickups = pickups
+            self.arena.set_pickups(pickups)
             
             # Met à jour tous les joueurs
             for player_data in message.get("players", []):
@@ -836,7 +997,7 @@ class SpaceBattleClient:
                         )
                         self.other_ships[player_id].name = player_data.get("name", f"Joueur{player_id}")
                     
-                        self.other_ships[player_id].update(player_data)
+                    self.other_ships[player_id].update(player_data)
                     self.other_ships[player_id].is_dead = player_data.get("is_dead", False)
                     self.other_ships[player_id].score = player_data.get("score", 0)
                     self.other_ships[player_id].kills = player_data.get("kills", 0)
@@ -851,27 +1012,28 @@ class SpaceBattleClient:
             # Un autre joueur a tiré
             player_id = message["player_id"]
             if player_id != self.player_id:
-                laser = Laser(
+                self.lasers.spawn(
+                    player_id,
+                    message.get("shot_id", 0),
                     message["x"],
                     message["y"],
                     message["angle"],
-                    player_id
+                    message.get("is_super", False)
                 )
-                self.lasers.append(laser)
+        
+        elif msg_type == "laser_hit":
+            # Le serveur a détecté la touche: le laser s'arrête chez tout le monde
+            self.lasers.remove(message.get("player_id"), message.get("shot_id"))
+        
+        elif msg_type == "udp_ready":
+            self.udp_ready = True
+            print("📡 Canal UDP actif (positions et voix)")
         
         elif msg_type == "player_left":
             player_id = message["player_id"]
             if player_id in self.other_ships:
                 del self.other_ships[player_id]
         
-        elif msg_type == "voice":
-            # Réception audio d'un autre joueur
-            player_id = message.get("player_id")
-            if player_id != self.player_id:
-                audio_data = message.get("audio")
-                if audio_data:
-                    self.voice_chat.play_audio(audio_data)
-        
         elif msg_type == "round_start":
             round_num = message.get("round", 1)
             print(f"\n🏁 MANCHE {round_num}/{self.total_rounds} DÉMARRÉE!")
@@ -894,12 +1056,26 @@ class SpaceBattleClient:
             pickup = message.get("pickup")
             if pickup:
                 self.health_pickups[pickup["id"]] = pickup
+                self.arena.add_pickup(pickup)
                 print(f"💉 Pickup de santé apparu!")
         
         elif msg_type == "pickup_collected":
             pickup_id = message.get("pickup_id")
             if pickup_id in self.health_pickups:
                 del self.health_pickups[pickup_id]
+            self.arena.remove_pickup(pickup_id)
+    
+    def store_snapshot(self, message):
+        """Garde le snapshot comme base possible des prochains deltas et l'acquitte"""
+        seq = message.get("seq")
+        if seq is None:
+            return
+        
+        self.snapshots[seq] = message
+        while len(self.snapshots) > self.max_snapshots:
+            del self.snapshots[next(iter(self.snapshots))]
+        
+        self.send_unreliable({"type": "ack", "seq": seq})
     
     def handle_input(self):
         """Gère les entrées joueur"""
@@ -950,23 +1126,20 @@ class SpaceBattleClient:
             self.boost_amount -= 0.5  # Consomme moins vite
             self.is_boosting = True
             
-            # Génère des particules de flammes
-            for _ in range(3):
-                # Position derrière le vaisseau
-                back_angle = self.local_ship.angle + math.pi
-                offset_x = math.cos(back_angle) * 15 + random.uniform(-5, 5)
-                offset_y = math.sin(back_angle) * 15 + random.uniform(-5, 5)
-                
-                self.flame_particles.append({
-                    'x': self.local_ship.x + offset_x,
-                    'y': self.local_ship.y + offset_y,
-                    'vx': math.cos(back_angle) * random.uniform(2, 5) + self.local_ship.vx * 0.3,
-                    'vy': math.sin(back_angle) * random.uniform(2, 5) + self.local_ship.vy * 0.3,
-                    'life': random.randint(10, 25),
-                    'max_life': 25,
-                    'size': random.uniform(4, 10),
-                    'color_type': random.choice(['orange', 'yellow', 'red'])
-                })
+            # Génère des particules de flammes (un lot de 3, derrière le vaisseau)
+            back_angle = self.local_ship.angle + math.pi
+            count = 3
+            flame_speed = np.random.uniform(2, 5, count)
+            self.flame_particles.emit(
+                x=self.local_ship.x + math.cos(back_angle) * 15 + np.random.uniform(-5, 5, count),
+                y=self.local_ship.y + math.sin(back_angle) * 15 + np.random.uniform(-5, 5, count),
+                vx=math.cos(back_angle) * flame_speed + self.local_ship.vx * 0.3,
+                vy=math.sin(back_angle) * flame_speed + self.local_ship.vy * 0.3,
+                life=np.random.randint(10, 26, count),
+                max_life=25,
+                size=np.random.uniform(4, 10, count),
+                kind=np.random.randint(0, len(FLAME_GREEN), count)
+            )
         
         # Limite vitesse (plus haute si boost actif)
         max_speed = 15 if self.is_boosting else 8
@@ -979,9 +1152,6 @@ class SpaceBattleClient:
         self.local_ship.x += self.local_ship.vx
         self.local_ship.y += self.local_ship.vy
         
-        # Met à jour les particules de flammes
-        self.update_flame_particles()
-        
         # Collision avec astéroïdes
         asteroid = self.arena.check_asteroid_collision(self.local_ship.x, self.local_ship.y)
         if asteroid:
@@ -1009,47 +1179,19 @@ class SpaceBattleClient:
             print("⚡ Boost collecté!")
         
         # Collecte de pickup de santé
-        for pickup_id, pickup in list(self.health_pickups.items()):
-            dist = math.sqrt((self.local_ship.x - pickup["x"])**2 + 
-                           (self.local_ship.y - pickup["y"])**2)
-            if dist < 40:  # Rayon de collecte
-                self.send_message({
-                    "type": "pickup_collect",
-                    "pickup_id": pickup_id
-                })
-                print("💉 Soin collecté! +50 HP")
-                if pickup_id in self.health_pickups:
-                    del self.health_pickups[pickup_id]
-                break
+        pickup_id = self.arena.check_pickup_collision(self.local_ship.x, self.local_ship.y)
+        if pickup_id is not None:
+            self.send_message({
+                "type": "pickup_collect",
+                "pickup_id": pickup_id
+            })
+            print("💉 Soin collecté! +50 HP")
+            self.health_pickups.pop(pickup_id, None)
+            self.arena.remove_pickup(pickup_id)
     
     def update_flame_particles(self):
         """Met à jour les particules de flammes"""
-        particles_to_remove = []
-        
-        for particle in self.flame_particles:
-            # Mouvement
-            particle['x'] += particle['vx']
-            particle['y'] += particle['vy']
-            
-            # Ralentit
-            particle['vx'] *= 0.92
-            particle['vy'] *= 0.92
-            
-            # Réduit la taille
-            particle['size'] *= 0.95
-            
-            # Vie
-            particle['life'] -= 1
-            
-            if particle['life'] <= 0 or particle['size'] < 1:
-                particles_to_remove.append(particle)
-        
-        for particle in particles_to_remove:
-            self.flame_particles.remove(particle)
-        
-        # Limite le nombre de particules
-        if len(self.flame_particles) > 100:
-            self.flame_particles = self.flame_particles[-100:]
+        self.flame_particles.update()
     
     def shoot(self):
         """Tire un laser"""
@@ -1061,18 +1203,21 @@ class SpaceBattleClient:
             self.super_bullet_armed = False
             print("💥 SUPER BALLE TIRÉE!")
         
-        laser = Laser(
+        shot_id = self.next_shot_id
+        self.next_shot_id += 1
+        self.lasers.spawn(
+            self.player_id,
+            shot_id,
             self.local_ship.x,
             self.local_ship.y,
             self.local_ship.angle,
-            self.player_id,
-            is_super=is_super
+            is_super
         )
-        self.lasers.append(laser)
         
-        # Envoie au serveur
+        # Demande le tir au serveur (il simule le laser et décide des touches)
         shoot_msg = {
             "type": "shoot",
+            "shot_id": shot_id,
             "x": self.local_ship.x,
             "y": self.local_ship.y,
             "angle": self.local_ship.angle,
@@ -1081,38 +1226,59 @@ class SpaceBattleClient:
         self.send_message(shoot_msg)
     
     def update_lasers(self):
-        """Met à jour les lasers"""
-        lasers_to_remove = []
+        """Met à jour les lasers (affichage seulement: les touches sont décidées par le serveur)"""
+        # Mouvement, durée de vie, bords de la map et contact avec un vaisseau en une passe;
+        # un laser qui atteint un vaisseau est caché sans attendre le laser_hit du serveur
+        ships = [ship for ship in self.other_ships.values() if not ship.is_dead]
+        self.lasers.step(
+            SIM_DT, self.arena.width, self.arena.height,
+            [ship.id for ship in ships], [ship.x for ship in ships], [ship.y for ship in ships]
+        )
+    
+    def simulate(self):
+        """Avance le jeu d'un pas fixe (SIM_DT), quel que soit le nombre d'images affichées"""
+        # État précédent, pour interpoler l'affichage jusqu'au pas suivant
+        self.prev_camera = (self.camera_x, self.camera_y)
+        self.prev_ship = (self.local_ship.x, self.local_ship.y)
         
-        for laser in self.lasers:
-            laser.update()
-            
-            hit = False
-            # Vérifie collisions (ignore les joueurs morts)
-            if laser.owner_id == self.player_id:
-                for ship in self.other_ships.values():
-                    if ship.is_dead:
-                        continue
-                    dist = math.sqrt((laser.x - ship.x)**2 + (laser.y - ship.y)**2)
-                    if dist < ship.size + laser.size:  # Taille du laser compte
-                        # Hit!
-                        self.send_message({
-                            "type": "hit",
-                            "target_id": ship.id,
-                            "damage": laser.damage,
-                            "is_super": laser.is_super
-                        })
-                        lasers_to_remove.append(laser)
-                        hit = True
-                        break
-            
-            if not hit and laser.is_dead():
-                lasers_to_remove.append(laser)
+        self.handle_input()
+        self.update_flame_particles()
+        self.update_lasers()
+        
+        # Met à jour la protection au spawn
+        if self.spawn_protection:
+            self.spawn_protection_timer -= 1
+            self.spawn_protection_flash += 1
+            if self.spawn_protection_timer <= 0:
+                self.spawn_protection = False
+                print("⚔️  Protection terminée - Vous êtes vulnérable!")
         
-        # Supprime les lasers marqués
-        for laser in lasers_to_remove:
-            if laser in self.lasers:
-                self.lasers.remove(laser)
+        # Met à jour le timer de respawn
+        if self.is_dead and self.respawn_timer > 0:
+            self.respawn_timer -= 1
+        
+        # Clignotement de la super balle
+        if self.super_bullet_available and not self.super_bullet_used:
+            self.super_bullet_flash = (self.super_bullet_flash + 1) % 30
+        
+        # Met à jour la caméra et l'arène
+        self.update_camera()
+        self.arena.update()
+    
+    def advance(self, frame_time: float):
+        """Joue les pas de simulation couverts par frame_time secondes (temps réel depuis l'image précédente)"""
+        self.sim_accumulator = min(self.sim_accumulator + frame_time, MAX_SIM_STEPS * SIM_DT)
+        while self.sim_accumulator >= SIM_DT:
+            self.simulate()
+            self.sim_accumulator -= SIM_DT
+        self.sim_alpha = self.sim_accumulator / SIM_DT
+    
+    def interpolate(self, previous, x, y):
+        """Position entre l'état du pas précédent et l'état courant, selon sim_alpha"""
+        if previous is None:
+            return x, y
+        alpha = self.sim_alpha
+        return previous[0] + (x - previous[0]) * alpha, previous[1] + (y - previous[1]) * alpha
     
     def send_position(self):
         """Envoie la position au serveur"""
@@ -1124,16 +1290,40 @@ class SpaceBattleClient:
             "vx": self.local_ship.vx,
             "vy": self.local_ship.vy
         }
-        self.send_message(move_msg)
+        self.send_unreliable(move_msg)
     
     def send_message(self, message):
-        """Envoie un message au serveur"""
-        try:
-            data = (json.dumps(message) + '\n').encode()
-            self.socket.send(data)
-        except Exception as e:
-            print(f"⚠️  Erreur envoi: {e}")
-            self.running = False
+        """Met un message en file pour le serveur (parti à la fin de l'image)"""
+        data = encode(message, self.protocol)
+        with self.outbox_lock:
+            self.outbox += data
+    
+    def flush_outbox(self):
+        """Envoie les messages de l'image: un envoi TCP et un datagramme au plus"""
+        with self.outbox_lock:
+            data = bytes(self.outbox)
+            self.outbox.clear()
+            datagram = bytes(self.datagram_outbox)
+            self.datagram_outbox.clear()
+        
+        if data:
+            try:
+                self.socket.sendall(data)
+                self.send_calls += 1
+            except Exception as e:
+                print(f"⚠️  Erreur envoi: {e}")
+                self.running = False
+        if datagram:
+            self.send_datagram(datagram)
+    
+    def apply_quality(self):
+        """Applique les réglages du palier de qualité courant"""
+        settings = self.quality.settings
+        self.arena.stars.density = settings["stars"]
+        self.arena.set_nebulas(settings["nebulas"])
+        self.flame_particles.set_limit(settings["particles"])
+        self.show_shields = settings["shields"]
+        self.arena.minimap.refresh_ms = settings["minimap_ms"]
     
     def update_camera(self):
         """Met à jour la caméra pour suivre le joueur"""
@@ -1146,67 +1336,38 @@ class SpaceBattleClient:
         self.camera_y += (target_y - self.camera_y) * 0.1
         
         # Limite la caméra aux bords de la map
-        self.camera_x = max(0, min(MAP_WIDTH - SCREEN_WIDTH, self.camera_x))
-        self.camera_y = max(0, min(MAP_HEIGHT - SCREEN_HEIGHT, self.camera_y))
+        self.camera_x = max(0, min(self.arena.width - SCREEN_WIDTH, self.camera_x))
+        self.camera_y = max(0, min(self.arena.height - SCREEN_HEIGHT, self.camera_y))
     
     def draw(self):
         """Dessine tout"""
+        # Caméra entre les deux derniers pas de simulation
+        self.view_x, self.view_y = self.interpolate(self.prev_camera, self.camera_x, self.camera_y)
+        
         # Fond de l'arène
-        self.arena.draw_background(self.screen, self.camera_x, self.camera_y)
+        self.arena.draw_background(self.screen, self.view_x, self.view_y)
         
         # Éléments de l'arène (grille, murs, obstacles)
-        self.arena.draw_arena(self.screen, self.camera_x, self.camera_y)
+        self.arena.draw_arena(self.screen, self.view_x, self.view_y)
         
         # Particules de flammes (boost) 🔥
-        for particle in self.flame_particles:
-            px = particle['x'] - self.camera_x
-            py = particle['y'] - self.camera_y
-            
-            if 0 <= px <= SCREEN_WIDTH and 0 <= py <= SCREEN_HEIGHT:
-                # Couleur selon le type et la vie restante
-                life_ratio = particle['life'] / particle['max_life']
-                
-                if particle['color_type'] == 'orange':
-                    color = (255, int(140 * life_ratio), 0)
-                elif particle['color_type'] == 'yellow':
-                    color = (255, int(255 * life_ratio), 0)
-                else:  # red
-                    color = (255, int(50 * life_ratio), 0)
-                
-                size = int(particle['size'])
-                if size > 0:
-                    # Dessine avec un effet de glow
-                    glow_surf = pygame.Surface((size * 4, size * 4), pygame.SRCALPHA)
-                    pygame.draw.circle(glow_surf, (*color, int(100 * life_ratio)), 
-                                      (size * 2, size * 2), size * 2)
-                    pygame.draw.circle(glow_surf, (*color, int(200 * life_ratio)), 
-                                      (size * 2, size * 2), size)
-                    self.screen.blit(glow_surf, (px - size * 2, py - size * 2))
+        self.draw_flame_particles()
         
         # Lasers
-        for laser in self.lasers:
-            lx = laser.x - self.camera_x
-            ly = laser.y - self.camera_y
-            if 0 <= lx <= SCREEN_WIDTH and 0 <= ly <= SCREEN_HEIGHT:
-                pygame.draw.circle(self.screen, CYAN, (int(lx), int(ly)), 3)
-                # Trainée du laser
-                trail_x = lx - laser.vx * 2
-                trail_y = ly - laser.vy * 2
-                pygame.draw.line(self.screen, (0, 150, 200), (int(trail_x), int(trail_y)), (int(lx), int(ly)), 2)
+        self.draw_lasers()
         
         # Pickups de santé (seringues)
         for pickup in self.health_pickups.values():
-            px = pickup["x"] - self.camera_x
-            py = pickup["y"] - self.camera_y
+            px = pickup["x"] - self.view_x
+            py = pickup["y"] - self.view_y
             if -50 < px < SCREEN_WIDTH + 50 and -50 < py < SCREEN_HEIGHT + 50:
                 # Effet pulsant
                 pulse = math.sin(pygame.time.get_ticks() * 0.005) * 0.2 + 1.0
                 size = int(20 * pulse)
                 
                 # Glow vert
-                glow_surf = pygame.Surface((size * 3, size * 3), pygame.SRCALPHA)
-                pygame.draw.circle(glow_surf, (0, 255, 100, 50), (size * 1.5, size * 1.5), size * 1.5)
-                self.screen.blit(glow_surf, (px - size * 1.5, py - size * 1.5))
+                glow_radius = int(size * 1.5)
+                self.screen.blit(glow(glow_radius, (0, 255, 100), 50), (px - glow_radius, py - glow_radius))
                 
                 # Croix médicale
                 pygame.draw.rect(self.screen, (255, 255, 255), (px - 3, py - 12, 6, 24))
@@ -1215,23 +1376,23 @@ class SpaceBattleClient:
                 pygame.draw.rect(self.screen, (0, 200, 100), (px - 10, py - 2, 20, 4))
                 
                 # Label
-                font = pygame.font.Font(None, 18)
-                label = font.render("+50", True, NEON_GREEN)
+                label = render_text("+50", 18, NEON_GREEN)
                 self.screen.blit(label, (px - 12, py + 18))
         
         # Vaisseaux des autres joueurs (seulement s'ils sont vivants)
         for ship in self.other_ships.values():
             if ship.is_dead:
                 continue  # Ne pas dessiner les joueurs morts
-            sx = ship.x - self.camera_x
-            sy = ship.y - self.camera_y
+            sx = ship.x - self.view_x
+            sy = ship.y - self.view_y
             if -50 < sx < SCREEN_WIDTH + 50 and -50 < sy < SCREEN_HEIGHT + 50:
                 self._draw_ship(ship, sx, sy, is_local=False)
         
         # Vaisseau local (seulement si vivant)
         if self.local_ship and not self.is_dead:
-            lx = self.local_ship.x - self.camera_x
-            ly = self.local_ship.y - self.camera_y
+            ship_x, ship_y = self.interpolate(self.prev_ship, self.local_ship.x, self.local_ship.y)
+            lx = ship_x - self.view_x
+            ly = ship_y - self.view_y
             self._draw_ship(self.local_ship, lx, ly, is_local=True)
         
         # Minimap
@@ -1253,6 +1414,82 @@ class SpaceBattleClient:
         
         pygame.display.flip()
     
+    def flame_sprite(self, kind: int, size: int, level: int):
+        """Sprite de flamme avec glow, créé une fois par (type, taille, palier de vie)"""
+        def build():
+            life_ratio = level / FLAME_LEVELS
+            color = (255, int(FLAME_GREEN[kind] * life_ratio), 0)
+            sprite = pygame.Surface((size * 4, size * 4), pygame.SRCALPHA)
+            pygame.draw.circle(sprite, (*color, int(100 * life_ratio)), (size * 2, size * 2), size * 2)
+            pygame.draw.circle(sprite, (*color, int(200 * life_ratio)), (size * 2, size * 2), size)
+            return sprite
+        
+        return sprite_cache.get(("flame", kind, size, level), build)
+    
+    def shield_sprite(self, shield_radius: int):
+        """Bouclier de protection au spawn pour un rayon donné"""
+        def build():
+            shield_surface = pygame.Surface((shield_radius * 2 + 20, shield_radius * 2 + 20), pygame.SRCALPHA)
+            
+            # Cercles concentriques pour l'effet de bouclier
+            for i in range(3):
+                alpha = int(80 - i * 20)
+                radius = shield_radius - i * 5
+                color = (100, 200, 255, alpha)  # Bleu clair
+                pygame.draw.circle(shield_surface, color, (shield_radius + 10, shield_radius + 10), radius, 3)
+            
+            # Remplissage semi-transparent
+            pygame.draw.circle(shield_surface, (100, 200, 255, 30), (shield_radius + 10, shield_radius + 10), shield_radius)
+            return shield_surface
+        
+        return sprite_cache.get(("shield", shield_radius), build)
+    
+    def draw_flame_particles(self):
+        """Dessine les flammes visibles en un seul appel blits"""
+        particles = self.flame_particles
+        visible = particles.visible(self.view_x, self.view_y, SCREEN_WIDTH, SCREEN_HEIGHT)
+        if visible.size == 0:
+            return
+        
+        sizes = particles.size[visible].astype(int)
+        levels = np.ceil(particles.life[visible] / particles.max_life[visible] * FLAME_LEVELS)
+        levels = np.clip(levels, 1, FLAME_LEVELS).astype(int)
+        # Coin haut-gauche du sprite (centré sur la particule)
+        left = (particles.x[visible] - self.view_x - sizes * 2).astype(int)
+        top = (particles.y[visible] - self.view_y - sizes * 2).astype(int)
+        
+        self.screen.blits([
+            (self.flame_sprite(kind, size, level), (x, y))
+            for kind, size, level, x, y in zip(particles.kind[visible].tolist(), sizes.tolist(),
+                                               levels.tolist(), left.tolist(), top.tolist())
+        ], doreturn=False)
+    
+    def draw_lasers(self):
+        """Dessine les lasers visibles (le tri hors écran est fait sur les tableaux)"""
+        lasers = self.lasers
+        n = lasers.count
+        if n == 0:
+            return
+        
+        # Position entre les deux derniers pas: recul de la fraction de pas pas encore écoulée
+        back = (1 - self.sim_alpha) * SIM_DT
+        lx = lasers.x[:n] - lasers.vx[:n] * back - self.view_x
+        ly = lasers.y[:n] - lasers.vy[:n] * back - self.view_y
+        visible = np.flatnonzero((lx >= 0) & (lx <= SCREEN_WIDTH) & (ly >= 0) & (ly <= SCREEN_HEIGHT))
+        if visible.size == 0:
+            return
+        
+        # Trainée du laser: deux pas en arrière
+        trail = 2 * SIM_DT
+        tx = (lx[visible] - lasers.vx[visible] * trail).astype(int).tolist()
+        ty = (ly[visible] - lasers.vy[visible] * trail).astype(int).tolist()
+        lx = lx[visible].astype(int).tolist()
+        ly = ly[visible].astype(int).tolist()
+        
+        for x, y, trail_x, trail_y in zip(lx, ly, tx, ty):
+            pygame.draw.circle(self.screen, CYAN, (x, y), 3)
+            pygame.draw.line(self.screen, (0, 150, 200), (trail_x, trail_y), (x, y), 2)
+    
     def _draw_ship(self, ship, screen_x, screen_y, is_local=False):
         """Dessine un vaisseau à une position écran"""
         
@@ -1270,47 +1507,27 @@ class SpaceBattleClient:
                 flash_value = pygame.time.get_ticks() // 16
                 shield_pulse = math.sin(flash_value * 0.2) * 0.3 + 0.7
             
-            shield_radius = int((ship.size + 20) * shield_pulse)
-            
-            # Bouclier stylisé
-            shield_surface = pygame.Surface((shield_radius * 2 + 20, shield_radius * 2 + 20), pygame.SRCALPHA)
-            
-            # Cercles concentriques pour l'effet de bouclier
-            for i in range(3):
-                alpha = int(80 - i * 20)
-                radius = shield_radius - i * 5
-                color = (100, 200, 255, alpha)  # Bleu clair
-                pygame.draw.circle(shield_surface, color, (shield_radius + 10, shield_radius + 10), radius, 3)
-            
-            # Remplissage semi-transparent
-            pygame.draw.circle(shield_surface, (100, 200, 255, 30), (shield_radius + 10, shield_radius + 10), shield_radius)
+            shield_radius = quantize((ship.size + 20) * shield_pulse, 2)
             
-            self.screen.blit(shield_surface, (screen_x - shield_radius - 10, screen_y - shield_radius - 10))
+            # Bouclier stylisé (un simple cercle en qualité réduite)
+            if self.show_shields:
+                self.screen.blit(self.shield_sprite(shield_radius),
+                                 (screen_x - shield_radius - 10, screen_y - shield_radius - 10))
+            else:
+                pygame.draw.circle(self.screen, (100, 200, 255), (int(screen_x), int(screen_y)), shield_radius, 2)
             
             # Texte du compte à rebours (seulement pour le joueur local)
             if is_local:
                 seconds_left = (self.spawn_protection_timer // 60) + 1
-                font = pygame.font.Font(None, 28)
-                timer_text = font.render(f"🛡️ {seconds_left}s", True, (100, 200, 255))
+                timer_text = render_text(f"🛡️ {seconds_left}s", 28, (100, 200, 255))
                 text_rect = timer_text.get_rect(center=(screen_x, screen_y - ship.size - 45))
                 self.screen.blit(timer_text, text_rect)
             else:
                 # Indicateur "PROTÉGÉ" pour les autres joueurs
-                font = pygame.font.Font(None, 20)
-                prot_text = font.render("🛡️", True, (100, 200, 255))
+                prot_text = render_text("🛡️", 20, (100, 200, 255))
                 text_rect = prot_text.get_rect(center=(screen_x, screen_y - ship.size - 45))
                 self.screen.blit(prot_text, text_rect)
         
-        # Triangle
-        points = [
-            (screen_x + math.cos(ship.angle) * ship.size,
-             screen_y + math.sin(ship.angle) * ship.size),
-            (screen_x + math.cos(ship.angle + 2.5) * ship.size * 0.6,
-             screen_y + math.sin(ship.angle + 2.5) * ship.size * 0.6),
-            (screen_x + math.cos(ship.angle - 2.5) * ship.size * 0.6,
-             screen_y + math.sin(ship.angle - 2.5) * ship.size * 0.6)
-        ]
-        
         # Effet boost (flammes à l'arrière du vaisseau)
         if is_local and self.is_boosting:
             back_angle = ship.angle + math.pi
@@ -1357,12 +1574,11 @@ class SpaceBattleClient:
         # Effet glow pour le vaisseau local
         if is_local:
             glow_color = ORANGE if self.is_boosting else CYAN
-            glow_surface = pygame.Surface((ship.size * 4, ship.size * 4), pygame.SRCALPHA)
-            pygame.draw.circle(glow_surface, (*glow_color[:3], 50), (ship.size * 2, ship.size * 2), ship.size + 10)
-            self.screen.blit(glow_surface, (screen_x - ship.size * 2, screen_y - ship.size * 2))
+            glow_radius = ship.size + 10
+            self.screen.blit(glow(glow_radius, glow_color, 50), (screen_x - glow_radius, screen_y - glow_radius))
         
-        pygame.draw.polygon(self.screen, ship.color, points)
-        pygame.draw.polygon(self.screen, WHITE, points, 2)
+        # Coque: sprite pré-dessiné à l'angle le plus proche
+        rotation_cache.blit(self.screen, hull_key(ship.size, ship.color), ship.angle, screen_x, screen_y)
         
         if is_local:
             ring_color = ORANGE if self.is_boosting else CYAN
@@ -1378,165 +1594,111 @@ class SpaceBattleClient:
         pygame.draw.rect(self.screen, GREEN, (bar_x, bar_y, bar_width * ship.health / 100, bar_height))
         
         # Nom
-        font = pygame.font.Font(None, 20)
-        name_text = font.render(ship.name, True, WHITE)
+        name_text = render_text(ship.name, 20, WHITE)
         text_rect = name_text.get_rect(center=(screen_x, screen_y - ship.size - 28))
         pygame.draw.rect(self.screen, BLACK, text_rect.inflate(4, 2))
         self.screen.blit(name_text, text_rect)
     
-    def _draw_hud(self):
-        """Dessine le HUD"""
-        # ═══════════════════════════════════════════════════
-        # PANNEAU SUPÉRIEUR CENTRAL - Round et Timer
-        # ═══════════════════════════════════════════════════
-        
-        # Fond du panneau
-        panel_width = 250
-        panel_x = SCREEN_WIDTH // 2 - panel_width // 2
-        pygame.draw.rect(self.screen, (0, 0, 0, 180), (panel_x, 5, panel_width, 50))
-        pygame.draw.rect(self.screen, NEON_BLUE, (panel_x, 5, panel_width, 50), 2)
+    def _draw_round_panel(self, surface, current_round, total_rounds, minutes, seconds, timer_color):
+        """Panneau manche/timer (redessiné une fois par seconde)"""
+        pygame.draw.rect(surface, NEON_BLUE, (0, 0, HUD_PANEL_WIDTH, 50), 2)
         
         # Manche
-        round_text = self.font.render(f"MANCHE {self.current_round}/{self.total_rounds}", True, WHITE)
-        round_rect = round_text.get_rect(center=(SCREEN_WIDTH // 2, 20))
-        self.screen.blit(round_text, round_rect)
+        round_text = render_text(f"MANCHE {current_round}/{total_rounds}", FONT_SIZE, WHITE)
+        surface.blit(round_text, round_text.get_rect(center=(HUD_PANEL_WIDTH // 2, 15)))
         
         # Timer
-        minutes = int(self.time_remaining // 60)
-        seconds = int(self.time_remaining % 60)
-        timer_color = RED if self.time_remaining < 30 else YELLOW if self.time_remaining < 60 else WHITE
-        timer_text = self.font.render(f"{minutes:02d}:{seconds:02d}", True, timer_color)
-        timer_rect = timer_text.get_rect(center=(SCREEN_WIDTH // 2, 42))
-        self.screen.blit(timer_text, timer_rect)
-        
-        # ═══════════════════════════════════════════════════
-        # PANNEAU GAUCHE - Stats du joueur
-        # ═══════════════════════════════════════════════════
-        
+        timer_text = render_text(f"{minutes:02d}:{seconds:02d}", FONT_SIZE, timer_color)
+        surface.blit(timer_text, timer_text.get_rect(center=(HUD_PANEL_WIDTH // 2, 37)))
+    
+    def _draw_stats_panel(self, surface, name, health, kills, score, boost_fill, boost_color):
+        """Nom, santé, kills, score et barre de boost (coordonnées écran: le panneau est en (0, 0))"""
         y_offset = 10
         
         # Nom et santé
-        info_text = self.small_font.render(f"{self.local_ship.name}", True, WHITE)
-        self.screen.blit(info_text, (10, y_offset))
+        info_text = render_text(f"{name}", SMALL_FONT_SIZE, WHITE)
+        surface.blit(info_text, (10, y_offset))
         y_offset += 20
         
         # Barre de santé
         health_bar_width = 150
         health_bar_height = 12
-        pygame.draw.rect(self.screen, (50, 50, 50), (10, y_offset, health_bar_width, health_bar_height))
-        health_fill = (self.local_ship.health / 100) * health_bar_width
-        health_color = GREEN if self.local_ship.health > 50 else YELLOW if self.local_ship.health > 25 else RED
-        pygame.draw.rect(self.screen, health_color, (10, y_offset, health_fill, health_bar_height))
-        pygame.draw.rect(self.screen, WHITE, (10, y_offset, health_bar_width, health_bar_height), 1)
-        
-        health_label = self.small_font.render(f"{int(self.local_ship.health)}/100", True, WHITE)
-        self.screen.blit(health_label, (165, y_offset - 2))
+        pygame.draw.rect(surface, (50, 50, 50), (10, y_offset, health_bar_width, health_bar_height))
+        health_fill = (health / 100) * health_bar_width
+        health_color = GREEN if health > 50 else YELLOW if health > 25 else RED
+        pygame.draw.rect(surface, health_color, (10, y_offset, health_fill, health_bar_height))
+        pygame.draw.rect(surface, WHITE, (10, y_offset, health_bar_width, health_bar_height), 1)
+        
+        health_label = render_text(f"{health}/100", SMALL_FONT_SIZE, WHITE)
+        surface.blit(health_label, (165, y_offset - 2))
         y_offset += 20
         
         # Kills et Score
-        kills_text = self.small_font.render(f"🎯 Kills: {self.local_ship.kills}", True, WHITE)
-        self.screen.blit(kills_text, (10, y_offset))
+        kills_text = render_text(f"🎯 Kills: {kills}", SMALL_FONT_SIZE, WHITE)
+        surface.blit(kills_text, (10, y_offset))
         y_offset += 18
         
-        score_text = self.small_font.render(f"⭐ Score: {self.local_ship.score}", True, YELLOW)
-        self.screen.blit(score_text, (10, y_offset))
+        score_text = render_text(f"⭐ Score: {score}", SMALL_FONT_SIZE, YELLOW)
+        surface.blit(score_text, (10, y_offset))
         y_offset += 25
         
         # Barre de boost
         boost_bar_width = 150
         boost_bar_height = 12
-        pygame.draw.rect(self.screen, (30, 30, 30), (10, y_offset, boost_bar_width, boost_bar_height))
-        fill_width = (self.boost_amount / self.max_boost) * boost_bar_width
-        boost_color = NEON_GREEN if self.boost_amount > 30 else ORANGE if self.boost_amount > 10 else RED
-        pygame.draw.rect(self.screen, boost_color, (10, y_offset, fill_width, boost_bar_height))
-        pygame.draw.rect(self.screen, WHITE, (10, y_offset, boost_bar_width, boost_bar_height), 1)
-        boost_label = self.small_font.render(f"⚡ BOOST (SHIFT)", True, WHITE)
-        self.screen.blit(boost_label, (10, y_offset - 15))
-        y_offset += 20
-        
-        # Super balle disponible
-        if self.super_bullet_available and not self.super_bullet_used:
-            self.super_bullet_flash = (self.super_bullet_flash + 1) % 30
-            
-            if self.super_bullet_armed:
-                # Super balle armée - prête à tirer
-                pygame.draw.rect(self.screen, (255, 50, 0), (5, y_offset - 2, 200, 22))
-                pygame.draw.rect(self.screen, YELLOW, (5, y_offset - 2, 200, 22), 2)
-                super_text = self.small_font.render("💥 ARMÉE! TIREZ!", True, WHITE)
-                self.screen.blit(super_text, (10, y_offset))
-            else:
-                # Super balle disponible - appuyer sur E
-                if self.super_bullet_flash < 20:
-                    pygame.draw.rect(self.screen, (100, 50, 0), (5, y_offset - 2, 200, 22))
-                    super_text = self.small_font.render("💥 SUPER BALLE [E]", True, ORANGE)
-                    self.screen.blit(super_text, (10, y_offset))
-        y_offset += 25
-        
-        # Indicateur micro
-        if self.voice_chat.available:
-            mic_status = "🎤 ON" if self.voice_chat.mic_active else "🔇 OFF"
-            mic_color = GREEN if self.voice_chat.mic_active else RED
-            mic_text = self.small_font.render(f"Micro: {mic_status} (V)", True, mic_color)
-            self.screen.blit(mic_text, (10, y_offset))
-        
-        # ═══════════════════════════════════════════════════
-        # PANNEAU DROIT - Tableau des scores
-        # ═══════════════════════════════════════════════════
-        
-        # Liste tous les joueurs triés par score
-        all_players = [(self.local_ship.name, self.local_ship.score, self.local_ship.kills, True)]
-        for ship in self.other_ships.values():
-            all_players.append((ship.name, ship.score, ship.kills, False))
-        all_players.sort(key=lambda x: x[1], reverse=True)
-        
-        scoreboard_x = SCREEN_WIDTH - 220
-        scoreboard_y = 60
-        scoreboard_width = 210
-        row_height = 28
-        num_players = min(len(all_players), 6)
-        scoreboard_height = 35 + num_players * row_height
-        
-        # Fond du tableau
-        pygame.draw.rect(self.screen, (0, 0, 0, 200), (scoreboard_x - 5, scoreboard_y - 5, scoreboard_width, scoreboard_height))
-        pygame.draw.rect(self.screen, NEON_PURPLE, (scoreboard_x - 5, scoreboard_y - 5, scoreboard_width, scoreboard_height), 3)
+        pygame.draw.rect(surface, (30, 30, 30), (10, y_offset, boost_bar_width, boost_bar_height))
+        pygame.draw.rect(surface, boost_color, (10, y_offset, boost_fill, boost_bar_height))
+        pygame.draw.rect(surface, WHITE, (10, y_offset, boost_bar_width, boost_bar_height), 1)
+        boost_label = render_text(f"⚡ BOOST (SHIFT)", SMALL_FONT_SIZE, WHITE)
+        surface.blit(boost_label, (10, y_offset - 15))
+    
+    def _draw_scoreboard(self, surface, players):
+        """Tableau des scores, ((nom, score, kills, local), ...) déjà triés"""
+        scoreboard_x = 5
+        scoreboard_y = 5
+        scoreboard_width = SCOREBOARD_WIDTH
+        row_height = SCOREBOARD_ROW_HEIGHT
+        scoreboard_height = 35 + len(players) * row_height
+        
+        # Fond du tableau (opaque comme avant: l'alpha était ignoré en dessinant sur l'écran)
+        pygame.draw.rect(surface, (0, 0, 0), (scoreboard_x - 5, scoreboard_y - 5, scoreboard_width, scoreboard_height))
+        pygame.draw.rect(surface, NEON_PURPLE, (scoreboard_x - 5, scoreboard_y - 5, scoreboard_width, scoreboard_height), 3)
         
         # Titre avec ligne de séparation
-        title = self.font.render("🏆 SCORES", True, YELLOW)
+        title = render_text("🏆 SCORES", FONT_SIZE, YELLOW)
         title_rect = title.get_rect(center=(scoreboard_x + scoreboard_width // 2 - 5, scoreboard_y + 12))
-        self.screen.blit(title, title_rect)
+        surface.blit(title, title_rect)
         scoreboard_y += 30
         
         # Ligne de séparation sous le titre
-        pygame.draw.line(self.screen, NEON_PURPLE, 
+        pygame.draw.line(surface, NEON_PURPLE, 
                         (scoreboard_x, scoreboard_y - 5), 
                         (scoreboard_x + scoreboard_width - 10, scoreboard_y - 5), 2)
         
         # En-têtes des colonnes
-        header_font = pygame.font.Font(None, 18)
-        pygame.draw.rect(self.screen, (30, 30, 60), (scoreboard_x, scoreboard_y, scoreboard_width - 10, 20))
+        pygame.draw.rect(surface, (30, 30, 60), (scoreboard_x, scoreboard_y, scoreboard_width - 10, 20))
         
-        rank_header = header_font.render("#", True, GRAY)
-        name_header = header_font.render("JOUEUR", True, GRAY)
-        kills_header = header_font.render("KILLS", True, GRAY)
-        score_header = header_font.render("PTS", True, GRAY)
+        rank_header = render_text("#", 18, GRAY)
+        name_header = render_text("JOUEUR", 18, GRAY)
+        kills_header = render_text("KILLS", 18, GRAY)
+        score_header = render_text("PTS", 18, GRAY)
         
-        self.screen.blit(rank_header, (scoreboard_x + 5, scoreboard_y + 3))
-        self.screen.blit(name_header, (scoreboard_x + 25, scoreboard_y + 3))
-        self.screen.blit(kills_header, (scoreboard_x + 120, scoreboard_y + 3))
-        self.screen.blit(score_header, (scoreboard_x + 165, scoreboard_y + 3))
+        surface.blit(rank_header, (scoreboard_x + 5, scoreboard_y + 3))
+        surface.blit(name_header, (scoreboard_x + 25, scoreboard_y + 3))
+        surface.blit(kills_header, (scoreboard_x + 120, scoreboard_y + 3))
+        surface.blit(score_header, (scoreboard_x + 165, scoreboard_y + 3))
         
         scoreboard_y += 22
         
         # Ligne de séparation
-        pygame.draw.line(self.screen, (60, 60, 100), 
+        pygame.draw.line(surface, (60, 60, 100), 
                         (scoreboard_x, scoreboard_y - 2), 
                         (scoreboard_x + scoreboard_width - 10, scoreboard_y - 2), 1)
         
         # Joueurs
-        for i, (name, score, kills, is_local) in enumerate(all_players[:6]):
+        for i, (name, score, kills, is_local) in enumerate(players):
             # Fond alterné pour les lignes
             if i % 2 == 0:
-                pygame.draw.rect(self.screen, (20, 20, 40), 
+                pygame.draw.rect(surface, (20, 20, 40), 
                                (scoreboard_x, scoreboard_y, scoreboard_width - 10, row_height - 4))
             
             # Couleur selon le rang
@@ -1555,33 +1717,92 @@ class SpaceBattleClient:
             
             # Surligne le joueur local
             if is_local:
-                pygame.draw.rect(self.screen, (0, 100, 150, 100), 
+                pygame.draw.rect(surface, (0, 100, 150), 
                                (scoreboard_x, scoreboard_y, scoreboard_width - 10, row_height - 4), 2)
                 color = CYAN
             
             # Rang
-            rank_text = self.small_font.render(rank_icon, True, color)
-            self.screen.blit(rank_text, (scoreboard_x + 3, scoreboard_y + 4))
+            rank_text = render_text(rank_icon, SMALL_FONT_SIZE, color)
+            surface.blit(rank_text, (scoreboard_x + 3, scoreboard_y + 4))
             
             # Nom (tronqué si trop long)
             display_name = name[:10] + ".." if len(name) > 10 else name
-            name_text = self.small_font.render(display_name, True, color)
-            self.screen.blit(name_text, (scoreboard_x + 25, scoreboard_y + 4))
+            name_text = render_text(display_name, SMALL_FONT_SIZE, color)
+            surface.blit(name_text, (scoreboard_x + 25, scoreboard_y + 4))
             
             # Kills
-            kills_text = self.small_font.render(str(kills), True, color)
-            self.screen.blit(kills_text, (scoreboard_x + 130, scoreboard_y + 4))
+            kills_text = render_text(str(kills), SMALL_FONT_SIZE, color)
+            surface.blit(kills_text, (scoreboard_x + 130, scoreboard_y + 4))
             
             # Score
-            score_text = self.small_font.render(str(score), True, color)
-            self.screen.blit(score_text, (scoreboard_x + 165, scoreboard_y + 4))
+            score_text = render_text(str(score), SMALL_FONT_SIZE, color)
+            surface.blit(score_text, (scoreboard_x + 165, scoreboard_y + 4))
             
             scoreboard_y += row_height
             
             # Ligne de séparation entre les joueurs
-            pygame.draw.line(self.screen, (40, 40, 80), 
+            pygame.draw.line(surface, (40, 40, 80), 
                            (scoreboard_x + 5, scoreboard_y - 4), 
                            (scoreboard_x + scoreboard_width - 15, scoreboard_y - 4), 1)
+    
+    def _draw_hud(self):
+        """Dessine le HUD"""
+        # ═══════════════════════════════════════════════════
+        # PANNEAU SUPÉRIEUR CENTRAL - Round et Timer
+        # ═══════════════════════════════════════════════════
+        
+        minutes = int(self.time_remaining // 60)
+        seconds = int(self.time_remaining % 60)
+        timer_color = RED if self.time_remaining < 30 else YELLOW if self.time_remaining < 60 else WHITE
+        panel = self.round_panel.get(self.current_round, self.total_rounds, minutes, seconds, timer_color)
+        self.screen.blit(panel, (SCREEN_WIDTH // 2 - HUD_PANEL_WIDTH // 2, 5))
+        
+        # ═══════════════════════════════════════════════════
+        # PANNEAU GAUCHE - Stats du joueur
+        # ═══════════════════════════════════════════════════
+        
+        boost_fill = int(self.boost_amount / self.max_boost * 150)
+        boost_color = NEON_GREEN if self.boost_amount > 30 else ORANGE if self.boost_amount > 10 else RED
+        panel = self.stats_panel.get(self.local_ship.name, int(self.local_ship.health), self.local_ship.kills,
+                                     self.local_ship.score, boost_fill, boost_color)
+        self.screen.blit(panel, (0, 0))
+        y_offset = 113  # Sous la barre de boost du panneau
+        
+        # Super balle disponible
+        if self.super_bullet_available and not self.super_bullet_used:
+            if self.super_bullet_armed:
+                # Super balle armée - prête à tirer
+                pygame.draw.rect(self.screen, (255, 50, 0), (5, y_offset - 2, 200, 22))
+                pygame.draw.rect(self.screen, YELLOW, (5, y_offset - 2, 200, 22), 2)
+                super_text = render_text("💥 ARMÉE! TIREZ!", SMALL_FONT_SIZE, WHITE)
+                self.screen.blit(super_text, (10, y_offset))
+            else:
+                # Super balle disponible - appuyer sur E
+                if self.super_bullet_flash < 20:
+                    pygame.draw.rect(self.screen, (100, 50, 0), (5, y_offset - 2, 200, 22))
+                    super_text = render_text("💥 SUPER BALLE [E]", SMALL_FONT_SIZE, ORANGE)
+                    self.screen.blit(super_text, (10, y_offset))
+        y_offset += 25
+        
+        # Indicateur micro
+        if self.voice_chat.available:
+            mic_status = "🎤 ON" if self.voice_chat.mic_active else "🔇 OFF"
+            mic_color = GREEN if self.voice_chat.mic_active else RED
+            mic_text = render_text(f"Micro: {mic_status} (V)", SMALL_FONT_SIZE, mic_color)
+            self.screen.blit(mic_text, (10, y_offset))
+        
+        # ═══════════════════════════════════════════════════
+        # PANNEAU DROIT - Tableau des scores
+        # ═══════════════════════════════════════════════════
+        
+        # Liste tous les joueurs triés par score
+        all_players = [(self.local_ship.name, self.local_ship.score, self.local_ship.kills, True)]
+        for ship in self.other_ships.values():
+            all_players.append((ship.name, ship.score, ship.kills, False))
+        all_players.sort(key=lambda x: x[1], reverse=True)
+        
+        panel = self.scoreboard_panel.get(tuple(all_players[:SCOREBOARD_ROWS]))
+        self.screen.blit(panel, (SCREEN_WIDTH - 225, 55))
         
         # ═══════════════════════════════════════════════════
         # ÉCRAN DE MORT / RESPAWN
@@ -1589,19 +1810,16 @@ class SpaceBattleClient:
         
         if self.is_dead:
             # Assombrir l'écran
-            dark_overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-            dark_overlay.fill((0, 0, 0, 150))
-            self.screen.blit(dark_overlay, (0, 0))
+            self.screen.blit(overlay(SCREEN_WIDTH, SCREEN_HEIGHT, (0, 0, 0, 150)), (0, 0))
             
             # Message de mort
-            death_font = pygame.font.Font(None, 72)
-            death_text = death_font.render("💀 ÉLIMINÉ!", True, RED)
+            death_text = render_text("💀 ÉLIMINÉ!", 72, RED)
             death_rect = death_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 30))
             self.screen.blit(death_text, death_rect)
             
             # Compte à rebours
             respawn_seconds = max(0, self.respawn_timer // 60) + 1
-            respawn_text = self.font.render(f"Respawn dans {respawn_seconds}s...", True, WHITE)
+            respawn_text = render_text(f"Respawn dans {respawn_seconds}s...", FONT_SIZE, WHITE)
             respawn_rect = respawn_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 30))
             self.screen.blit(respawn_text, respawn_rect)
         
@@ -1611,13 +1829,10 @@ class SpaceBattleClient:
         
         if self.game_over:
             # Assombrir l'écran
-            dark_overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-            dark_overlay.fill((0, 0, 0, 200))
-            self.screen.blit(dark_overlay, (0, 0))
+            self.screen.blit(overlay(SCREEN_WIDTH, SCREEN_HEIGHT, (0, 0, 0, 200)), (0, 0))
             
             # Message de fin
-            end_font = pygame.font.Font(None, 72)
-            end_text = end_font.render("🏆 PARTIE TERMINÉE!", True, YELLOW)
+            end_text = render_text("🏆 PARTIE TERMINÉE!", 72, YELLOW)
             end_rect = end_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 50))
             self.screen.blit(end_text, end_rect)
             
@@ -1626,17 +1841,29 @@ class SpaceBattleClient:
             for i, (name, score, kills, is_local) in enumerate(all_players[:4]):
                 medal = ["🥇", "🥈", "🥉", ""][i] if i < 3 else ""
                 color = YELLOW if i == 0 else WHITE
-                final_text = self.font.render(f"{medal} {i+1}. {name}: {score} pts", True, color)
+                final_text = render_text(f"{medal} {i+1}. {name}: {score} pts", FONT_SIZE, color)
                 final_rect = final_text.get_rect(center=(SCREEN_WIDTH // 2, final_y))
                 self.screen.blit(final_text, final_rect)
                 final_y += 35
         
         # Coordonnées (coin inférieur gauche)
-        coords = self.small_font.render(
+        coords = render_text(
             f"X: {int(self.local_ship.x)} Y: {int(self.local_ship.y)}", 
-            True, GRAY
+            SMALL_FONT_SIZE, GRAY
         )
         self.screen.blit(coords, (10, SCREEN_HEIGHT - 25))
+        
+        # Infos de performance (F3)
+        if self.show_debug:
+            mode = "imposée" if self.quality.forced is not None else "auto"
+            lines = (
+                f"FPS: {self.clock.get_fps():.0f}",
+                f"Image p90: {self.quality.percentile():.1f} ms / {self.quality.budget_ms:.1f} ms",
+                f"Qualité: {self.quality.settings['name']} ({mode})",
+            )
+            self.screen.blit(overlay(260, 70, (0, 0, 0, 160)), (5, SCREEN_HEIGHT - 100))
+            for i, line in enumerate(lines):
+                self.screen.blit(render_text(line, SMALL_FONT_SIZE, NEON_GREEN), (10, SCREEN_HEIGHT - 95 + i * 22))
     
     def game_loop(self):
         """Boucle principale du jeu"""
@@ -1653,9 +1880,11 @@ class SpaceBattleClient:
         print("   E - Armer la Super Balle 💥")
         print("   SHIFT - Utiliser le boost ⚡")
         print("   V - Activer/Désactiver Micro 🎤")
+        print("   F3 - Infos de performance")
         print("   ÉCHAP - Quitter")
         print()
         
+        frame_time = self.clock.tick() / 1000
         while self.running:
             current_time = pygame.time.get_ticks()
             
@@ -1680,41 +1909,37 @@ class SpaceBattleClient:
                                 print("💥 Super balle désarmée")
                     elif event.key == pygame.K_v:
                         self.voice_chat.toggle_mic()
+                    elif event.key == pygame.K_F3:
+                        self.show_debug = not self.show_debug
                 elif event.type == pygame.MOUSEBUTTONDOWN:
                     if event.button == 1:  # Clic gauche
                         if not self.is_dead and current_time - last_shoot > shoot_cooldown:
                             self.shoot()
                             last_shoot = current_time
             
-            # Mise à jour
-            self.handle_input()
-            self.update_lasers()
-            
-            # Met à jour la protection au spawn
-            if self.spawn_protection:
-                self.spawn_protection_timer -= 1
-                self.spawn_protection_flash += 1
-                if self.spawn_protection_timer <= 0:
-                    self.spawn_protection = False
-                    print("⚔️  Protection terminée - Vous êtes vulnérable!")
-            
-            # Met à jour le timer de respawn
-            if self.is_dead and self.respawn_timer > 0:
-                self.respawn_timer -= 1
+            # Messages du serveur reçus pendant l'image précédente
+            self.process_inbox()
             
-            # Met à jour la caméra et l'arène
-            self.update_camera()
-            self.arena.update()
+            # Simulation: autant de pas fixes que le temps écoulé en contient
+            self.advance(frame_time)
             
             # Envoie position périodiquement
             if current_time - last_position_update > position_update_rate:
                 self.send_position()
                 last_position_update = current_time
             
-            # Dessin
+            # Tout ce que l'image a produit (tirs, position, acks, voix) part en une fois
+            self.flush_outbox()
+            
+            # Dessin (interpolé entre les deux derniers pas)
             self.draw()
             
-            self.clock.tick(FPS)
+            frame_time = self.clock.tick(self.max_fps) / 1000
+            
+            # Qualité: temps de calcul de l'image (sans l'attente de --fps)
+            if self.quality.record(self.clock.get_rawtime()):
+                self.apply_quality()
+                print(f"🎚️  Qualité: {self.quality.settings['name']}")
         
         self.stop()
     
@@ -1731,24 +1956,51 @@ class SpaceBattleClient:
                 self.socket.close()
             except:
                 pass
+        if self.udp_socket:
+            try:
+                self.udp_socket.close()
+            except:
+                pass
         pygame.quit()
         print("✅ Déconnecté")
 
 
 if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Usage: python client.py <server_ip>")
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    options = [arg for arg in sys.argv[1:] if arg.startswith("--")]
+    
+    if len(args) < 1:
+        print("Usage: python client.py <server_ip> [port] [--tcp] [--udp-port=N] [--lazy-sprites] [--fps=N] [--quality=N]")
         print("Exemple: python client.py 192.168.1.100")
         print()
         print("Pour jouer en local: python client.py 127.0.0.1")
+        print("   --tcp          tout passe par TCP (pas de canal UDP)")
+        print("   --udp-port=N   envoie l'UDP sur un autre port (ex: udp_proxy.py)")
+        print("   --lazy-sprites dessine chaque angle des vaisseaux/astéroïdes à sa première utilisation")
+        print("   --fps=N        limite l'affichage à N images/s (par défaut: aucune; le jeu avance toujours à 60 pas/s)")
+        print("   --quality=N    impose un palier de qualité (0 haute ... 3 minimale, ou son nom), sinon adaptatif")
         sys.exit(1)
     
-    server_ip = sys.argv[1]
+    server_ip = args[0]
     port = 3500
     
-    if len(sys.argv) > 2:
-        port = int(sys.argv[2])
+    if len(args) > 1:
+        port = int(args[1])
+    
+    use_udp = "--tcp" not in options
+    udp_port = None
+    max_fps = MAX_FPS
+    quality = None
+    for option in options:
+        if option.startswith("--udp-port="):
+            udp_port = int(option.split("=", 1)[1])
+        elif option.startswith("--fps="):
+            max_fps = int(option.split("=", 1)[1])
+        elif option.startswith("--quality="):
+            quality = find_tier(option.split("=", 1)[1])
     
-    client = SpaceBattleClient(server_ip, port)
+    rotation_cache.lazy = "--lazy-sprites" in options
+    
+    client = SpaceBattleClient(server_ip, port, use_udp=use_udp, udp_port=udp_port, max_fps=max_fps,
+                               quality=quality)
     client.start()
-
@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+🧩 SPACE BATTLE - SERVEUR MULTI-CŒURS
+Un routeur accepte les joueurs sur le port 3500 et passe chaque socket (fd)
+à un worker: un processus par cœur, chacun avec ses propres salles.
+Chaque worker a son port UDP (port + 1 + n° du worker), annoncé au welcome.
+
+Usage: python cluster.py [port] [workers]
+"""
+
+import json
+import multiprocessing
+import os
+import selectors
+import socket
+import sys
+import time
+
+from protocol import encode
+from server import SpaceBattleServer
+
+REPORT_INTERVAL = 1.0  # Secondes entre deux rapports de charge d'un worker
+WORKER_TIMEOUT = 3.0  # Sans rapport depuis ce délai: plus de nouveaux joueurs
+WORKER_KILL_TIMEOUT = 10.0  # Sans rapport depuis ce délai: worker relancé
+
+
+class ShardServer(SpaceBattleServer):
+    """Worker: reçoit les sockets des joueurs du routeur au lieu d'écouter lui-même"""
+    def __init__(self, control: socket.socket, index: int, port=3500, max_players=4, max_rooms=64):
+        super().__init__(port=port, max_players=max_players, max_rooms=max_rooms)
+        self.control = control  # Socket Unix (datagrammes) partagé avec le routeur
+        self.index = index
+        self.udp_port = port + 1 + index
+        self.last_report = 0
+    
+    def open_sockets(self):
+        self.control.setblocking(False)
+        # Le socket de contrôle remplace le socket d'écoute dans la boucle
+        self.selector.register(self.control, selectors.EVENT_READ, data=None)
+        
+        self.udp_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.udp_socket.bind(('0.0.0.0', self.udp_port))
+        self.udp_socket.setblocking(False)
+        self.selector.register(self.udp_socket, selectors.EVENT_READ, data=None)
+    
+    def print_banner(self):
+        print(f"⚙️  Worker {self.index} prêt (pid {os.getpid()}, UDP {self.udp_port})")
+    
+    def accept_connections(self):
+        """Récupère les sockets passés par le routeur"""
+        while True:
+            try:
+                message, fds, _, _ = socket.recv_fds(self.control, 1024, 1)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError:
+                self.running = False
+                return
+            
+            for fd in fds:
+                client_socket = socket.socket(fileno=fd)
+                try:
+                    address = tuple(json.loads(message)["address"])
+                except (ValueError, KeyError, TypeError):
+                    address = client_socket.getpeername()
+                self.admit_connection(client_socket, address)
+    
+    def update_game(self, current_time: float):
+        super().update_game(current_time)
+        
+        if current_time - self.last_report >= REPORT_INTERVAL:
+            self.last_report = current_time
+            self.report_load()
+    
+    def report_load(self):
+        """Envoie au routeur le nombre de salles, de joueurs et de places libres"""
+        players = 0
+        open_slots = 0
+        for room in self.rooms.values():
+            taken = len(room.players) + len(room.pending_connections)
+            players += taken
+            if room.accepts_players():
+                open_slots += room.max_players - taken
+        
+        # Plus grosse file d'envoi TCP (un client lent grossit la sienne avant d'être déconnecté)
+        queued = max((queued_bytes for _, queued_bytes in self.queue_stats().values()), default=0)
+        report = {"type": "load", "rooms": len(self.rooms), "players": players, "open_slots": open_slots,
+                  "send_queue_max": queued}
+        try:
+            self.control.send(json.dumps(report).encode())
+        except (BlockingIOError, InterruptedError):
+            pass
+        except OSError:
+            # Le routeur est parti: on s'arrête aussi
+            self.running = False
+    
+    def stop(self):
+        super().stop()
+        self.control.close()
+
+
+def run_worker(control, index, port, max_players, max_rooms):
+    """Point d'entrée d'un processus worker"""
+    ShardServer(control, index, port, max_players, max_rooms).start()
+
+
+class WorkerHandle:
+    """Vue du routeur sur un worker: processus, socket de contrôle, dernière charge connue"""
+    def __init__(self, index: int):
+        self.index = index
+        self.process = None
+        self.control = None
+        self.rooms = 0
+        self.players = 0
+        self.open_slots = 0
+        self.send_queue_max = 0  # Octets en attente chez son client le plus lent
+        self.last_report = 0
+    
+    def healthy(self, now: float):
+        return self.process.is_alive() and now - self.last_report < WORKER_TIMEOUT
+
+
+class ClusterRouter:
+    """Accepte les joueurs et les répartit entre les workers selon leur charge"""
+    def __init__(self, port=3500, workers=None, max_players=4, max_rooms=64):
+        self.port = port
+        self.num_workers = workers or os.cpu_count() or 1
+        self.max_players = max_players
+        self.max_rooms = max_rooms  # Par worker
+        self.workers = [WorkerHandle(i) for i in range(self.num_workers)]
+        self.selector = selectors.DefaultSelector()
+        self.server_socket = None
+        self.running = False
+    
+    def start(self):
+        """Lance les workers puis la boucle d'acceptation"""
+        try:
+            for worker in self.workers:
+                self.spawn_worker(worker)
+            
+            self.server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self.server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            self.server_socket.bind(('0.0.0.0', self.port))
+            self.server_socket.listen(128)
+            self.server_socket.setblocking(False)
+            self.selector.register(self.server_socket, selectors.EVENT_READ, data=None)
+            self.running = True
+            
+            print(f"🧩 Routeur Space Battle: port {self.port}, {self.num_workers} workers "
+                  f"(UDP {self.port + 1}-{self.port + self.num_workers})")
+            
+            self.run()
+        
+        except KeyboardInterrupt:
+            print("\n🛑 Arrêt du routeur...")
+        finally:
+            self.stop()
+    
+    def spawn_worker(self, worker: WorkerHandle):
+        """(Re)lance le processus d'un worker avec un nouveau socket de contrôle"""
+        if worker.control:
+            self.selector.unregister(worker.control)
+            worker.control.close()
+        
+        router_end, worker_end = socket.socketpair(socket.AF_UNIX, socket.SOCK_DGRAM)
+        router_end.setblocking(False)  # Un worker bloqué ne doit pas bloquer le routeur
+        worker.process = multiprocessing.Process(
+            target=run_worker,
+            args=(worker_end, worker.index, self.port, self.max_players, self.max_rooms),
+            daemon=True
+        )
+        worker.process.start()
+        worker_end.close()
+        
+        worker.control = router_end
+        worker.rooms = worker.players = worker.open_slots = 0
+        worker.last_report = time.time()  # Délai de grâce pour démarrer
+        self.selector.register(router_end, selectors.EVENT_READ, data=worker)
+    
+    def run(self):
+        next_check = time.time() + REPORT_INTERVAL
+        while self.running:
+            for key, _ in self.selector.select(REPORT_INTERVAL):
+                if key.data is None:
+                    self.accept_connections()
+                else:
+                    self.read_reports(key.data)
+            
+            now = time.time()
+            if now >= next_check:
+                next_check = now + REPORT_INTERVAL
+                self.check_workers(now)
+    
+    def read_reports(self, worker: WorkerHandle):
+        while True:
+            try:
+                data = worker.control.recv(4096)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError:
+                return
+            
+            try:
+                report = json.loads(data)
+            except ValueError:
+                continue
+            if report.get("type") == "load":
+                worker.rooms = report["rooms"]
+                worker.players = report["players"]
+                worker.open_slots = report["open_slots"]
+                worker.send_queue_max = report.get("send_queue_max", 0)
+                worker.last_report = time.time()
+    
+    def check_workers(self, now: float):
+        """Relance les workers morts ou muets depuis trop longtemps"""
+        for worker in self.workers:
+            if worker.process.is_alive() and now - worker.last_report < WORKER_KILL_TIMEOUT:
+                continue
+            print(f"⚠️  Worker {worker.index} ne répond plus, relance")
+            if worker.process.is_alive():
+                worker.process.terminate()
+            worker.process.join()
+            self.spawn_worker(worker)
+    
+    def pick_worker(self):
+        """Worker qui a une place dans une salle ouverte, sinon celui qui a le moins de salles"""
+        now = time.time()
+        healthy = [w for w in self.workers if w.healthy(now)]
+        
+        with_slots = [w for w in healthy if w.open_slots > 0]
+        if with_slots:
+            return min(with_slots, key=lambda w: w.open_slots)
+        
+        with_room_left = [w for w in healthy if w.rooms < self.max_rooms]
+        if with_room_left:
+            return min(with_room_left, key=lambda w: (w.rooms, w.players))
+        return None
+    
+    def accept_connections(self):
+        while True:
+            try:
+                client_socket, address = self.server_socket.accept()
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError as e:
+                if self.running:
+                    print(f"⚠️  Erreur connexion: {e}")
+                return
+            
+            worker = self.pick_worker()
+            if worker is None or not self.hand_off(worker, client_socket, address):
+                try:
+                    client_socket.send(encode({"error": "Serveur plein"}))
+                except OSError:
+                    pass
+            client_socket.close()
+    
+    def hand_off(self, worker: WorkerHandle, client_socket: socket.socket, address) -> bool:
+        """Passe le socket au worker; la charge estimée est corrigée au prochain rapport"""
+        message = json.dumps({"address": list(address)}).encode()
+        try:
+            socket.send_fds(worker.control, [message], [client_socket.fileno()])
+        except OSError as e:
+            print(f"⚠️  Worker {worker.index} injoignable: {e}")
+            return False
+        
+        worker.players += 1
+        if worker.open_slots > 0:
+            worker.open_slots -= 1
+        else:
+            worker.rooms += 1
+            worker.open_slots = self.max_players - 1
+        return True
+    
+    def stop(self):
+        self.running = False
+        for worker in self.workers:
+            if worker.process and worker.process.is_alive():
+                worker.process.terminate()
+                worker.process.join()
+            if worker.control:
+                worker.control.close()
+        if self.server_socket:
+            self.server_socket.close()
+        self.selector.close()
+        print("✅ Routeur arrêté")
+
+
+if __name__ == "__main__":
+    if not hasattr(socket, "send_fds"):
+        print("❌ Passage de sockets entre processus indisponible ici (Unix + Python 3.9 requis)")
+        print("   Utilisez: python server.py")
+        sys.exit(1)
+    
+    port = 3500
+    if len(sys.argv) > 1:
+        port = int(sys.argv[1])
+    
+    workers = None
+    if len(sys.argv) > 2:
+        workers = int(sys.argv[2])
+    
+    ClusterRouter(port=port, workers=workers).start()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+🖥️ SPACE BATTLE - PANNEAUX DU HUD
+Widgets dessinés dans leur propre surface et redessinés seulement quand leurs valeurs changent
+"""
+
+import pygame
+
+MINIMAP_REFRESH_MS = 100  # Minimap redessinée 10 fois par seconde
+
+
+class CachedPanel:
+    """Surface width x height; draw(surface, *state) n'est rappelé que si l'état change"""
+    def __init__(self, width: int, height: int, draw, alpha=True, refresh_ms=0):
+        self.width = width
+        self.height = height
+        self.draw = draw
+        self.alpha = alpha  # False: panneau opaque (fond plein), blit plus rapide
+        self.refresh_ms = refresh_ms  # > 0: au plus un rendu par intervalle, même si l'état change
+        self.drawn_at = 0
+        self.surface = None
+        self.state = None
+        self.redraws = 0
+        self.hits = 0
+    
+    def get(self, *state):
+        """Surface à jour pour cet état (nombres déjà arrondis: secondes entières, pixels...)"""
+        now = pygame.time.get_ticks()
+        if self.surface is not None and (state == self.state or now - self.drawn_at < self.refresh_ms):
+            self.hits += 1
+            return self.surface
+        
+        if self.surface is None:
+            self.surface = self._new_surface()
+        self.surface.fill((0, 0, 0, 0))
+        self.draw(self.surface, *state)
+        self.state = state
+        self.drawn_at = now
+        self.redraws += 1
+        return self.surface
+    
+    def invalidate(self):
+        """Force un nouveau rendu au prochain get()"""
+        self.state = None
+        self.drawn_at = -self.refresh_ms
+    
+    def _new_surface(self):
+        if self.alpha:
+            surface = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
+            return surface.convert_alpha() if pygame.display.get_surface() else surface
+        surface = pygame.Surface((self.width, self.height))
+        return surface.convert() if pygame.display.get_surface() else surface
+    
+    def stats(self):
+        return {"redraws": self.redraws, "hits": self.hits}
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+🗃️ SPACE BATTLE - CACHE LRU DE SURFACES
+Surfaces construites au premier usage et gardées dans un budget mémoire:
+les moins récemment utilisées partent en premier. Une instance par cache (textes, sprites,
+morceaux du fond, sprites pivotés), chacune avec son budget
+"""
+
+from collections import OrderedDict
+
+
+def surface_bytes(surface) -> int:
+    """Mémoire des pixels d'une surface"""
+    return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+
+class SurfaceLRU:
+    """Surfaces par clé, au plus max_bytes au total (la dernière ajoutée reste, même plus grosse)"""
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.surfaces = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def __contains__(self, key):
+        return key in self.surfaces
+    
+    def __len__(self):
+        return len(self.surfaces)
+    
+    def get(self, key, build):
+        """Surface de la clé; build() la construit si elle n'est pas (ou plus) en cache"""
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+        
+        self.misses += 1
+        surface = build()
+        self.surfaces[key] = surface
+        self.bytes += surface_bytes(surface)
+        while self.bytes > self.max_bytes and len(self.surfaces) > 1:
+            _, old = self.surfaces.popitem(last=False)
+            self.bytes -= surface_bytes(old)
+            self.evictions += 1
+        return surface
+    
+    def clear(self):
+        self.surfaces.clear()
+        self.bytes = 0
+    
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.surfaces),
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+✨ SPACE BATTLE - PARTICULES
+Réserve de particules de taille fixe en tableaux NumPy (aucune allocation par particule)
+"""
+
+import numpy as np
+
+
+class ParticlePool:
+    """Tampon circulaire: quand la réserve est pleine, les particules les plus anciennes sont remplacées"""
+    def __init__(self, capacity=256, drag=0.92, shrink=0.95):
+        self.capacity = capacity
+        self.drag = drag  # Ralentissement par image
+        self.shrink = shrink  # Réduction de taille par image
+        self.head = 0  # Prochain emplacement écrit
+        self.limit = capacity  # Emplacements utilisés (plafond réglable sans réallouer)
+        
+        self.x = np.zeros(capacity, np.float32)
+        self.y = np.zeros(capacity, np.float32)
+        self.vx = np.zeros(capacity, np.float32)
+        self.vy = np.zeros(capacity, np.float32)
+        self.size = np.zeros(capacity, np.float32)
+        self.life = np.zeros(capacity, np.float32)  # En images
+        self.max_life = np.ones(capacity, np.float32)
+        self.kind = np.zeros(capacity, np.uint8)  # Couleur/type, interprété par l'affichage
+        self.alive = np.zeros(capacity, np.bool_)
+    
+    def __len__(self):
+        return int(np.count_nonzero(self.alive))
+    
+    def clear(self):
+        self.alive[:] = False
+    
+    def set_limit(self, limit: int):
+        """Plafonne le nombre de particules vivantes (au plus capacity); les emplacements au-delà sont vidés"""
+        self.limit = max(1, min(limit, self.capacity))
+        self.alive[self.limit:] = False
+        self.head %= self.limit
+    
+    def emit(self, x, y, vx, vy, life, max_life, size, kind=0):
+        """Ajoute un lot de particules (x: tableau; les autres champs: tableaux de même longueur ou scalaires)"""
+        count = min(len(x), self.limit)
+        x, y, vx, vy, life, max_life, size, kind = (
+            np.broadcast_to(field, len(x))[-count:] for field in (x, y, vx, vy, life, max_life, size, kind)
+        )
+        
+        slots = (self.head + np.arange(count)) % self.limit
+        self.head = (self.head + count) % self.limit
+        
+        self.x[slots] = x
+        self.y[slots] = y
+        self.vx[slots] = vx
+        self.vy[slots] = vy
+        self.life[slots] = life
+        self.max_life[slots] = max_life
+        self.size[slots] = size
+        self.kind[slots] = kind
+        self.alive[slots] = True
+    
+    def update(self):
+        """Une image: mouvement, ralentissement, rétrécissement et expiration en une passe"""
+        # Les emplacements morts sont mis à jour aussi: moins cher qu'un masque
+        self.x += self.vx
+        self.y += self.vy
+        self.vx *= self.drag
+        self.vy *= self.drag
+        self.size *= self.shrink
+        self.life -= 1
+        self.alive &= (self.life > 0) & (self.size >= 1)
+    
+    def visible(self, left, top, width, height):
+        """Indices des particules vivantes dans le rectangle (coordonnées monde)"""
+        alive = np.flatnonzero(self.alive)
+        x = self.x[alive] - left
+        y = self.y[alive] - top
+        return alive[(x >= 0) & (x <= width) & (y >= 0) & (y <= height)]
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+🔫 SPACE BATTLE - PROJECTILES
+Lasers en tableaux NumPy (un tableau par champ): simulés par le serveur, qui décide
+des touches, et par le client pour l'affichage
+"""
+
+import numpy as np
+
+# Mêmes valeurs que le client (10 px par image à 60 FPS, 120 images de vie)
+LASER_SPEED = 600.0  # px/s
+SUPER_LASER_SPEED = 720.0
+LASER_LIFETIME = 2.0  # secondes
+SUPER_LASER_LIFETIME = 2.5
+LASER_RADIUS = 3.0
+SUPER_LASER_RADIUS = 8.0
+LASER_DAMAGE = 20
+SUPER_LASER_DAMAGE = 40
+SHIP_RADIUS = 20.0
+
+
+class ProjectileSystem:
+    """Projectiles d'une salle en struct-of-arrays: le projectile i est (x[i], y[i], ...) pour i < count"""
+    FIELDS = {
+        "x": np.float32,
+        "y": np.float32,
+        "vx": np.float32,
+        "vy": np.float32,
+        "lifetime": np.float32,
+        "skip": np.float32,  # Début du prochain pas écoulé avant le tir (tiré entre deux pas)
+        "radius": np.float32,
+        "owner": np.int32,
+        "shot_id": np.int64,  # Numéro choisi par le tireur (pour retrouver son laser)
+        "damage": np.int16,
+        "is_super": np.bool_,
+    }
+    
+    def __init__(self, capacity=256):
+        self.count = 0
+        self.capacity = capacity
+        for name, dtype in self.FIELDS.items():
+            setattr(self, name, np.zeros(capacity, dtype))
+    
+    def clear(self):
+        self.count = 0
+    
+    def _grow(self):
+        """Double la capacité (copie des projectiles vivants)"""
+        self.capacity *= 2
+        for name, dtype in self.FIELDS.items():
+            array = np.zeros(self.capacity, dtype)
+            array[:self.count] = getattr(self, name)[:self.count]
+            setattr(self, name, array)
+    
+    def spawn(self, owner: int, shot_id: int, x: float, y: float, angle: float, is_super=False, skip=0.0):
+        """Ajoute un laser tiré depuis (x, y) dans la direction angle, skip secondes après le dernier pas"""
+        if self.count == self.capacity:
+            self._grow()
+        
+        i = self.count
+        self.count += 1
+        speed = SUPER_LASER_SPEED if is_super else LASER_SPEED
+        self.x[i] = x
+        self.y[i] = y
+        self.vx[i] = np.cos(angle) * speed
+        self.vy[i] = np.sin(angle) * speed
+        self.lifetime[i] = SUPER_LASER_LIFETIME if is_super else LASER_LIFETIME
+        self.skip[i] = max(0.0, skip)
+        self.radius[i] = SUPER_LASER_RADIUS if is_super else LASER_RADIUS
+        self.owner[i] = owner
+        self.shot_id[i] = shot_id
+        self.damage[i] = SUPER_LASER_DAMAGE if is_super else LASER_DAMAGE
+        self.is_super[i] = is_super
+    
+    def step(self, dt: float, width: float, height: float, target_ids, target_x, target_y):
+        """Avance les projectiles de dt secondes; renvoie les touches [(tireur, shot_id, cible, dégâts, super)]"""
+        n = self.count
+        if n == 0:
+            return []
+        
+        # Un laser tiré pendant le pas n'avance que depuis son tir
+        dts = np.maximum(dt - self.skip[:n], 0.0)
+        self.skip[:n] = 0.0
+        x0 = self.x[:n].copy()
+        y0 = self.y[:n].copy()
+        dx = self.vx[:n] * dts
+        dy = self.vy[:n] * dts
+        self.x[:n] += dx
+        self.y[:n] += dy
+        self.lifetime[:n] -= dts
+        
+        x = self.x[:n]
+        y = self.y[:n]
+        alive = (self.lifetime[:n] > 0) & (x >= 0) & (x <= width) & (y >= 0) & (y <= height)
+        
+        hits = []
+        if len(target_ids):
+            target_ids = np.asarray(target_ids, np.int32)
+            # Test sur le segment parcouru pendant le tick (pas de traversée entre deux ticks):
+            # point du segment le plus proche de chaque vaisseau, matrices (projectiles, vaisseaux)
+            cx = np.asarray(target_x, np.float32)[None, :] - x0[:, None]
+            cy = np.asarray(target_y, np.float32)[None, :] - y0[:, None]
+            seg_len2 = np.maximum(dx * dx + dy * dy, 1e-6)[:, None]
+            t = np.clip((cx * dx[:, None] + cy * dy[:, None]) / seg_len2, 0.0, 1.0)
+            ex = cx - t * dx[:, None]
+            ey = cy - t * dy[:, None]
+            reach = (self.radius[:n] + SHIP_RADIUS)[:, None]
+            touching = (ex * ex + ey * ey <= reach * reach) & (self.owner[:n, None] != target_ids[None, :])
+            
+            rows = np.flatnonzero(touching.any(axis=1))
+            if rows.size:
+                # Premier vaisseau rencontré le long du segment
+                first = np.where(touching[rows], t[rows], np.inf).argmin(axis=1)
+                alive[rows] = False
+                hits = list(zip(self.owner[rows].tolist(), self.shot_id[rows].tolist(),
+                                target_ids[first].tolist(), self.damage[rows].tolist(),
+                                self.is_super[rows].tolist()))
+        
+        # Touchés, expirés ou sortis de la map
+        self._compact(alive)
+        return hits
+    
+    def remove(self, owner: int, shot_id: int):
+        """Retire le laser d'un tir donné (touche annoncée par le serveur)"""
+        n = self.count
+        self._compact((self.owner[:n] != owner) | (self.shot_id[:n] != shot_id))
+    
+    def _compact(self, keep_mask):
+        """Regroupe au début des tableaux les projectiles à garder"""
+        keep = np.flatnonzero(keep_mask)
+        if keep.size < self.count:
+            for name in self.FIELDS:
+                array = getattr(self, name)
+                array[:keep.size] = array[:self.count][keep]
+            self.count = keep.size
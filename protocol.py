@@ -0,0 +1,528 @@
+#!/usr/bin/env python3
+"""
+📦 SPACE BATTLE - PROTOCOLE RÉSEAU
+Messages JSON (une ligne par message) ou binaire compact (struct),
+le format binaire est négocié pendant le welcome (trames préfixées par leur taille,
+y compris les messages JSON sans format binaire).
+"""
+
+import json
+import struct
+
+PROTOCOL_JSON = "json"
+PROTOCOL_BINARY = "binary"
+SUPPORTED_PROTOCOLS = [PROTOCOL_BINARY, PROTOCOL_JSON]
+
+# Trame binaire: octet nul (une ligne JSON ne commence jamais par 0x00) + taille
+BINARY_MARKER = 0x00
+# Trame JSON: même en-tête, le contenu est un message JSON (sans \n)
+JSON_MARKER = 0x01
+FRAME_HEADER = struct.Struct('<BH')
+MAX_FRAME_PAYLOAD = 0xFFFF
+
+# Tampon de réception TCP
+RECV_BUFFER_SIZE = 64 * 1024  # Client (snapshots); le serveur part de 4 Ko, le tampon grandit si besoin
+MIN_RECV_SPACE = 4096  # Place libre minimale avant un recv_into (la moitié du tampon s'il est plus petit)
+MAX_PENDING = 1024 * 1024  # Message incomplet plus gros: flux invalide
+
+# Types de messages binaires
+MSG_MOVE = 1
+MSG_GAME_STATE = 2
+MSG_STATE_DELTA = 3
+MSG_ACK = 4
+
+# type, x, y, angle, vx, vy
+MOVE = struct.Struct('<B5f')
+# type, n° de snapshot, manche, total manches, temps restant, drapeaux, nb joueurs, nb pickups
+STATE_HEADER = struct.Struct('<BIBBfBHH')
+# type, n° de snapshot, snapshot de base, masque des champs de manche,
+# nb joueurs modifiés, nb joueurs partis, nb pickups apparus, nb pickups disparus
+DELTA_HEADER = struct.Struct('<BIIBHHHH')
+# id, masque des champs modifiés (+ valeurs dans l'ordre de PLAYER_FIELDS)
+PLAYER_DELTA = struct.Struct('<HH')
+# type, n° de snapshot acquitté
+ACK = struct.Struct('<BI')
+# id, x, y, angle, vx, vy, santé, couleur, drapeaux, score, kills, morts, taille du nom (+ nom UTF-8)
+PLAYER = struct.Struct('<HfffffhBBiHHB')
+# id, x, y
+PICKUP = struct.Struct('<Hff')
+
+# Datagramme UDP: marqueur, jeton du client, n° de séquence (+ trames comme sur TCP)
+DATAGRAM_MARKER = 0x55
+DATAGRAM_HEADER = struct.Struct('<BII')
+MAX_DATAGRAM = 8192  # Au-delà on passe par TCP (un paquet voix fait ~2,8 Ko)
+
+COLORS = ["blue", "red", "green", "yellow"]
+
+# Drapeaux de la manche
+ROUND_ACTIVE = 1
+GAME_OVER = 2
+SUPER_BULLET = 4
+
+# Drapeaux d'un joueur
+SPAWN_PROTECTED = 1
+IS_DEAD = 2
+
+# Champs d'un snapshot comparés pour les deltas (ordre = bits du masque)
+ROUND_FIELDS = ("round", "total_rounds", "time_remaining", "round_active", "game_over",
+                "super_bullet_available")
+PLAYER_FIELDS = (
+    ("x", "f"), ("y", "f"), ("angle", "f"), ("vx", "f"), ("vy", "f"), ("health", "h"),
+    ("color", "B"), ("spawn_protected", "?"), ("score", "i"), ("kills", "H"), ("deaths", "H"),
+    ("is_dead", "?"), ("name", "s")
+)
+
+
+def encode_json(message: dict) -> bytes:
+    """Encode un message en ligne JSON"""
+    return (json.dumps(message) + '\n').encode()
+
+
+def _frame(payload: bytes, marker: int = BINARY_MARKER) -> bytes:
+    return FRAME_HEADER.pack(marker, len(payload)) + payload
+
+
+def encode_json_frame(message: dict) -> bytes:
+    """Encode un message JSON en trame préfixée (ligne JSON si trop gros pour l'en-tête)"""
+    payload = json.dumps(message).encode()
+    if len(payload) > MAX_FRAME_PAYLOAD:
+        return payload + b'\n'
+    return _frame(payload, JSON_MARKER)
+
+
+def _encode_player(player: dict) -> bytes:
+    name = player["name"].encode()[:255]
+    flags = (SPAWN_PROTECTED if player["spawn_protected"] else 0) | (IS_DEAD if player["is_dead"] else 0)
+    color = COLORS.index(player["color"]) if player["color"] in COLORS else 0
+    return PLAYER.pack(
+        player["id"], player["x"], player["y"], player["angle"], player["vx"], player["vy"],
+        int(player["health"]), color, flags, player["score"], player["kills"], player["deaths"],
+        len(name)
+    ) + name
+
+
+def encode_binary(message: dict):
+    """Encode un message en trame binaire (None si ce type n'a pas de format binaire)"""
+    msg_type = message.get("type")
+
+    if msg_type == "move":
+        return _frame(MOVE.pack(
+            MSG_MOVE, message["x"], message["y"], message["angle"], message["vx"], message["vy"]
+        ))
+
+    if msg_type == "game_state":
+        flags = ((ROUND_ACTIVE if message["round_active"] else 0) |
+                 (GAME_OVER if message["game_over"] else 0) |
+                 (SUPER_BULLET if message["super_bullet_available"] else 0))
+        players = message["players"]
+        pickups = message["health_pickups"]
+        parts = [STATE_HEADER.pack(
+            MSG_GAME_STATE, message.get("seq", 0), message["round"], message["total_rounds"],
+            message["time_remaining"], flags, len(players), len(pickups)
+        )]
+        parts.extend(_encode_player(p) for p in players)
+        parts.extend(PICKUP.pack(p["id"], p["x"], p["y"]) for p in pickups)
+        return _frame(b"".join(parts))
+
+    if msg_type == "game_state_delta":
+        return _frame(_encode_delta(message))
+
+    if msg_type == "ack":
+        return _frame(ACK.pack(MSG_ACK, message["seq"]))
+
+    return None
+
+
+def _encode_delta(delta: dict) -> bytes:
+    fields = delta.get("fields", {})
+    mask = 0
+    values = []
+    if "round" in fields:
+        mask |= 1
+        values.append(struct.pack('<B', fields["round"]))
+    if "total_rounds" in fields:
+        mask |= 2
+        values.append(struct.pack('<B', fields["total_rounds"]))
+    if "time_remaining" in fields:
+        mask |= 4
+        values.append(struct.pack('<f', fields["time_remaining"]))
+    if any(key in fields for key in ("round_active", "game_over", "super_bullet_available")):
+        # Les trois booléens voyagent ensemble dans un octet de drapeaux
+        mask |= 8
+        values.append(struct.pack('<B', (ROUND_ACTIVE if fields["round_active"] else 0) |
+                                        (GAME_OVER if fields["game_over"] else 0) |
+                                        (SUPER_BULLET if fields["super_bullet_available"] else 0)))
+
+    players = delta.get("players", [])
+    removed_players = delta.get("removed_players", [])
+    pickups = delta.get("health_pickups", [])
+    removed_pickups = delta.get("removed_pickups", [])
+
+    parts = [DELTA_HEADER.pack(
+        MSG_STATE_DELTA, delta["seq"], delta["base"], mask,
+        len(players), len(removed_players), len(pickups), len(removed_pickups)
+    )]
+    parts.extend(values)
+
+    for player in players:
+        player_mask = 0
+        player_values = []
+        for bit, (key, fmt) in enumerate(PLAYER_FIELDS):
+            if key not in player:
+                continue
+            player_mask |= 1 << bit
+            value = player[key]
+            if key == "name":
+                name = value.encode()[:255]
+                player_values.append(struct.pack('<B', len(name)) + name)
+            else:
+                if key == "color":
+                    value = COLORS.index(value) if value in COLORS else 0
+                elif fmt in "hiH":
+                    value = int(value)
+                player_values.append(struct.pack('<' + fmt, value))
+        parts.append(PLAYER_DELTA.pack(player["id"], player_mask))
+        parts.extend(player_values)
+
+    parts.extend(struct.pack('<H', pid) for pid in removed_players)
+    parts.extend(PICKUP.pack(p["id"], p["x"], p["y"]) for p in pickups)
+    parts.extend(struct.pack('<H', pid) for pid in removed_pickups)
+    return b"".join(parts)
+
+
+def encode(message: dict, protocol: str = PROTOCOL_JSON) -> bytes:
+    """Encode un message selon le protocole négocié (trame JSON si pas de format binaire)"""
+    if protocol == PROTOCOL_BINARY:
+        data = encode_binary(message)
+        if data is not None:
+            return data
+        return encode_json_frame(message)
+    return encode_json(message)
+
+
+def decode_binary(payload) -> dict:
+    """Décode une trame binaire (bytes ou memoryview) en message (mêmes clés que la version JSON)"""
+    msg_type = payload[0]
+
+    if msg_type == MSG_MOVE:
+        _, x, y, angle, vx, vy = MOVE.unpack_from(payload)
+        return {"type": "move", "x": x, "y": y, "angle": angle, "vx": vx, "vy": vy}
+
+    if msg_type == MSG_GAME_STATE:
+        _, seq, rnd, total, remaining, flags, num_players, num_pickups = STATE_HEADER.unpack_from(payload)
+        offset = STATE_HEADER.size
+
+        players = []
+        for _ in range(num_players):
+            (pid, x, y, angle, vx, vy, health, color, pflags,
+             score, kills, deaths, name_len) = PLAYER.unpack_from(payload, offset)
+            offset += PLAYER.size
+            name = bytes(payload[offset:offset + name_len]).decode(errors='replace')
+            offset += name_len
+            players.append({
+                "id": pid, "name": name, "x": x, "y": y, "angle": angle, "vx": vx, "vy": vy,
+                "health": health, "color": COLORS[color % len(COLORS)],
+                "spawn_protected": bool(pflags & SPAWN_PROTECTED),
+                "score": score, "kills": kills, "deaths": deaths,
+                "is_dead": bool(pflags & IS_DEAD)
+            })
+
+        pickups = []
+        for _ in range(num_pickups):
+            pid, x, y = PICKUP.unpack_from(payload, offset)
+            offset += PICKUP.size
+            pickups.append({"id": pid, "x": x, "y": y, "type": "health", "active": True})
+
+        return {
+            "type": "game_state",
+            "seq": seq,
+            "players": players,
+            "round": rnd,
+            "total_rounds": total,
+            "time_remaining": remaining,
+            "round_active": bool(flags & ROUND_ACTIVE),
+            "game_over": bool(flags & GAME_OVER),
+            "super_bullet_available": bool(flags & SUPER_BULLET),
+            "health_pickups": pickups
+        }
+
+    if msg_type == MSG_STATE_DELTA:
+        return _decode_delta(payload)
+
+    if msg_type == MSG_ACK:
+        return {"type": "ack", "seq": ACK.unpack_from(payload)[1]}
+
+    raise ValueError(f"Type de message binaire inconnu: {msg_type}")
+
+
+def _decode_delta(payload) -> dict:
+    (_, seq, base, mask, num_players, num_removed,
+     num_pickups, num_removed_pickups) = DELTA_HEADER.unpack_from(payload)
+    offset = DELTA_HEADER.size
+
+    fields = {}
+    if mask & 1:
+        fields["round"] = payload[offset]
+        offset += 1
+    if mask & 2:
+        fields["total_rounds"] = payload[offset]
+        offset += 1
+    if mask & 4:
+        fields["time_remaining"] = struct.unpack_from('<f', payload, offset)[0]
+        offset += 4
+    if mask & 8:
+        flags = payload[offset]
+        offset += 1
+        fields["round_active"] = bool(flags & ROUND_ACTIVE)
+        fields["game_over"] = bool(flags & GAME_OVER)
+        fields["super_bullet_available"] = bool(flags & SUPER_BULLET)
+
+    players = []
+    for _ in range(num_players):
+        pid, player_mask = PLAYER_DELTA.unpack_from(payload, offset)
+        offset += PLAYER_DELTA.size
+        player = {"id": pid}
+        for bit, (key, fmt) in enumerate(PLAYER_FIELDS):
+            if not player_mask & (1 << bit):
+                continue
+            if key == "name":
+                length = payload[offset]
+                player["name"] = bytes(payload[offset + 1:offset + 1 + length]).decode(errors='replace')
+                offset += 1 + length
+                continue
+            value = struct.unpack_from('<' + fmt, payload, offset)[0]
+            offset += struct.calcsize('<' + fmt)
+            player[key] = COLORS[value % len(COLORS)] if key == "color" else value
+        players.append(player)
+
+    removed_players = list(struct.unpack_from(f'<{num_removed}H', payload, offset))
+    offset += 2 * num_removed
+
+    pickups = []
+    for _ in range(num_pickups):
+        pid, x, y = PICKUP.unpack_from(payload, offset)
+        offset += PICKUP.size
+        pickups.append({"id": pid, "x": x, "y": y, "type": "health", "active": True})
+
+    removed_pickups = list(struct.unpack_from(f'<{num_removed_pickups}H', payload, offset))
+
+    return {
+        "type": "game_state_delta", "seq": seq, "base": base, "fields": fields,
+        "players": players, "removed_players": removed_players,
+        "health_pickups": pickups, "removed_pickups": removed_pickups
+    }
+
+
+def diff_state(base: dict, state: dict):
+    """Delta entre deux game_state (None si rien d'utile n'a changé)"""
+    fields = {}
+    for key in ROUND_FIELDS:
+        old, new = base.get(key), state.get(key)
+        if key == "time_remaining":
+            # Le HUD n'affiche que des secondes entières
+            changed = int(old or 0) != int(new or 0)
+        else:
+            changed = old != new
+        if changed:
+            fields[key] = new
+    if any(key in fields for key in ("round_active", "game_over", "super_bullet_available")):
+        for key in ("round_active", "game_over", "super_bullet_available"):
+            fields[key] = state.get(key)
+
+    base_players = {p["id"]: p for p in base.get("players", [])}
+    players = []
+    for player in state.get("players", []):
+        old = base_players.pop(player["id"], None)
+        if old is player or old == player:
+            continue  # Rien n'a changé (souvent le même objet: état lointain non rafraîchi)
+        if old is None:
+            players.append(dict(player))
+            continue
+        changed = {key: player[key] for key, _ in PLAYER_FIELDS if player.get(key) != old.get(key)}
+        if changed:
+            changed["id"] = player["id"]
+            players.append(changed)
+
+    base_pickups = {p["id"] for p in base.get("health_pickups", [])}
+    state_pickups = {p["id"] for p in state.get("health_pickups", [])}
+    pickups = [p for p in state.get("health_pickups", []) if p["id"] not in base_pickups]
+    removed_pickups = sorted(base_pickups - state_pickups)
+
+    if not (fields or players or base_players or pickups or removed_pickups):
+        return None
+
+    delta = {"type": "game_state_delta", "seq": state["seq"], "base": base["seq"]}
+    if fields:
+        delta["fields"] = fields
+    if players:
+        delta["players"] = players
+    if base_players:
+        delta["removed_players"] = sorted(base_players)
+    if pickups:
+        delta["health_pickups"] = pickups
+    if removed_pickups:
+        delta["removed_pickups"] = removed_pickups
+    return delta
+
+
+def apply_delta(base: dict, delta: dict) -> dict:
+    """Reconstruit le game_state complet à partir du snapshot de base et d'un delta"""
+    state = dict(base)
+    state.update(delta.get("fields", {}))
+    state["seq"] = delta["seq"]
+
+    removed = set(delta.get("removed_players", []))
+    players = {p["id"]: p for p in base.get("players", []) if p["id"] not in removed}
+    for change in delta.get("players", []):
+        player = dict(players.get(change["id"], {}))
+        player.update(change)
+        players[change["id"]] = player
+    state["players"] = list(players.values())
+
+    removed_pickups = set(delta.get("removed_pickups", []))
+    state["health_pickups"] = [p for p in base.get("health_pickups", [])
+                               if p["id"] not in removed_pickups] + delta.get("health_pickups", [])
+    return state
+
+
+def encode_datagram(token: int, seq: int, payload: bytes = b"") -> bytes:
+    """Datagramme UDP: en-tête (jeton, séquence) suivi de trames encodées"""
+    return DATAGRAM_HEADER.pack(DATAGRAM_MARKER, token, seq) + payload
+
+
+def decode_datagram(data: bytes):
+    """(jeton, séquence, trames) ou None si ce n'est pas un datagramme du jeu"""
+    if len(data) < DATAGRAM_HEADER.size or data[0] != DATAGRAM_MARKER:
+        return None
+    _, token, seq = DATAGRAM_HEADER.unpack_from(data)
+    return token, seq, data[DATAGRAM_HEADER.size:]
+
+
+def _parse_frames(buffer, view, start: int, end: int, scanned: int = 0):
+    """Messages complets entre start et end; renvoie (messages, début du reste, taille du message incomplet)
+
+    Les trames sont lues dans view (memoryview) sans copie; seules les lignes JSON sont copiées
+    pour json.loads. scanned: la ligne commencée en start n'a pas de \n avant cette position.
+    Un JSON valide qui n'est pas un objet ([1, 2], "texte"...) est ignoré comme un JSON invalide.
+    """
+    messages = []
+
+    while start < end:
+        marker = buffer[start]
+        if marker == BINARY_MARKER or marker == JSON_MARKER:
+            if end - start < FRAME_HEADER.size:
+                return messages, start, FRAME_HEADER.size
+            _, length = FRAME_HEADER.unpack_from(buffer, start)
+            frame_end = start + FRAME_HEADER.size + length
+            if frame_end > end:
+                return messages, start, FRAME_HEADER.size + length
+            payload = view[start + FRAME_HEADER.size:frame_end]
+            try:
+                if marker == BINARY_MARKER:
+                    messages.append(decode_binary(payload))
+                else:
+                    message = json.loads(bytes(payload))
+                    if isinstance(message, dict):
+                        messages.append(message)
+            except (ValueError, struct.error, IndexError):
+                pass
+            start = frame_end
+        else:
+            line_end = buffer.find(b'\n', max(start, scanned), end)
+            if line_end < 0:
+                return messages, start, end - start + 1
+            line = buffer[start:line_end]
+            start = line_end + 1
+            if line.strip():
+                try:
+                    message = json.loads(line)
+                except ValueError:
+                    continue
+                if isinstance(message, dict):
+                    messages.append(message)
+
+    return messages, start, 0
+
+
+def decode_frames(buffer: bytearray) -> list:
+    """Extrait les messages complets du tampon (JSON ou binaire) et les retire du tampon"""
+    with memoryview(buffer) as view:
+        messages, start, _ = _parse_frames(buffer, view, 0, len(buffer))
+    del buffer[:start]
+    return messages
+
+
+class FrameReader:
+    """Tampon de réception préalloué: recv_into dans la place libre, trames découpées sur place
+
+    Les octets déjà traités ne sont pas retirés à chaque message: le message incomplet restant
+    n'est ramené au début du tampon que lorsque la place manque.
+    """
+    def __init__(self, size: int = RECV_BUFFER_SIZE, max_pending: int = MAX_PENDING):
+        self.buffer = bytearray(size)
+        self.view = memoryview(self.buffer)
+        self.start = 0  # Début du premier message pas encore traité
+        self.end = 0  # Fin des octets reçus
+        self.wanted = 0  # Taille du message incomplet (0: inconnue)
+        self.scanned = 0  # Fin de la ligne JSON incomplète déjà parcourue (pas de \n avant)
+        self.max_pending = max_pending
+        self.bytes_received = 0
+        self.compactions = 0
+        self.grows = 0
+
+    def recv_into(self, sock) -> int:
+        """Lit ce qui est disponible sur sock; renvoie le nombre d'octets (0: connexion fermée)"""
+        self._make_room()
+        count = sock.recv_into(self.view[self.end:])
+        self.end += count
+        self.bytes_received += count
+        return count
+
+    def feed(self, data: bytes):
+        """Ajoute des octets reçus autrement (datagramme, reste d'un autre tampon)"""
+        self._make_room(len(data))
+        self.buffer[self.end:self.end + len(data)] = data
+        self.end += len(data)
+        self.bytes_received += len(data)
+
+    def messages(self) -> list:
+        """Messages complets reçus depuis le dernier appel"""
+        messages, self.start, self.wanted = _parse_frames(self.buffer, self.view, self.start, self.end,
+                                                          self.scanned)
+        self.scanned = self.end
+        if self.start == self.end:
+            self.start = self.end = self.scanned = 0
+        if self.end - self.start > self.max_pending:
+            raise ValueError(f"message trop grand ({self.end - self.start} octets sans fin de trame)")
+        return messages
+
+    def pending(self) -> int:
+        """Octets reçus pas encore traités"""
+        return self.end - self.start
+
+    def _make_room(self, needed: int = 0):
+        needed = max(needed or min(MIN_RECV_SPACE, len(self.buffer) // 2), self.wanted - self.pending())
+        if len(self.buffer) - self.end >= needed:
+            return
+
+        # Ramène le message incomplet au début (il est petit: le reste a déjà été traité)
+        pending = self.pending()
+        if self.start:
+            self.buffer[:pending] = self.view[self.start:self.end].tobytes()
+            self.scanned -= self.start
+            self.start, self.end = 0, pending
+            self.compactions += 1
+
+        if len(self.buffer) - self.end < needed:
+            # Un message plus gros que le tampon: on l'agrandit (la vue doit être relâchée)
+            size = len(self.buffer)
+            while size - self.end < needed:
+                size *= 2
+            self.view.release()
+            self.buffer.extend(bytes(size - len(self.buffer)))
+            self.view = memoryview(self.buffer)
+            self.grows += 1
+
+    def stats(self):
+        return {"size": len(self.buffer), "bytes": self.bytes_received,
+                "compactions": self.compactions, "grows": self.grows}
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+🎚️ SPACE BATTLE - QUALITÉ ADAPTATIVE
+Baisse les effets quand les images dépassent le budget, les remet quand la marge revient
+"""
+
+from collections import deque
+
+# Paliers, du plus beau au plus léger
+QUALITY_TIERS = (
+    {"name": "haute", "stars": 1.0, "nebulas": True, "particles": 512, "shields": True, "minimap_ms": 100},
+    {"name": "moyenne", "stars": 0.5, "nebulas": True, "particles": 256, "shields": True, "minimap_ms": 200},
+    {"name": "basse", "stars": 0.25, "nebulas": False, "particles": 128, "shields": False, "minimap_ms": 500},
+    {"name": "minimale", "stars": 0.1, "nebulas": False, "particles": 32, "shields": False, "minimap_ms": 1000},
+)
+
+FRAME_BUDGET_MS = 1000 / 60
+QUALITY_WINDOW = 120  # Images mesurées (~2 s) avant de décider
+QUALITY_PERCENTILE = 0.9  # On regarde les images lentes, pas la moyenne
+DOWNGRADE_RATIO = 1.0  # Baisse si le 90e centile dépasse le budget
+UPGRADE_RATIO = 0.6  # Remonte seulement avec 40 % de marge (hystérésis: pas de va-et-vient)
+UPGRADE_WINDOWS = 3  # ... et après 3 fenêtres de suite avec cette marge
+
+
+def find_tier(value):
+    """Numéro de palier depuis un numéro ou un nom ('basse', '2'...)"""
+    if str(value).isdigit():
+        tier = int(value)
+        if tier < len(QUALITY_TIERS):
+            return tier
+    for tier, settings in enumerate(QUALITY_TIERS):
+        if settings["name"] == value:
+            return tier
+    raise ValueError(f"palier inconnu: {value} (0-{len(QUALITY_TIERS) - 1} ou "
+                     f"{', '.join(settings['name'] for settings in QUALITY_TIERS)})")
+
+
+class QualityGovernor:
+    """Choisit le palier selon le temps de calcul des dernières images (forced: palier imposé)"""
+    def __init__(self, budget_ms=FRAME_BUDGET_MS, window=QUALITY_WINDOW, forced=None):
+        self.budget_ms = budget_ms
+        self.frame_times = deque(maxlen=window)
+        self.forced = forced
+        self.tier = forced or 0
+        self.calm_windows = 0  # Fenêtres de suite avec assez de marge pour remonter
+        self.changes = 0
+    
+    @property
+    def settings(self):
+        return QUALITY_TIERS[self.tier]
+    
+    def percentile(self):
+        """Temps d'image (ms) du centile surveillé sur la fenêtre"""
+        if not self.frame_times:
+            return 0.0
+        ordered = sorted(self.frame_times)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * QUALITY_PERCENTILE))]
+    
+    def record(self, frame_ms: float):
+        """Ajoute le temps d'une image; renvoie True si le palier change"""
+        self.frame_times.append(frame_ms)
+        if self.forced is not None or len(self.frame_times) < self.frame_times.maxlen:
+            return False
+        
+        slow = self.percentile()
+        # Nouvelle fenêtre: chaque décision porte sur des images mesurées avec le palier en cours
+        self.frame_times.clear()
+        if slow > self.budget_ms * DOWNGRADE_RATIO and self.tier < len(QUALITY_TIERS) - 1:
+            self.tier += 1
+            self.calm_windows = 0
+        elif slow < self.budget_ms * UPGRADE_RATIO and self.tier > 0:
+            self.calm_windows += 1
+            if self.calm_windows < UPGRADE_WINDOWS:
+                return False
+            self.tier -= 1
+            self.calm_windows = 0
+        else:
+            self.calm_windows = 0
+            return False
+        
+        self.changes += 1
+        return True
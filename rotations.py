@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+🌀 SPACE BATTLE - SPRITES PIVOTÉS
+Vaisseaux et astéroïdes dessinés d'avance sous N angles: un seul blit par entité et par image
+"""
+
+import math
+import time
+
+import pygame
+
+from lru import SurfaceLRU
+
+ROTATION_STEPS = 128  # Angles par tour (~2.8° d'écart)
+ASTEROID_STEPS = 32  # Rotation lente (0.02 rad/image au plus): un angle tient ~10 images
+# Plafond des sprites pivotés: une arène entière tient sans éviction (coques: 5 couleurs x
+# 128 angles ~ 5 Mo; 12 astéroïdes x 32 angles: ~22 Mo en moyenne, 41 Mo s'ils sont tous au rayon max);
+# les formes d'une arène abandonnée sont évincées en premier
+ROTATION_CACHE_BYTES = 48 * 1024 * 1024
+COLORKEY = (255, 0, 255)  # Couleur transparente (jamais utilisée par les formes)
+
+
+class RotationCache:
+    """Images d'une forme par angle arrondi; draw(surface, cx, cy, angle) dessine la forme sur la surface"""
+    def __init__(self, steps=ROTATION_STEPS, lazy=False, max_bytes=ROTATION_CACHE_BYTES):
+        self.steps = steps
+        self.lazy = lazy  # True: chaque angle est dessiné à sa première utilisation
+        self.frames = SurfaceLRU(max_bytes)  # (clé, angle) -> Surface, les moins récentes évincées
+        self.shapes = {}  # clé -> (draw, taille, angles)
+        self.built = 0
+        self.build_time = 0.0
+    
+    def register(self, key, draw, size: int, steps=None):
+        """Déclare une forme (taille: côté du sprite; steps: angles par tour, sinon celui du cache)"""
+        if key in self.shapes:
+            return
+        steps = steps or self.steps
+        self.shapes[key] = (draw, size, steps)
+        if self.lazy:
+            return
+        # Pré-dessin de tous les angles (au besoin, les images les moins récemment vues font la place)
+        for step in range(steps):
+            self.frames.get((key, step), lambda: self._build(key, step))
+    
+    def get(self, key, angle: float):
+        """Sprite de la forme à l'angle le plus proche (la forme doit être déclarée)"""
+        steps = self.shapes[key][2]
+        step = round(angle / (2 * math.pi) * steps) % steps
+        return self.frames.get((key, step), lambda: self._build(key, step))
+    
+    def blit(self, screen, key, angle: float, x: float, y: float):
+        """Dessine la forme centrée en (x, y)"""
+        frame = self.get(key, angle)
+        half = frame.get_width() // 2
+        screen.blit(frame, (x - half, y - half))
+    
+    def _build(self, key, step: int):
+        start = time.perf_counter()
+        draw, size, steps = self.shapes[key]
+        frame = pygame.Surface((size, size))
+        if pygame.display.get_surface():
+            frame = frame.convert()  # Même format que l'écran
+        frame.fill(COLORKEY)
+        draw(frame, size // 2, size // 2, step / steps * 2 * math.pi)
+        # RLE: les pixels transparents sont sautés par plages au lieu d'être testés un par un
+        frame.set_colorkey(COLORKEY, pygame.RLEACCEL)
+        self.built += 1
+        self.build_time += time.perf_counter() - start
+        return frame
+    
+    def stats(self):
+        return {
+            "shapes": len(self.shapes),
+            "frames": len(self.frames),
+            "bytes": self.frames.bytes,
+            "built": self.built,
+            "evictions": self.frames.evictions,
+            "build_ms": self.build_time * 1000,
+        }
+
+
+rotation_cache = RotationCache()
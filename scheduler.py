@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+⏰ SPACE BATTLE - MINUTERIES
+Événements datés (respawn, fin de protection, manches, bonus) rangés dans un tas:
+un tick ne paie que pour ceux qui arrivent à échéance
+"""
+
+import heapq
+import itertools
+
+COMPACT_MIN = 64  # Minuteries annulées tolérées dans le tas avant de le reconstruire
+
+
+class Timer:
+    """Événement programmé (annulé via TimerHeap.cancel)"""
+    __slots__ = ("when", "callback", "args", "cancelled")
+    
+    def __init__(self, when: float, callback, args):
+        self.when = when
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+
+
+class TimerHeap:
+    """Minuteries triées par échéance; run_due(now) appelle celles qui sont échues, dans l'ordre"""
+    def __init__(self):
+        self.heap = []
+        self.order = itertools.count()  # Deux échéances égales: ordre de programmation
+        self.cancelled = 0  # Annulées encore dans le tas (retirées paresseusement)
+        self.fired = 0
+    
+    def __len__(self):
+        return len(self.heap) - self.cancelled
+    
+    def schedule(self, when: float, callback, *args) -> Timer:
+        """Appelle callback(*args) au premier run_due(now) avec now >= when"""
+        timer = Timer(when, callback, args)
+        heapq.heappush(self.heap, (when, next(self.order), timer))
+        return timer
+    
+    def cancel(self, timer):
+        """Annule une minuterie (None ou déjà déclenchée: sans effet)"""
+        if timer is None or timer.cancelled or timer.callback is None:
+            return
+        timer.cancelled = True
+        self.cancelled += 1
+        if self.cancelled > COMPACT_MIN and self.cancelled * 2 > len(self.heap):
+            self.heap = [entry for entry in self.heap if not entry[2].cancelled]
+            heapq.heapify(self.heap)
+            self.cancelled = 0
+    
+    def run_due(self, now: float) -> int:
+        """Déclenche les minuteries échues (une minuterie peut en programmer d'autres); renvoie leur nombre"""
+        fired = 0
+        while self.heap and self.heap[0][0] <= now:
+            _, _, timer = heapq.heappop(self.heap)
+            if timer.cancelled:
+                self.cancelled -= 1
+                continue
+            callback, args = timer.callback, timer.args
+            timer.callback = None  # Déclenchée: cancel() n'a plus d'effet
+            callback(*args)
+            fired += 1
+        self.fired += fired
+        return fired
+    
+    def next_deadline(self):
+        """Échéance la plus proche (None si rien n'est programmé)"""
+        while self.heap and self.heap[0][2].cancelled:
+            heapq.heappop(self.heap)
+            self.cancelled -= 1
+        return self.heap[0][0] if self.heap else None
+    
+    def clear(self):
+        self.heap.clear()
+        self.cancelled = 0
+    
+    def stats(self):
+        return {"pending": len(self), "fired": self.fired}
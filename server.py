@@ -1,24 +1,114 @@
 #!/usr/bin/env python3
 """
 🚀 SPACE BATTLE - SERVEUR
-Jeu de combat spatial multijoueur (jusqu'à 4 joueurs)
+Jeu de combat spatial multijoueur (jusqu'à 4 joueurs par salle, plusieurs salles)
 5 manches de 2 minutes chacune
 Port: 3500
 """
 
 import socket
-import threading
-import json
+import selectors
+import math
 import time
 import random
+from collections import Counter, deque
+from itertools import islice
 from typing import Dict, List
 
+from protocol import (PROTOCOL_JSON, SUPPORTED_PROTOCOLS, MAX_DATAGRAM, encode, decode_frames,
+                      FrameReader, diff_state, encode_datagram, decode_datagram)
+from spatial import SpatialGrid
+from projectiles import ProjectileSystem
+from scheduler import TimerHeap
+
 # Constantes de la map
 MAP_WIDTH = 2000
 MAP_HEIGHT = 1500
 
+# Zone visible par un client (écran 800x600 + marge pour le lissage de la caméra)
+VIEW_WIDTH = 800
+VIEW_HEIGHT = 600
+VIEW_MARGIN = 200
+
+# Tirs: délai minimal entre deux tirs (le client en impose 200 ms) et écart toléré
+# entre la position annoncée au tir et la dernière position connue du joueur
+SHOOT_COOLDOWN = 0.15
+MAX_SHOOT_OFFSET = 100
+
+# Vitesse annoncée par un client (px/image): 15 en boost, de la marge au-delà
+MAX_CLIENT_SPEED = 30
+
+# Lasers prévus par salle (4 joueurs à 5 tirs/s, 2 s de vie: ~40); les tableaux doublent si besoin
+ROOM_PROJECTILE_CAPACITY = 64
+
+# Secondes avant de réapparaître, puis d'invulnérabilité après chaque apparition
+RESPAWN_DELAY = 3.0
+SPAWN_PROTECTION = 3.0
+
+# Pickups: rayon de collecte (le même que le client) et marge pour le retard de la position connue
+PICKUP_RADIUS = 40
+PICKUP_TOLERANCE = 100
+
+# Files d'envoi TCP: au-delà, le client ne suit plus et est déconnecté
+# (un snapshot de 4 joueurs fait ~1 Ko: 256 Ko = plusieurs secondes de retard)
+MAX_SEND_QUEUE = 256 * 1024  # octets en attente
+MAX_SEND_LAG = 5.0  # secondes sans réussir à vider la file
+# Tampon d'envoi du noyau borné: le retard s'accumule dans notre file, où les snapshots
+# périmés sont jetés, au lieu de plusieurs Mo de snapshots déjà périmés côté noyau
+SOCKET_SEND_BUFFER = 32 * 1024
+MAX_SEND_FRAMES = 64  # Trames écrites au plus par appel sendmsg
+
+# Tampon de réception d'une connexion: les commandes d'un joueur sont petites, il grandit si besoin
+CLIENT_RECV_BUFFER = 4096
+HAS_SENDMSG = hasattr(socket.socket, "sendmsg")  # Absent sous Windows
+
+
+def client_number(value, low: float, high: float) -> float:
+    """Nombre fini venu d'un client, ramené dans [low, high] (ValueError si ce n'en est pas un)"""
+    if not isinstance(value, (int, float)) or not math.isfinite(value):
+        raise ValueError(f"nombre invalide: {value!r}")
+    return min(max(float(value), low), high)
+
+
+def client_angle(value) -> float:
+    """Angle fini venu d'un client, ramené dans [-pi, pi]"""
+    return math.remainder(client_number(value, -math.inf, math.inf), 2 * math.pi)
+
+
+class ClientConnection:
+    """Socket non bloquant d'un client avec ses tampons de lecture/écriture"""
+    def __init__(self, sock: socket.socket, address, player_id: int):
+        self.sock = sock
+        self.address = address
+        self.player_id = player_id
+        self.player = None  # Créé à la réception du nom (set_name)
+        self.room = None  # Salle choisie à l'acceptation
+        self.protocol = PROTOCOL_JSON  # Format négocié au set_name
+        self.delta = False  # Le client accepte les game_state_delta
+        self.acked_seq = None  # Dernier snapshot acquitté par le client
+        self.snapshot_history: Dict[int, dict] = {}  # Snapshots envoyés à ce client
+        
+        # Canal UDP (positions, snapshots, voix): adresse apprise au premier datagramme
+        self.udp_token = random.getrandbits(32)
+        self.udp_addr = None
+        self.udp_send_seq = 0
+        self.udp_recv_seq = 0
+        self.udp_stale = 0  # Datagrammes arrivés trop tard (ignorés)
+        self.reader = FrameReader(CLIENT_RECV_BUFFER)
+        # File d'envoi: (trame, remplaçable); un snapshot remplaçable en attente est jeté
+        # dès qu'un plus récent arrive (seule la première trame peut être à moitié écrite)
+        self.send_queue = deque()
+        self.send_offset = 0  # Octets déjà écrits de la première trame
+        self.queued_bytes = 0
+        self.backlog_since = None  # Depuis quand la file n'a pas été vidée
+        self.dropped_states = 0
+        self.events = selectors.EVENT_READ
+        self.handshake_deadline = time.time() + 10  # 10 secondes pour envoyer le nom
+        self.closed = False
+
+
 class Player:
-    def __init__(self, player_id: int, connection: socket.socket, address, name: str = None):
+    def __init__(self, player_id: int, connection: ClientConnection, address, name: str = None):
         self.id = player_id
         self.connection = connection
         self.address = address
@@ -42,6 +132,10 @@ class Player:
         # État du joueur
         self.is_dead = False
         self.respawn_time = 0
+        self.respawn_timer = None  # Minuteries de la salle en cours pour ce joueur
+        self.protection_timer = None
+        self.last_shot_time = 0
+        self.super_bullet_used = False  # Une super balle par manche
         
     def get_color(self, player_id):
         colors = ["blue", "red", "green", "yellow"]
@@ -65,11 +159,10 @@ class Player:
             "is_dead": self.is_dead
         }
     
-    def update_spawn_protection(self):
-        """Met à jour la protection au spawn (3 secondes)"""
-        if self.spawn_protected:
-            if time.time() - self.spawn_protection_time > 3.0:
-                self.spawn_protected = False
+    def end_spawn_protection(self):
+        """Fin de la protection au spawn (programmée par la salle)"""
+        self.protection_timer = None
+        self.spawn_protected = False
     
     def respawn(self):
         """Fait réapparaître le joueur"""
@@ -83,13 +176,14 @@ class Player:
         # Protection au respawn
         self.spawn_protected = True
         self.spawn_protection_time = time.time()
+        self.respawn_timer = None
         print(f"🔄 {self.name} a réapparu!")
     
     def die(self):
         """Le joueur meurt"""
         self.is_dead = True
         self.deaths += 1
-        self.respawn_time = time.time() + 3.0  # Respawn dans 3 secondes
+        self.respawn_time = time.time() + RESPAWN_DELAY
 
 
 class HealthPickup:
@@ -111,14 +205,34 @@ class HealthPickup:
         }
 
 
-class SpaceBattleServer:
-    def __init__(self, port=3500, max_players=4):
-        self.port = port
+class GameRoom:
+    """Une partie indépendante: ses joueurs, ses manches, ses pickups et sa super balle"""
+    def __init__(self, server, room_id: int, max_players=4):
+        self.server = server
+        self.id = room_id
         self.max_players = max_players
         self.players: Dict[int, Player] = {}
+        self.pending_connections: Dict[int, ClientConnection] = {}  # En attente du nom
         self.next_player_id = 1
-        self.running = False
-        self.server_socket = None
+        
+        # Snapshots numérotés pour les deltas (base = dernier snapshot acquitté)
+        self.snapshot_seq = 0
+        self.max_delta_lag = 20  # Au-delà (1 seconde de retard): snapshot complet
+        
+        # Zone d'intérêt: état complet près de la caméra, grossier au loin (minimap)
+        self.map_width = MAP_WIDTH
+        self.map_height = MAP_HEIGHT
+        self.interest_management = True
+        self.interest_grid = SpatialGrid(cell_size=400)
+        self.far_update_interval = 10  # Ticks entre deux mises à jour lointaines (2 Hz)
+        self.minimap_size = 150  # Positions lointaines arrondies à un pixel de minimap
+        self.far_players: Dict[int, dict] = {}  # État grossier partagé de chaque joueur
+        
+        # Événements datés (fin de manche, bonus, respawns...): le tick ne traite que ceux échus
+        self.timers = TimerHeap()
+        self.round_timer = None
+        self.super_bullet_timer = None
+        self.pickup_timer = None
         
         # Système de manches
         self.total_rounds = 5
@@ -128,6 +242,8 @@ class SpaceBattleServer:
         self.round_active = False
         self.game_started = False
         self.game_over = False
+        self.intermission_duration = 5  # Pause entre les manches (secondes)
+        self.next_round_time = 0  # 0 = pas de pause en cours
         
         # Super balle (toutes les 15 secondes)
         self.super_bullet_active = False
@@ -136,112 +252,82 @@ class SpaceBattleServer:
         
         # Pickups de santé
         self.health_pickups: Dict[int, HealthPickup] = {}
+        self.pickup_grid = SpatialGrid(cell_size=200)  # Pour valider les collectes
         self.next_pickup_id = 1
         self.last_pickup_spawn = 0
         self.pickup_spawn_interval = 30  # secondes
         
-    def start(self):
-        """Démarre le serveur"""
-        self.server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        self.server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        # Lasers simulés par le serveur (les touches sont décidées ici)
+        self.projectiles = ProjectileSystem(capacity=ROOM_PROJECTILE_CAPACITY)
+        self.last_projectile_update = 0
         
-        try:
-            self.server_socket.bind(('0.0.0.0', self.port))
-            self.server_socket.listen(self.max_players)
-            self.running = True
-            
-            print(f"╔══════════════════════════════════════════════════╗")
-            print(f"║  🚀 SERVEUR SPACE BATTLE - MODE COMPÉTITIF     ║")
-            print(f"╚══════════════════════════════════════════════════╝")
-            print(f"")
-            print(f"📡 Port: {self.port}")
-            print(f"👥 Joueurs max: {self.max_players}")
-            print(f"🏆 Manches: {self.total_rounds} (2 min chacune)")
-            print(f"💉 Pickup santé: +50 HP toutes les 30s")
-            print(f"💥 Super balle: toutes les 15s")
-            print(f"🌐 En attente de connexions...")
-            print(f"")
-            print(f"💡 Les joueurs doivent se connecter avec:")
-            print(f"   python client.py <votre_ip>")
-            print(f"")
-            
-            # Thread pour accepter les connexions
-            accept_thread = threading.Thread(target=self.accept_connections, daemon=True)
-            accept_thread.start()
-            
-            # Boucle principale du jeu
-            self.game_loop()
-            
-        except Exception as e:
-            print(f"❌ Erreur: {e}")
-            import traceback
-            traceback.print_exc()
-        finally:
-            self.stop()
+        # Moves reçus entre deux ticks: seul le dernier de chaque joueur est appliqué, par le tick
+        self.pending_moves: Dict[int, tuple] = {}  # id -> (joueur, message)
+        self.received_commands = Counter()  # Par type, depuis le tick précédent
+        self.command_counts = Counter()  # Par type, au dernier tick
+        self.coalesced_moves = 0  # Moves remplacés par un plus récent avant d'être appliqués
     
-    def accept_connections(self):
-        """Accepte les nouvelles connexions"""
-        while self.running:
-            try:
-                client_socket, address = self.server_socket.accept()
-                
-                if len(self.players) >= self.max_players:
-                    client_socket.send(json.dumps({"error": "Serveur plein"}).encode())
-                    client_socket.close()
-                    continue
-                
-                player_id = self.next_player_id
-                self.next_player_id += 1
-                
-                # Envoie l'ID au joueur d'abord
-                colors = ["blue", "red", "green", "yellow"]
-                color = colors[(player_id - 1) % 4]
-                welcome_msg = {
-                    "type": "welcome",
-                    "player_id": player_id,
-                    "color": color
-                }
-                client_socket.send((json.dumps(welcome_msg) + '\n').encode())
-                
-                # Attend le nom du joueur
-                player_name = f"Joueur{player_id}"
-                try:
-                    client_socket.settimeout(10)
-                    data = client_socket.recv(4096)
-                    client_socket.settimeout(None)
-                    
-                    if data:
-                        lines = data.decode().strip().split('\n')
-                        for line in lines:
-                            if line.strip():
-                                name_msg = json.loads(line)
-                                if name_msg.get("type") == "set_name":
-                                    player_name = name_msg.get("name", player_name)[:20]
-                                    break
-                except:
-                    pass
-                
-                # Crée le joueur avec le nom
-                player = Player(player_id, client_socket, address, player_name)
-                self.players[player_id] = player
-                
-                print(f"✅ Joueur {player_id} ({player_name}) connecté: {address}")
-                
-                # Démarre la partie si c'est le premier joueur
-                if not self.game_started and len(self.players) >= 1:
-                    self.start_game()
-                
-                # Thread pour gérer ce joueur
-                player_thread = threading.Thread(
-                    target=self.handle_player, 
-                    args=(player,), 
-                    daemon=True
-                )
-                player_thread.start()
-                
-            except Exception as e:
-                if self.running:
-                    print(f"⚠️  Erreur connexion: {e}")
+    def is_empty(self):
+        return not self.players and not self.pending_connections
+    
+    def accepts_players(self):
+        """Place libre dans une partie pas encore terminée"""
+        return not self.game_over and len(self.players) + len(self.pending_connections) < self.max_players
+    
+    def reserve_slot(self, sock: socket.socket, address) -> ClientConnection:
+        """Attribue un ID de joueur à une nouvelle connexion (le nom arrivera plus tard)"""
+        player_id = self.next_player_id
+        self.next_player_id += 1
+        
+        conn = ClientConnection(sock, address, player_id)
+        conn.room = self
+        self.pending_connections[player_id] = conn
+        self.timers.schedule(conn.handshake_deadline, self.handshake_expired, conn)
+        return conn
+    
+    def handshake_expired(self, conn: ClientConnection):
+        """Nom pas reçu à temps: le joueur entre avec un nom par défaut"""
+        if self.pending_connections.get(conn.player_id) is conn:
+            self.add_player(conn)
+    
+    def add_player(self, conn: ClientConnection, player_name: str = None):
+        """Crée le joueur une fois le nom reçu (ou le délai dépassé)"""
+        self.pending_connections.pop(conn.player_id, None)
+        player_name = player_name or f"Joueur{conn.player_id}"
+        
+        player = Player(conn.player_id, conn, conn.address, player_name)
+        conn.player = player
+        self.players[conn.player_id] = player
+        self.protect(player)
+        
+        print(f"✅ Joueur {conn.player_id} ({player_name}) connecté à la salle {self.id}: {conn.address}")
+        
+        # Démarre la partie si c'est le premier joueur
+        if not self.game_started and len(self.players) >= 1:
+            self.start_game()
+    
+    def remove_connection(self, conn: ClientConnection):
+        """Retire de la partie une connexion fermée (joueur ou en attente du nom)"""
+        self.pending_connections.pop(conn.player_id, None)
+        
+        player = self.players.pop(conn.player_id, None)
+        if player is None:
+            return
+        player.active = False
+        self.timers.cancel(player.respawn_timer)
+        self.timers.cancel(player.protection_timer)
+        print(f"❌ Joueur {conn.player_id} déconnecté de la salle {self.id}")
+        
+        if self.server.running:
+            self.broadcast({
+                "type": "player_left",
+                "player_id": conn.player_id
+            })
+    
+    def disconnect_player(self, player_id: int):
+        """Déconnecte un joueur"""
+        if player_id in self.players:
+            self.server.close_connection(self.players[player_id].connection)
     
     def start_game(self):
         """Démarre la partie"""
@@ -262,23 +348,34 @@ class SpaceBattleServer:
         self.current_round += 1
         self.round_start_time = time.time()
         self.round_active = True
-        self.last_super_bullet_time = time.time()
-        self.last_pickup_spawn = time.time()
+        self.last_super_bullet_time = self.round_start_time
+        self.last_pickup_spawn = self.round_start_time
         self.super_bullet_active = False
         
-        # Clear les pickups
+        self.cancel_round_timers()
+        self.round_timer = self.timers.schedule(self.round_start_time + self.round_duration, self.end_round)
+        self.super_bullet_timer = self.timers.schedule(
+            self.round_start_time + self.super_bullet_interval, self.super_bullet_ready)
+        self.pickup_timer = self.timers.schedule(
+            self.round_start_time + self.pickup_spawn_interval, self.pickup_due)
+        
+        # Clear les pickups et les lasers
         self.health_pickups.clear()
+        self.pickup_grid.clear()
+        self.projectiles.clear()
         
         # Reset tous les joueurs
         for player in self.players.values():
             player.health = 100
             player.is_dead = False
+            player.super_bullet_used = False
             player.x = random.randint(200, MAP_WIDTH - 200)
             player.y = random.randint(200, MAP_HEIGHT - 200)
-            player.spawn_protected = True
-            player.spawn_protection_time = time.time()
+            self.timers.cancel(player.respawn_timer)
+            player.respawn_timer = None
+            self.protect(player)
         
-        print(f"\n🏁 MANCHE {self.current_round}/{self.total_rounds} DÉMARRÉE!")
+        print(f"\n🏁 SALLE {self.id} - MANCHE {self.current_round}/{self.total_rounds} DÉMARRÉE!")
         print(f"   Durée: 2 minutes")
         
         # Annonce la nouvelle manche
@@ -291,9 +388,10 @@ class SpaceBattleServer:
     def end_round(self):
         """Termine la manche en cours"""
         self.round_active = False
+        self.cancel_round_timers()
         
         # Calcule les scores de la manche
-        print(f"\n🏁 MANCHE {self.current_round} TERMINÉE!")
+        print(f"\n🏁 SALLE {self.id} - MANCHE {self.current_round} TERMINÉE!")
         print("   Scores:")
         
         sorted_players = sorted(self.players.values(), key=lambda p: p.kills, reverse=True)
@@ -307,30 +405,36 @@ class SpaceBattleServer:
         self.broadcast({
             "type": "round_end",
             "round": self.current_round,
-            "scores": {p.id: {"score": p.score, "kills": p.kills, "deaths": p.deaths} 
+            "scores": {p.id: {"score": p.score, "kills": p.kills, "deaths": p.deaths}
                       for p in self.players.values()}
         })
         
         if self.current_round >= self.total_rounds:
             self.end_game()
         else:
-            # Pause de 5 secondes entre les manches
-            time.sleep(5)
-            # Reset kills/deaths pour la prochaine manche
-            for player in self.players.values():
-                player.kills = 0
-                player.deaths = 0
-            self.start_new_round()
+            # Pause de 5 secondes entre les manches (sans bloquer la boucle)
+            self.next_round_time = time.time() + self.intermission_duration
+            self.round_timer = self.timers.schedule(self.next_round_time, self.end_intermission)
+    
+    def end_intermission(self):
+        """Fin de la pause: lance la manche suivante"""
+        self.next_round_time = 0
+        # Reset kills/deaths pour la prochaine manche
+        for player in self.players.values():
+            player.kills = 0
+            player.deaths = 0
+        self.start_new_round()
     
     def end_game(self):
         """Termine la partie"""
         self.game_over = True
         self.round_active = False
+        self.cancel_round_timers()
         
         # Trouve le gagnant
         sorted_players = sorted(self.players.values(), key=lambda p: p.score, reverse=True)
         
-        print(f"\n🏆 PARTIE TERMINÉE!")
+        print(f"\n🏆 SALLE {self.id} - PARTIE TERMINÉE!")
         print("   Classement final:")
         for i, player in enumerate(sorted_players):
             medal = ["🥇", "🥈", "🥉", ""][i] if i < 4 else ""
@@ -340,10 +444,44 @@ class SpaceBattleServer:
         self.broadcast({
             "type": "game_over",
             "winner": sorted_players[0].name if sorted_players else "Personne",
-            "final_scores": {p.id: {"name": p.name, "score": p.score} 
+            "final_scores": {p.id: {"name": p.name, "score": p.score}
                            for p in self.players.values()}
         })
     
+    def cancel_round_timers(self):
+        """Annule la fin de manche (ou de pause) et les bonus programmés"""
+        for timer in (self.round_timer, self.super_bullet_timer, self.pickup_timer):
+            self.timers.cancel(timer)
+        self.round_timer = self.super_bullet_timer = self.pickup_timer = None
+    
+    def super_bullet_ready(self):
+        """Super balle disponible (toutes les 15 secondes pendant la manche)"""
+        self.super_bullet_active = True
+        self.last_super_bullet_time = time.time()
+        self.super_bullet_timer = self.timers.schedule(
+            self.last_super_bullet_time + self.super_bullet_interval, self.super_bullet_ready)
+        print(f"💥 SUPER BALLE DISPONIBLE! (salle {self.id})")
+        self.broadcast({"type": "super_bullet_available"})
+    
+    def pickup_due(self):
+        """Pickup de santé toutes les 30 secondes pendant la manche"""
+        self.last_pickup_spawn = time.time()
+        self.pickup_timer = self.timers.schedule(
+            self.last_pickup_spawn + self.pickup_spawn_interval, self.pickup_due)
+        self.spawn_health_pickup()
+    
+    def protect(self, player: Player):
+        """Protection au spawn pendant SPAWN_PROTECTION secondes"""
+        player.spawn_protected = True
+        player.spawn_protection_time = time.time()
+        self.timers.cancel(player.protection_timer)
+        player.protection_timer = self.timers.schedule(
+            player.spawn_protection_time + SPAWN_PROTECTION, player.end_spawn_protection)
+    
+    def respawn_player(self, player: Player):
+        player.respawn()
+        self.protect(player)
+    
     def spawn_health_pickup(self):
         """Fait apparaître un pickup de santé"""
         pickup_id = self.next_pickup_id
@@ -354,6 +492,7 @@ class SpaceBattleServer:
         
         pickup = HealthPickup(pickup_id, x, y)
         self.health_pickups[pickup_id] = pickup
+        self.pickup_grid.insert(pickup_id, x, y, PICKUP_RADIUS)
         
         print(f"💉 Pickup de santé apparu en ({x}, {y})")
         
@@ -363,29 +502,42 @@ class SpaceBattleServer:
             "pickup": pickup.to_dict()
         })
     
-    def handle_player(self, player: Player):
-        """Gère les messages d'un joueur"""
-        buffer = ""
+    def receive_command(self, player: Player, message: dict):
+        """Commande reçue d'un joueur: un move attend le tick (seul le dernier compte), le reste
+        (tirs, collectes, acks, voix) est traité tout de suite pour ne pas retarder les échos"""
+        msg_type = message.get("type")
+        self.received_commands[msg_type if isinstance(msg_type, str) else "?"] += 1
+        
+        if msg_type == "move":
+            if player.id in self.pending_moves:
+                self.coalesced_moves += 1
+            self.pending_moves[player.id] = (player, message)
+            return
+        
+        # Le move en attente de ce joueur passe d'abord: ses commandes restent dans l'ordre d'arrivée
+        pending = self.pending_moves.pop(player.id, None)
+        if pending is not None:
+            self.run_command(*pending)
+        if self.players.get(player.id) is player:
+            self.run_command(player, message)
+    
+    def apply_commands(self):
+        """Applique le dernier move de chaque joueur reçu depuis le tick précédent"""
+        pending_moves = self.pending_moves
+        self.pending_moves = {}
+        for player, message in pending_moves.values():
+            if self.players.get(player.id) is player:  # Sinon parti avant le tick
+                self.run_command(player, message)
+        
+        self.command_counts = self.received_commands
+        self.received_commands = Counter()
+    
+    def run_command(self, player: Player, message: dict):
+        """Traite une commande; un message qui fait échouer le traitement déconnecte seulement son auteur"""
         try:
-            while self.running and player.active:
-                data = player.connection.recv(4096)
-                if not data:
-                    break
-                
-                buffer += data.decode()
-                
-                while '\n' in buffer:
-                    line, buffer = buffer.split('\n', 1)
-                    if line.strip():
-                        try:
-                            message = json.loads(line)
-                            self.process_message(player, message)
-                        except json.JSONDecodeError as e:
-                            pass
-                    
+            self.process_message(player, message)
         except Exception as e:
-            print(f"⚠️  Erreur joueur {player.id}: {e}")
-        finally:
+            print(f"⚠️  Message invalide du joueur {player.id}: {e}")
             self.disconnect_player(player.id)
     
     def process_message(self, player: Player, message: dict):
@@ -397,58 +549,33 @@ class SpaceBattleServer:
             return
         
         if msg_type == "set_name":
-            player.name = message.get("name", player.name)[:20]
+            player.name = str(message.get("name") or player.name)[:20]
             print(f"📝 Joueur {player.id} renommé en: {player.name}")
-            
+        
         elif msg_type == "move":
-            player.x = message.get("x", player.x)
-            player.y = message.get("y", player.y)
-            player.angle = message.get("angle", player.angle)
-            player.vx = message.get("vx", player.vx)
-            player.vy = message.get("vy", player.vy)
-            
+            # Tout est vérifié avant d'être appliqué: une valeur invalide rejette la commande entière
+            x = client_number(message.get("x", player.x), 0, self.map_width)
+            y = client_number(message.get("y", player.y), 0, self.map_height)
+            angle = client_angle(message.get("angle", player.angle))
+            vx = client_number(message.get("vx", player.vx), -MAX_CLIENT_SPEED, MAX_CLIENT_SPEED)
+            vy = client_number(message.get("vy", player.vy), -MAX_CLIENT_SPEED, MAX_CLIENT_SPEED)
+            player.x, player.y, player.angle, player.vx, player.vy = x, y, angle, vx, vy
+        
         elif msg_type == "shoot":
-            is_super = message.get("is_super", False)
-            
-            shoot_msg = {
-                "type": "player_shoot",
-                "player_id": player.id,
-                "x": message.get("x"),
-                "y": message.get("y"),
-                "angle": message.get("angle"),
-                "is_super": is_super
-            }
-            self.broadcast(shoot_msg, exclude_player=player.id)
-            
-        elif msg_type == "hit":
-            target_id = message.get("target_id")
-            is_super = message.get("is_super", False)
-            damage = 40 if is_super else 20  # Super balle = 40 dégâts, normale = 20
-            
-            if target_id in self.players:
-                target = self.players[target_id]
-                
-                # Ignore si le joueur est protégé ou mort
-                if target.spawn_protected or target.is_dead:
-                    return
-                
-                target.health -= damage
-                
-                if target.health <= 0:
-                    target.health = 0
-                    target.die()
-                    player.kills += 1
-                    print(f"💀 {target.name} éliminé par {player.name}! {'(SUPER BALLE)' if is_super else ''}")
+            self.fire(player, message)
         
         elif msg_type == "pickup_collect":
             pickup_id = message.get("pickup_id")
-            if pickup_id in self.health_pickups:
+            # Le joueur doit être (à peu près) sur le pickup
+            nearby = self.pickup_grid.query_circle(player.x, player.y, PICKUP_TOLERANCE)
+            if pickup_id in self.health_pickups and pickup_id in nearby:
                 pickup = self.health_pickups[pickup_id]
                 if pickup.active:
                     pickup.active = False
                     player.health = min(100, player.health + pickup.heal_amount)
                     print(f"💉 {player.name} a ramassé un soin (+{pickup.heal_amount} HP)")
                     del self.health_pickups[pickup_id]
+                    self.pickup_grid.remove(pickup_id)
                     
                     # Annonce la collecte
                     self.broadcast({
@@ -457,74 +584,219 @@ class SpaceBattleServer:
                         "player_id": player.id
                     })
         
+        elif msg_type == "ack":
+            seq = message.get("seq")
+            conn = player.connection
+            if isinstance(seq, int) and (conn.acked_seq is None or seq > conn.acked_seq):
+                conn.acked_seq = seq
+        
         elif msg_type == "voice":
             voice_msg = {
                 "type": "voice",
                 "player_id": player.id,
                 "audio": message.get("audio")
             }
-            self.broadcast(voice_msg, exclude_player=player.id)
+            self.broadcast(voice_msg, exclude_player=player.id, unreliable=True)
     
-    def game_loop(self):
-        """Boucle principale du jeu"""
-        last_update = time.time()
-        update_rate = 1/20
+    def fire(self, player: Player, message: dict):
+        """Demande de tir: le serveur crée le laser et le simule (les touches viennent de lui)"""
+        current_time = time.time()
+        if current_time - player.last_shot_time < SHOOT_COOLDOWN:
+            return
+        player.last_shot_time = current_time
         
-        try:
-            while self.running:
-                current_time = time.time()
-                
-                # Met à jour tous les joueurs
-                for player in self.players.values():
-                    player.update_spawn_protection()
-                    
-                    # Gère le respawn
-                    if player.is_dead and current_time >= player.respawn_time:
-                        player.respawn()
-                
-                # Gestion de la manche
-                if self.round_active:
-                    elapsed = current_time - self.round_start_time
-                    
-                    # Vérifie si la manche est terminée
-                    if elapsed >= self.round_duration:
-                        self.end_round()
-                    else:
-                        # Super balle toutes les 15 secondes
-                        if current_time - self.last_super_bullet_time >= self.super_bullet_interval:
-                            self.super_bullet_active = True
-                            self.last_super_bullet_time = current_time
-                            print("💥 SUPER BALLE DISPONIBLE!")
-                            self.broadcast({"type": "super_bullet_available"})
-                        
-                        # Pickup de santé toutes les 30 secondes
-                        if current_time - self.last_pickup_spawn >= self.pickup_spawn_interval:
-                            self.spawn_health_pickup()
-                            self.last_pickup_spawn = current_time
-                
-                # Envoie l'état du jeu
-                if current_time - last_update >= update_rate:
-                    self.send_game_state()
-                    last_update = current_time
-                
-                time.sleep(0.01)
-                
-        except KeyboardInterrupt:
-            print("\n🛑 Arrêt du serveur...")
+        # Super balle seulement si elle est disponible et pas encore utilisée cette manche
+        is_super = bool(message.get("is_super")) and self.super_bullet_active and not player.super_bullet_used
+        if is_super:
+            player.super_bullet_used = True
+        
+        # Position du tir: celle du message si elle est plausible, sinon la dernière connue
+        x = client_number(message.get("x", player.x), 0, self.map_width)
+        y = client_number(message.get("y", player.y), 0, self.map_height)
+        if abs(x - player.x) > MAX_SHOOT_OFFSET or abs(y - player.y) > MAX_SHOOT_OFFSET:
+            x, y = player.x, player.y
+        angle = client_angle(message.get("angle", player.angle))
+        shot_id = message.get("shot_id")
+        if not isinstance(shot_id, int):
+            shot_id = 0
+        
+        # Tiré entre deux ticks: le prochain ne l'avance que depuis maintenant, comme le client
+        skip = current_time - self.last_projectile_update if self.last_projectile_update else 0.0
+        self.projectiles.spawn(player.id, shot_id, x, y, angle, is_super, skip)
+        
+        shoot_msg = {
+            "type": "player_shoot",
+            "player_id": player.id,
+            "shot_id": shot_id,
+            "x": x,
+            "y": y,
+            "angle": angle,
+            "is_super": is_super
+        }
+        self.broadcast(shoot_msg, exclude_player=player.id)
+    
+    def update_projectiles(self, current_time: float):
+        """Avance les lasers et applique les touches détectées pendant le tick"""
+        dt = current_time - self.last_projectile_update if self.last_projectile_update else 0.0
+        self.last_projectile_update = current_time
+        if not self.projectiles.count:
+            return
+        
+        targets = [p for p in self.players.values() if not p.is_dead]
+        hits = self.projectiles.step(
+            dt, self.map_width, self.map_height,
+            [p.id for p in targets], [p.x for p in targets], [p.y for p in targets]
+        )
+        
+        for shooter_id, shot_id, target_id, damage, is_super in hits:
+            # Les clients retirent le laser correspondant
+            self.broadcast({
+                "type": "laser_hit",
+                "player_id": shooter_id,
+                "shot_id": shot_id,
+                "target_id": target_id
+            })
+            
+            target = self.players.get(target_id)
+            # Ignore si le joueur est protégé ou mort (le laser est quand même arrêté)
+            if target is None or target.spawn_protected or target.is_dead:
+                continue
+            
+            target.health -= damage
+            
+            if target.health <= 0:
+                target.health = 0
+                target.die()
+                target.respawn_timer = self.timers.schedule(target.respawn_time, self.respawn_player, target)
+                shooter = self.players.get(shooter_id)
+                if shooter:
+                    shooter.kills += 1
+                    print(f"💀 {target.name} éliminé par {shooter.name}! {'(SUPER BALLE)' if is_super else ''}")
+    
+    def update(self, current_time: float):
+        """Un tick de jeu: joueurs, manche, bonus"""
+        # Salle vide: rien à simuler
+        if not self.players and not self.pending_connections:
+            self.pending_moves.clear()
+            return
+        
+        # Nettoie les joueurs dont le socket a échoué
+        for player in list(self.players.values()):
+            if not player.active:
+                self.disconnect_player(player.id)
+        
+        self.apply_commands()
+        
+        # Noms pas reçus à temps, fins de protection, respawns, manche et bonus échus
+        self.timers.run_due(current_time)
+        
+        self.update_projectiles(current_time)
     
     def send_game_state(self):
         """Envoie l'état du jeu à tous les joueurs"""
         if not self.players:
             return
         
+        game_state = self.build_game_state()
+        
+        if self.interest_management:
+            self.update_far_players(game_state)
+        
+        for player in list(self.players.values()):
+            try:
+                self.send_view(player, game_state)
+            except Exception as e:
+                print(f"⚠️  Snapshot impossible pour le joueur {player.id}: {e}")
+                self.disconnect_player(player.id)
+    
+    def send_view(self, player: Player, game_state: dict):
+        """Envoie à un joueur sa vue du snapshot (delta depuis sa base acquittée si possible)"""
+        conn = player.connection
+        view = self.client_view(player, game_state)
+        
+        base = None
+        if conn.delta:
+            # Historique des snapshots de ce client (bases possibles pour les deltas)
+            conn.snapshot_history[view["seq"]] = view
+            conn.snapshot_history.pop(view["seq"] - self.max_delta_lag - 1, None)
+            base = conn.snapshot_history.get(conn.acked_seq)
+        
+        # Snapshot remplaçable: si le client est en retard, seul le plus récent part
+        if base is None:
+            # Nouveau client ou trop en retard: snapshot complet
+            self.server.send_unreliable(conn, encode(view, conn.protocol), replaceable=True)
+        else:
+            delta = diff_state(base, view)
+            if delta is None and view["seq"] - conn.acked_seq >= self.max_delta_lag // 2:
+                # Rien n'a changé, mais la base acquittée approche de la sortie de l'historique:
+                # un delta vide la fait remplacer par un snapshot récent (sinon snapshot complet à 1 s)
+                delta = {"type": "game_state_delta", "seq": view["seq"], "base": base["seq"]}
+            # Rien n'a changé depuis la base acquittée: rien à envoyer
+            if delta:
+                self.server.send_unreliable(conn, encode(delta, conn.protocol), replaceable=True)
+    
+    def view_rect(self, player: Player):
+        """Rectangle de la map vu par le joueur (caméra bornée comme côté client)"""
+        cam_x = max(0, min(self.map_width - VIEW_WIDTH, player.x - VIEW_WIDTH // 2))
+        cam_y = max(0, min(self.map_height - VIEW_HEIGHT, player.y - VIEW_HEIGHT // 2))
+        return (cam_x - VIEW_MARGIN, cam_y - VIEW_MARGIN,
+                cam_x + VIEW_WIDTH + VIEW_MARGIN, cam_y + VIEW_HEIGHT + VIEW_MARGIN)
+    
+    def update_far_players(self, game_state: dict):
+        """Indexe les positions et rafraîchit l'état grossier (minimap) des joueurs"""
+        self.interest_grid.clear()
+        current_ids = set()
+        precision = max(1, max(self.map_width, self.map_height) // self.minimap_size)
+        
+        for player_data in game_state["players"]:
+            pid = player_data["id"]
+            current_ids.add(pid)
+            self.interest_grid.insert(pid, player_data["x"], player_data["y"])
+            
+            # Décalé par joueur pour étaler les mises à jour lointaines sur les ticks
+            if pid not in self.far_players or (self.snapshot_seq + pid) % self.far_update_interval == 0:
+                # Assez pour la minimap: position arrondie, pas de vitesse
+                self.far_players[pid] = dict(
+                    player_data,
+                    x=round(player_data["x"] / precision) * precision,
+                    y=round(player_data["y"] / precision) * precision,
+                    vx=0, vy=0
+                )
+        
+        # Oublie les joueurs partis
+        if len(self.far_players) > len(current_ids):
+            for pid in list(self.far_players):
+                if pid not in current_ids:
+                    del self.far_players[pid]
+    
+    def client_view(self, player: Player, game_state: dict) -> dict:
+        """Snapshot vu par un joueur: complet près de sa caméra, grossier et moins fréquent au loin"""
+        if not self.interest_management:
+            return game_state
+        
+        near = self.interest_grid.query_rect(*self.view_rect(player))
+        far_players = self.far_players
+        
+        view = dict(game_state)
+        view["players"] = [
+            player_data if player_data["id"] in near or player_data["id"] == player.id
+            else far_players[player_data["id"]]
+            for player_data in game_state["players"]
+        ]
+        return view
+    
+    def build_game_state(self) -> dict:
+        """Construit le snapshot numéroté du tick (commun à tous les joueurs)"""
         # Calcule le temps restant
         time_remaining = 0
         if self.round_active:
             elapsed = time.time() - self.round_start_time
             time_remaining = max(0, self.round_duration - elapsed)
         
+        self.snapshot_seq += 1
         game_state = {
             "type": "game_state",
+            "seq": self.snapshot_seq,
             "players": [p.to_dict() for p in self.players.values() if p.active],
             "round": self.current_round,
             "total_rounds": self.total_rounds,
@@ -534,54 +806,474 @@ class SpaceBattleServer:
             "super_bullet_available": self.super_bullet_active,
             "health_pickups": [p.to_dict() for p in self.health_pickups.values() if p.active]
         }
-        
-        self.broadcast(game_state)
+        return game_state
     
-    def broadcast(self, message: dict, exclude_player=None):
-        """Envoie un message à tous les joueurs"""
-        data = (json.dumps(message) + '\n').encode()
+    def broadcast(self, message: dict, exclude_player=None, unreliable=False):
+        """Envoie un message à tous les joueurs de la salle (encodé une fois par protocole)"""
+        encoded = {}
         
         for player_id, player in list(self.players.items()):
             if player_id == exclude_player:
                 continue
-                
-            try:
-                player.connection.send(data)
-            except:
-                player.active = False
+            
+            protocol = player.connection.protocol
+            if protocol not in encoded:
+                encoded[protocol] = encode(message, protocol)
+            if unreliable:
+                self.server.send_unreliable(player.connection, encoded[protocol])
+            else:
+                self.server.send_to(player.connection, encoded[protocol])
+
+
+class SpaceBattleServer:
+    """Couche réseau et tick communs à toutes les salles (une partie par salle)"""
+    def __init__(self, port=3500, max_players=4, max_rooms=64):
+        self.port = port
+        self.max_players = max_players  # Par salle
+        self.max_rooms = max_rooms
+        self.rooms: Dict[int, GameRoom] = {}
+        self.next_room_id = 1
+        self.running = False
+        self.server_socket = None
+        
+        # Boucle réseau (un seul thread possède tous les sockets)
+        self.selector = selectors.DefaultSelector()
+        
+        # Canal UDP non fiable, sur le même port par défaut (jeton du client -> connexion TCP)
+        self.udp_port = port
+        self.udp_socket = None
+        self.udp_clients: Dict[int, ClientConnection] = {}
+        self.tick_rate = 20  # Hz
+        
+        # Connexions avec des trames en file: écrites une fois par tour de boucle
+        self.pending_flush = set()
+        self.send_calls = 0  # Appels système d'envoi TCP
     
-    def disconnect_player(self, player_id: int):
-        """Déconnecte un joueur"""
-        if player_id in self.players:
-            player = self.players[player_id]
-            player.active = False
+    def start(self):
+        """Démarre le serveur"""
+        try:
+            self.open_sockets()
+            self.running = True
+            self.print_banner()
+            
+            # Boucle principale: réseau + jeu dans le même thread
+            self.game_loop()
             
+        except Exception as e:
+            print(f"❌ Erreur: {e}")
+            import traceback
+            traceback.print_exc()
+        finally:
+            self.stop()
+    
+    def open_sockets(self):
+        """Socket d'écoute TCP et socket UDP, tous deux surveillés par le selector"""
+        self.server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.server_socket.bind(('0.0.0.0', self.port))
+        self.server_socket.listen(128)
+        self.server_socket.setblocking(False)
+        self.selector.register(self.server_socket, selectors.EVENT_READ, data=None)
+        
+        self.udp_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.udp_socket.bind(('0.0.0.0', self.udp_port))
+        self.udp_socket.setblocking(False)
+        self.selector.register(self.udp_socket, selectors.EVENT_READ, data=None)
+    
+    def print_banner(self):
+        print(f"╔══════════════════════════════════════════════════╗")
+        print(f"║  🚀 SERVEUR SPACE BATTLE - MODE COMPÉTITIF     ║")
+        print(f"╚══════════════════════════════════════════════════╝")
+        print(f"")
+        print(f"📡 Port: {self.port} (TCP + UDP)")
+        print(f"👥 Joueurs max: {self.max_players} par salle, {self.max_rooms} salles")
+        print(f"🏆 Manches: 5 (2 min chacune)")
+        print(f"💉 Pickup santé: +50 HP toutes les 30s")
+        print(f"💥 Super balle: toutes les 15s")
+        print(f"🌐 En attente de connexions...")
+        print(f"")
+        print(f"💡 Les joueurs doivent se connecter avec:")
+        print(f"   python client.py <votre_ip>")
+        print(f"")
+    
+    def create_room(self) -> GameRoom:
+        """Ouvre une nouvelle salle (partie indépendante)"""
+        room = GameRoom(self, self.next_room_id, self.max_players)
+        self.next_room_id += 1
+        self.rooms[room.id] = room
+        return room
+    
+    def find_room(self):
+        """Salle pour un nouveau joueur: la première avec de la place, sinon une nouvelle"""
+        for room in self.rooms.values():
+            if room.accepts_players():
+                return room
+        if len(self.rooms) < self.max_rooms:
+            return self.create_room()
+        return None
+    
+    def accept_connections(self):
+        """Accepte toutes les connexions en attente (socket d'écoute lisible)"""
+        while True:
             try:
-                player.connection.close()
-            except:
+                client_socket, address = self.server_socket.accept()
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError as e:
+                if self.running:
+                    print(f"⚠️  Erreur connexion: {e}")
+                return
+            
+            self.admit_connection(client_socket, address)
+    
+    def admit_connection(self, client_socket: socket.socket, address):
+        """Place un nouveau client dans une salle et lui envoie son ID"""
+        room = self.find_room()
+        if room is None:
+            try:
+                client_socket.send(encode({"error": "Serveur plein"}))
+            except OSError:
                 pass
+            client_socket.close()
+            return
+        
+        client_socket.setblocking(False)
+        client_socket.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SOCKET_SEND_BUFFER)
+        # Les messages sont déjà regroupés par tour de boucle: pas d'attente de Nagle en plus
+        client_socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        conn = room.reserve_slot(client_socket, address)
+        self.udp_clients[conn.udp_token] = conn
+        self.selector.register(client_socket, selectors.EVENT_READ, data=conn)
+        
+        # Envoie l'ID au joueur d'abord (le nom arrivera plus tard)
+        colors = ["blue", "red", "green", "yellow"]
+        color = colors[(conn.player_id - 1) % 4]
+        welcome_msg = {
+            "type": "welcome",
+            "player_id": conn.player_id,
+            "color": color,
+            "room": room.id,
+            "map_width": room.map_width,
+            "map_height": room.map_height,
+            "protocols": SUPPORTED_PROTOCOLS,
+            "udp_port": self.udp_port,
+            "udp_token": conn.udp_token
+        }
+        self.send_to(conn, encode(welcome_msg))
+    
+    def handle_player(self, conn: ClientConnection):
+        """Lit les messages disponibles d'un joueur (socket lisible)"""
+        try:
+            received = conn.reader.recv_into(conn.sock)
+            messages = conn.reader.messages() if received else None
+        except (BlockingIOError, InterruptedError):
+            return
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Erreur joueur {conn.player_id}: {e}")
+            messages = None
+        
+        if messages is None:
+            self.close_connection(conn)
+            return
+        
+        for message in messages:
+            if conn.closed:
+                break
+            
+            if conn.player is None:
+                # Premier message attendu: le nom du joueur (+ protocole choisi)
+                player_name = None
+                if message.get("type") == "set_name":
+                    player_name = str(message.get("name") or "")[:20] or None
+                    if message.get("protocol") in SUPPORTED_PROTOCOLS:
+                        conn.protocol = message["protocol"]
+                    conn.delta = bool(message.get("delta", False))
+                conn.room.add_player(conn, player_name)
+                if message.get("type") == "set_name":
+                    continue
+            
+            conn.room.receive_command(conn.player, message)
+    
+    def handle_datagrams(self):
+        """Lit les datagrammes UDP (positions, acks, voix); ceux arrivés en retard sont ignorés"""
+        while True:
+            try:
+                data, address = self.udp_socket.recvfrom(65536)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError:
+                continue  # ICMP "port injoignable" d'un ancien client
             
-            del self.players[player_id]
-            print(f"❌ Joueur {player_id} déconnecté")
+            datagram = decode_datagram(data)
+            if datagram is None:
+                continue
+            token, seq, payload = datagram
+            conn = self.udp_clients.get(token)
+            if conn is None or conn.closed:
+                continue
             
-            if self.running:
-                self.broadcast({
-                    "type": "player_left",
-                    "player_id": player_id
-                })
+            if conn.udp_addr != address:
+                # Premier datagramme (ou changement de NAT): le client peut passer en UDP
+                first = conn.udp_addr is None
+                conn.udp_addr = address
+                if first:
+                    self.send_to(conn, encode({"type": "udp_ready"}))
+            
+            # Plus ancien que le dernier reçu: dépassé, on le jette
+            if seq <= conn.udp_recv_seq:
+                conn.udp_stale += 1
+                continue
+            conn.udp_recv_seq = seq
+            
+            if conn.player is None:
+                continue
+            for message in decode_frames(bytearray(payload)):
+                conn.room.receive_command(conn.player, message)
+    
+    def game_loop(self):
+        """Boucle principale: sockets (selectors) et tick de toutes les salles dans un seul thread"""
+        update_rate = 1 / self.tick_rate
+        next_tick = time.time()
+        
+        try:
+            while self.running:
+                # Attend des événements réseau jusqu'au prochain tick
+                timeout = max(0.0, next_tick - time.time())
+                for key, mask in self.selector.select(timeout):
+                    if key.fileobj is self.udp_socket:
+                        self.handle_datagrams()
+                        continue
+                    if key.data is None:
+                        self.accept_connections()
+                        continue
+                    
+                    conn = key.data
+                    if mask & selectors.EVENT_READ and not conn.closed:
+                        self.handle_player(conn)
+                    if mask & selectors.EVENT_WRITE and not conn.closed:
+                        self.flush_connection(conn)
+                
+                current_time = time.time()
+                if current_time >= next_tick:
+                    self.update_game(current_time)
+                    self.send_game_state()
+                    self.check_send_queues(current_time)
+                    
+                    next_tick += update_rate
+                    if next_tick < current_time:
+                        # Trop de retard: on se recale au lieu de rattraper
+                        next_tick = current_time + update_rate
+                
+                # Tout ce que ce tour a produit (échos de tirs, snapshot, voix...) part en une écriture par client
+                self.flush_pending()
+        
+        except KeyboardInterrupt:
+            print("\n🛑 Arrêt du serveur...")
+    
+    def update_game(self, current_time: float):
+        """Un tick de jeu pour chaque salle; les salles vidées sont fermées"""
+        for room in list(self.rooms.values()):
+            try:
+                room.update(current_time)
+            except Exception as e:
+                self.close_room(room, e)
+                continue
+            if room.is_empty() and room.game_started:
+                del self.rooms[room.id]
+                print(f"🚪 Salle {room.id} fermée (vide)")
+    
+    def send_game_state(self):
+        """Envoie l'état du jeu de chaque salle à ses joueurs"""
+        for room in list(self.rooms.values()):
+            try:
+                room.send_game_state()
+            except Exception as e:
+                self.close_room(room, e)
+    
+    def close_room(self, room: GameRoom, error: Exception):
+        """Ferme une salle dont le tick a échoué: ses joueurs sont déconnectés, les autres salles continuent"""
+        print(f"💥 Salle {room.id} fermée après une erreur: {error!r}")
+        self.rooms.pop(room.id, None)
+        connections = [player.connection for player in room.players.values()]
+        connections.extend(room.pending_connections.values())
+        for conn in connections:
+            conn.room = None  # Salle abandonnée: pas d'annonce de départ dans un état peut-être incohérent
+            self.close_connection(conn)
+    
+    def send_unreliable(self, conn: ClientConnection, data: bytes, replaceable=False):
+        """Envoie par UDP si le client a ouvert le canal (sinon, ou si trop gros, par TCP)"""
+        if conn.udp_addr is None or len(data) > MAX_DATAGRAM or conn.closed:
+            self.send_to(conn, data, replaceable)
+            return
+        
+        conn.udp_send_seq += 1
+        try:
+            self.udp_socket.sendto(encode_datagram(conn.udp_token, conn.udp_send_seq, data), conn.udp_addr)
+        except OSError:
+            pass  # Canal non fiable: un datagramme perdu est remplacé au tick suivant
+    
+    def send_to(self, conn: ClientConnection, data: bytes, replaceable=False):
+        """Met une trame en file pour un client, écrite à la fin du tour de boucle (replaceable:
+        snapshot périmé dès que le suivant est prêt)"""
+        if conn.closed:
+            return
+        
+        if replaceable:
+            self.drop_superseded(conn)
+        conn.send_queue.append((data, replaceable))
+        conn.queued_bytes += len(data)
+        
+        if conn.queued_bytes > MAX_SEND_QUEUE:
+            print(f"🐢 Joueur {conn.player_id} déconnecté: {conn.queued_bytes // 1024} Ko en attente d'envoi")
+            self.fail_connection(conn)
+            return
+        if len(conn.send_queue) == 1:
+            self.pending_flush.add(conn)
+    
+    def flush_pending(self):
+        """Écrit les files remplies depuis le dernier tour de boucle (un appel système par client)"""
+        pending = self.pending_flush
+        self.pending_flush = set()
+        for conn in pending:
+            if not conn.closed:
+                self.flush_connection(conn)
+    
+    def drop_superseded(self, conn: ClientConnection):
+        """Retire de la file les snapshots pas encore commencés (un plus récent les remplace)"""
+        frames = list(conn.send_queue)
+        first = 1 if conn.send_offset else 0  # Trame en cours d'écriture: on la termine
+        if not any(replaceable for _, replaceable in frames[first:]):
+            return
+        
+        kept = deque(frames[:first])
+        for data, replaceable in frames[first:]:
+            if replaceable:
+                conn.queued_bytes -= len(data)
+                conn.dropped_states += 1
+            else:
+                kept.append((data, replaceable))
+        conn.send_queue = kept
+    
+    def flush_connection(self, conn: ClientConnection):
+        """Écrit ce que le socket accepte sans bloquer, plusieurs trames par appel (gère les envois partiels)"""
+        queue = conn.send_queue
+        while queue:
+            frames = [memoryview(data) for data, _ in islice(queue, MAX_SEND_FRAMES)]
+            frames[0] = frames[0][conn.send_offset:]
+            try:
+                if HAS_SENDMSG:
+                    sent = conn.sock.sendmsg(frames)  # Scatter-gather: pas de copie pour concaténer
+                else:
+                    sent = conn.sock.send(b"".join(frames))
+            except (BlockingIOError, InterruptedError):
+                break
+            except OSError:
+                self.fail_connection(conn)
+                return
+            self.send_calls += 1
+            conn.queued_bytes -= sent
+            
+            # Retire les trames entièrement écrites
+            for frame in frames:
+                if sent < len(frame):
+                    conn.send_offset += sent
+                    break
+                sent -= len(frame)
+                queue.popleft()
+                conn.send_offset = 0
+            else:
+                continue
+            break  # Tampon du socket plein
+        
+        if not queue:
+            conn.backlog_since = None
+        elif conn.backlog_since is None:
+            conn.backlog_since = time.time()
+        
+        # Surveille l'écriture seulement s'il reste des données
+        events = selectors.EVENT_READ
+        if queue:
+            events |= selectors.EVENT_WRITE
+        if events != conn.events and not conn.closed:
+            conn.events = events
+            self.selector.modify(conn.sock, events, conn)
+    
+    def fail_connection(self, conn: ClientConnection):
+        """Abandonne les envois d'un client en erreur ou trop lent"""
+        conn.send_queue.clear()
+        conn.send_offset = 0
+        conn.queued_bytes = 0
+        conn.backlog_since = None
+        if conn.player:
+            # Le joueur sera retiré au prochain tick
+            conn.player.active = False
+        else:
+            self.close_connection(conn)
+    
+    def connections(self):
+        """Toutes les connexions ouvertes (joueurs et en attente du nom)"""
+        for room in self.rooms.values():
+            for player in room.players.values():
+                yield player.connection
+            yield from room.pending_connections.values()
+    
+    def check_send_queues(self, current_time: float):
+        """Déconnecte les clients qui n'arrivent plus à vider leur file depuis MAX_SEND_LAG"""
+        for conn in list(self.connections()):
+            if conn.backlog_since is not None and current_time - conn.backlog_since > MAX_SEND_LAG:
+                print(f"🐢 Joueur {conn.player_id} déconnecté: file d'envoi bloquée depuis "
+                      f"{current_time - conn.backlog_since:.1f}s")
+                self.fail_connection(conn)
+    
+    def queue_stats(self):
+        """Files d'envoi TCP par joueur: {id: (trames, octets)}"""
+        return {conn.player_id: (len(conn.send_queue), conn.queued_bytes) for conn in self.connections()}
+    
+    def command_stats(self):
+        """Commandes reçues au dernier tick par type (toutes salles) et moves fusionnés depuis le début"""
+        counts = Counter()
+        coalesced = 0
+        for room in self.rooms.values():
+            counts.update(room.command_counts)
+            coalesced += room.coalesced_moves
+        return {"tick": dict(counts), "coalesced_moves": coalesced}
+    
+    def close_connection(self, conn: ClientConnection):
+        """Ferme un socket client et le retire de sa salle"""
+        if conn.closed:
+            return
+        
+        conn.closed = True
+        self.udp_clients.pop(conn.udp_token, None)
+        try:
+            self.selector.unregister(conn.sock)
+        except (KeyError, ValueError):
+            pass
+        try:
+            conn.sock.close()
+        except OSError:
+            pass
+        
+        if conn.room is not None:
+            conn.room.remove_connection(conn)
     
     def stop(self):
         """Arrête le serveur"""
         self.running = False
         
-        for player in list(self.players.values()):
-            try:
-                player.connection.close()
-            except:
-                pass
+        for room in self.rooms.values():
+            for conn in [p.connection for p in room.players.values()] + list(room.pending_connections.values()):
+                try:
+                    conn.sock.close()
+                except:
+                    pass
         
         if self.server_socket:
             self.server_socket.close()
+        if self.udp_socket:
+            self.udp_socket.close()
+        
+        self.selector.close()
         
         print("✅ Serveur arrêté")
 
@@ -593,5 +1285,9 @@ if __name__ == "__main__":
     if len(sys.argv) > 1:
         port = int(sys.argv[1])
     
-    server = SpaceBattleServer(port=port)
+    max_rooms = 64
+    if len(sys.argv) > 2:
+        max_rooms = int(sys.argv[2])
+    
+    server = SpaceBattleServer(port=port, max_rooms=max_rooms)
     server.start()
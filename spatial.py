@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+🗺️ SPACE BATTLE - GRILLE SPATIALE
+Grille uniforme pour trouver rapidement les objets proches d'une zone
+"""
+
+from typing import Dict, List, Tuple
+
+
+class SpatialGrid:
+    """Grille uniforme: chaque cellule contient les objets dont la position (ou le disque) la touche"""
+    def __init__(self, cell_size: int = 400):
+        self.cell_size = cell_size
+        self.cells: Dict[Tuple[int, int], List] = {}
+        self.positions = {}
+        self.radii = {}
+    
+    def cell_of(self, x, y):
+        return int(x // self.cell_size), int(y // self.cell_size)
+    
+    def cells_touching(self, x, y, radius):
+        """Cellules couvertes par le carré englobant du disque"""
+        cx0, cy0 = self.cell_of(x - radius, y - radius)
+        cx1, cy1 = self.cell_of(x + radius, y + radius)
+        return [(cx, cy) for cx in range(cx0, cx1 + 1) for cy in range(cy0, cy1 + 1)]
+    
+    def clear(self):
+        self.cells.clear()
+        self.positions.clear()
+        self.radii.clear()
+    
+    def __len__(self):
+        return len(self.positions)
+    
+    def __contains__(self, obj_id):
+        return obj_id in self.positions
+    
+    def insert(self, obj_id, x, y, radius=0):
+        """Ajoute un objet ponctuel, ou un disque s'il a un rayon"""
+        for cell in self.cells_touching(x, y, radius):
+            self.cells.setdefault(cell, []).append(obj_id)
+        self.positions[obj_id] = (x, y)
+        self.radii[obj_id] = radius
+    
+    def remove(self, obj_id):
+        """Retire un objet (sans effet s'il est absent)"""
+        if obj_id not in self.positions:
+            return
+        x, y = self.positions[obj_id]
+        # Cellules d'abord: une requête concurrente ne voit jamais un objet sans position
+        for cell in self.cells_touching(x, y, self.radii[obj_id]):
+            members = self.cells.get(cell)
+            if members and obj_id in members:
+                members.remove(obj_id)
+                if not members:
+                    del self.cells[cell]
+        del self.positions[obj_id]
+        del self.radii[obj_id]
+    
+    def move(self, obj_id, x, y):
+        """Déplace un objet déjà présent (même rayon)"""
+        radius = self.radii.get(obj_id, 0)
+        self.remove(obj_id)
+        self.insert(obj_id, x, y, radius)
+    
+    def query_rect(self, x0, y0, x1, y1):
+        """Ensemble des objets dont la position est dans le rectangle"""
+        found = set()
+        cx0, cy0 = self.cell_of(x0, y0)
+        cx1, cy1 = self.cell_of(x1, y1)
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                for obj_id in self.cells.get((cx, cy), ()):
+                    x, y = self.positions[obj_id]
+                    if x0 <= x <= x1 and y0 <= y <= y1:
+                        found.add(obj_id)
+        return found
+    
+    def query_circle(self, x, y, radius=0):
+        """Objets dont le disque touche celui de centre (x, y), du plus proche au plus loin"""
+        found = []
+        seen = set()
+        for cell in self.cells_touching(x, y, radius):
+            for obj_id in self.cells.get(cell, ()):
+                if obj_id in seen:
+                    continue
+                seen.add(obj_id)
+                position = self.positions.get(obj_id)
+                if position is None:
+                    continue
+                dx = position[0] - x
+                dy = position[1] - y
+                reach = self.radii.get(obj_id, 0) + radius
+                dist2 = dx * dx + dy * dy
+                if dist2 < reach * reach:
+                    found.append((dist2, obj_id))
+        found.sort(key=lambda hit: hit[0])
+        return [obj_id for _, obj_id in found]
+    
+    def query_point(self, x, y):
+        """Objets dont le disque contient le point"""
+        return self.query_circle(x, y, 0)
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+🌟 SPACE BATTLE - CACHE DE SPRITES
+Halos, boucliers et autres surfaces transparentes dessinés une fois puis réutilisés
+"""
+
+import pygame
+
+from lru import SurfaceLRU
+
+SPRITE_CACHE_BYTES = 32 * 1024 * 1024  # Les nébuleuses font jusqu'à 800x800 px
+
+# Sprites par clé, construits au premier usage (get(clé, build))
+sprite_cache = SurfaceLRU(SPRITE_CACHE_BYTES)
+
+
+def quantize(value: float, step: int) -> int:
+    """Arrondit au multiple de step (au moins step): un sprite par palier au lieu d'un par valeur"""
+    return max(step, int(round(value / step)) * step)
+
+
+def glow(radius: int, color, alpha: int):
+    """Disque plein semi-transparent de ce rayon (surface 2r x 2r)"""
+    return layered_glow(((radius, alpha),), color)
+
+
+def layered_glow(layers, color):
+    """Disques concentriques ((rayon, alpha), ...) fondus l'un sur l'autre, dans l'ordre donné"""
+    layers = tuple(layers)
+    color = tuple(color[:3])
+    
+    def build():
+        size = max(radius for radius, _ in layers)
+        sprite = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
+        for radius, alpha in layers:
+            layer = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+            pygame.draw.circle(layer, (*color, alpha), (radius, radius), radius)
+            sprite.blit(layer, (size - radius, size - radius))
+        return sprite
+    
+    return sprite_cache.get(("glow", layers, color), build)
+
+
+def overlay(width: int, height: int, color):
+    """Rectangle plein (RGBA) pour assombrir l'écran ou servir de fond de panneau"""
+    def build():
+        sprite = pygame.Surface((width, height), pygame.SRCALPHA)
+        sprite.fill(color)
+        return sprite
+    
+    return sprite_cache.get(("overlay", width, height, tuple(color)), build)
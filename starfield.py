@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+✨ SPACE BATTLE - CHAMP D'ÉTOILES
+Étoiles en tableaux NumPy sur plusieurs plans de profondeur (parallaxe): scintillement
+et position calculés en une passe, pixels écrits directement dans l'écran (surfarray)
+"""
+
+import numpy as np
+import pygame
+
+# Plans de profondeur: (vitesse relative à la caméra, nombre d'étoiles, taille max)
+# Le plan 1.0 correspond aux 200 étoiles d'origine
+STAR_LAYERS = (
+    (0.3, 1500, 1),
+    (0.6, 400, 2),
+    (1.0, 200, 3),
+)
+
+
+def _stamp(radius: int):
+    """Décalages des pixels que pygame.draw.circle allume pour ce rayon"""
+    scratch = pygame.Surface((radius * 2 + 3, radius * 2 + 3))
+    center = radius + 1
+    pygame.draw.circle(scratch, (255, 255, 255), (center, center), radius)
+    return np.argwhere(pygame.surfarray.array2d(scratch) != 0) - center
+
+
+class StarField:
+    """Étoiles en coordonnées écran (repliées sur la taille de la vue), décalées par la caméra selon leur plan"""
+    def __init__(self, width: int, height: int, layers=STAR_LAYERS):
+        self.width = width
+        self.height = height
+        
+        depth, size = [], []
+        for layer_depth, count, max_size in layers:
+            depth.append(np.full(count, layer_depth, np.float32))
+            size.append(np.random.randint(1, max_size + 1, count))
+        # Triées par taille: chaque taille est une tranche contiguë des tableaux
+        order = np.argsort(np.concatenate(size), kind="stable")
+        self.depth = np.concatenate(depth)[order]
+        self.size = np.concatenate(size)[order]
+        count = len(self.depth)
+        # Positions (x, y) empilées: une seule passe pour les deux axes
+        self.position = np.stack([np.random.uniform(0, width, count),
+                                  np.random.uniform(0, height, count)]).astype(np.float32)
+        self.view = np.array([[width], [height]], np.float32)
+        self.brightness = np.random.randint(100, 256, count).astype(np.float32)
+        self.twinkle_speed = np.random.uniform(0.02, 0.08, count).astype(np.float32)
+        
+        # Par taille: tranche d'étoiles et décalages (en index de pixel) du motif
+        self.groups = []
+        self.margin = 0
+        start = 0
+        for radius in np.unique(self.size).tolist():
+            end = start + int(np.count_nonzero(self.size == radius))
+            stamp = _stamp(radius)
+            self.groups.append((slice(start, end), (stamp[:, 1] * width + stamp[:, 0]).astype(np.int32)))
+            # Centres gardés à cette distance des bords: aucun pixel hors de l'écran, pas de masque
+            self.margin = max(self.margin, int(np.abs(stamp).max()))
+            start = end
+        self.gray = {}  # Format de surface -> couleur native de chaque niveau de gris
+        self.density = 1.0  # Part des étoiles dessinées (qualité réduite)
+    
+    def __len__(self):
+        return len(self.depth)
+    
+    def gray_levels(self, screen, dtype):
+        """Valeurs de pixel (format de l'écran) des gris 0..255"""
+        key = (screen.get_bitsize(), screen.get_masks())
+        levels = self.gray.get(key)
+        if levels is None:
+            levels = np.array([screen.map_rgb((b, b, b)) for b in range(256)], np.int64).astype(dtype)
+            self.gray[key] = levels
+        return levels
+    
+    def draw(self, screen, camera_x: float, camera_y: float, time: int):
+        """Dessine toutes les étoiles (scintillement selon time, en images)"""
+        twinkle = np.sin(time * self.twinkle_speed) * 0.3 + 0.7
+        brightness = (self.brightness * twinkle).astype(np.intp)
+        # Repli sur la vue: p - vue * floor(p / vue) (bien plus rapide que % sur des flottants)
+        position = self.position - np.array([[camera_x], [camera_y]], np.float32) * self.depth
+        position -= self.view * np.floor(position / self.view)
+        sx, sy = position.astype(np.int32)
+        
+        try:
+            pixels = pygame.surfarray.pixels2d(screen)
+        except ValueError:
+            pixels = None
+        if pixels is None or pixels.shape != (self.width, self.height) or not pixels.T.flags.c_contiguous:
+            # Pas d'accès direct aux pixels (24 bits, pitch avec bourrage): un cercle par étoile
+            del pixels
+            for x, y, b, radius in zip(sx.tolist(), sy.tolist(), brightness.tolist(), self.size.tolist()):
+                pygame.draw.circle(screen, (b, b, b), (x, y), radius)
+            return
+        
+        m = self.margin
+        centers = np.clip(sy, m, self.height - 1 - m) * self.width + np.clip(sx, m, self.width - 1 - m)
+        colors = self.gray_levels(screen, pixels.dtype)[brightness]
+        # Vue 1D (ligne par ligne) des pixels de l'écran
+        flat = pixels.T.reshape(-1)
+        for stars, offsets in self.groups:
+            # Positions tirées au hasard: le début de chaque tranche est un échantillon uniforme
+            stars = slice(stars.start, stars.start + int((stars.stop - stars.start) * self.density))
+            flat[centers[stars, None] + offsets] = colors[stars, None]
+        del pixels, flat  # Déverrouille l'écran
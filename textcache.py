@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+🔤 SPACE BATTLE - CACHE DE TEXTE
+Polices chargées une seule fois et textes rendus gardés en cache (LRU borné en mémoire)
+"""
+
+import pygame
+
+from lru import SurfaceLRU
+
+TEXT_CACHE_BYTES = 4 * 1024 * 1024  # Pixels gardés au maximum (~4 Mo)
+
+_fonts = {}
+
+
+def get_font(size: int):
+    """Police par défaut à cette taille, chargée au premier appel"""
+    font = _fonts.get(size)
+    if font is None:
+        font = _fonts[size] = pygame.font.Font(None, size)
+    return font
+
+
+class TextCache(SurfaceLRU):
+    """Surfaces de texte par (texte, taille, couleur); les moins récemment utilisées partent en premier"""
+    def __init__(self, max_bytes=TEXT_CACHE_BYTES):
+        super().__init__(max_bytes)
+    
+    def render(self, text: str, size: int, color):
+        return self.get((text, size, tuple(color)), lambda: get_font(size).render(text, True, color))
+
+
+text_cache = TextCache()
+
+
+def render_text(text: str, size: int, color):
+    """Texte rendu (antialiasé) via le cache partagé"""
+    return text_cache.render(text, size, color)
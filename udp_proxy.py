@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+🧪 Injecteur de pertes/latence UDP pour tester Space Battle en local
+Se place entre les clients et le serveur pour le canal UDP seulement.
+
+Usage: python udp_proxy.py <port_écoute> <ip_serveur> <port_serveur> [perte_%] [latence_ms] [gigue_ms]
+Puis:  python client.py 127.0.0.1 3500 --udp-port=<port_écoute>
+"""
+
+import heapq
+import random
+import selectors
+import socket
+import sys
+import threading
+import time
+
+
+class LossyUDPProxy:
+    """Relaie les datagrammes en perdant/retardant/désordonnant une partie d'entre eux"""
+    def __init__(self, listen_port, server_addr, loss=0.0, latency=0.0, jitter=0.0):
+        self.server_addr = server_addr
+        self.loss = loss  # Probabilité de perte (0-1)
+        self.latency = latency  # Secondes
+        self.jitter = jitter  # Secondes (± autour de la latence, peut réordonner)
+
+        self.selector = selectors.DefaultSelector()
+        self.listen_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.listen_socket.bind(('0.0.0.0', listen_port))
+        self.listen_socket.setblocking(False)
+        self.selector.register(self.listen_socket, selectors.EVENT_READ, data=None)
+
+        # Un socket vers le serveur par client (le serveur voit une adresse par client)
+        self.upstream = {}  # adresse client -> socket vers le serveur
+        self.pending = []  # Tas de (heure d'envoi, n°, socket, données, destination)
+        self.counter = 0
+        self.forwarded = 0
+        self.dropped = 0
+        self.running = False
+
+    def start(self):
+        self.running = True
+        thread = threading.Thread(target=self.run, daemon=True)
+        thread.start()
+        return thread
+
+    def stop(self):
+        self.running = False
+
+    def schedule(self, sock, data, destination):
+        if random.random() < self.loss:
+            self.dropped += 1
+            return
+        delay = max(0.0, self.latency + random.uniform(-self.jitter, self.jitter))
+        self.counter += 1
+        heapq.heappush(self.pending, (time.perf_counter() + delay, self.counter, sock, data, destination))
+
+    def run(self):
+        while self.running:
+            timeout = 0.1
+            if self.pending:
+                timeout = max(0.0, min(timeout, self.pending[0][0] - time.perf_counter()))
+
+            for key, _ in self.selector.select(timeout):
+                while True:
+                    try:
+                        data, address = key.fileobj.recvfrom(65536)
+                    except (BlockingIOError, InterruptedError):
+                        break
+                    except OSError:
+                        break
+
+                    if key.data is None:
+                        # Client -> serveur
+                        upstream = self.upstream.get(address)
+                        if upstream is None:
+                            upstream = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+                            upstream.setblocking(False)
+                            self.selector.register(upstream, selectors.EVENT_READ, data=address)
+                            self.upstream[address] = upstream
+                        self.schedule(upstream, data, self.server_addr)
+                    else:
+                        # Serveur -> client
+                        self.schedule(self.listen_socket, data, key.data)
+
+            now = time.perf_counter()
+            while self.pending and self.pending[0][0] <= now:
+                _, _, sock, data, destination = heapq.heappop(self.pending)
+                try:
+                    sock.sendto(data, destination)
+                    self.forwarded += 1
+                except OSError:
+                    pass
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 4:
+        print("Usage: python udp_proxy.py <port_écoute> <ip_serveur> <port_serveur> "
+              "[perte_%] [latence_ms] [gigue_ms]")
+        print("Exemple: python udp_proxy.py 3600 127.0.0.1 3500 10 80 30")
+        sys.exit(1)
+
+    listen_port = int(sys.argv[1])
+    server_addr = (sys.argv[2], int(sys.argv[3]))
+    loss = float(sys.argv[4]) / 100 if len(sys.argv) > 4 else 0.0
+    latency = float(sys.argv[5]) / 1000 if len(sys.argv) > 5 else 0.0
+    jitter = float(sys.argv[6]) / 1000 if len(sys.argv) > 6 else 0.0
+
+    proxy = LossyUDPProxy(listen_port, server_addr, loss, latency, jitter)
+    print(f"🧪 Proxy UDP :{listen_port} -> {server_addr[0]}:{server_addr[1]} "
+          f"(perte {loss:.0%}, latence {latency * 1000:.0f} ms ± {jitter * 1000:.0f} ms)")
+    print(f"   Client: python client.py {server_addr[0]} {server_addr[1]} --udp-port={listen_port}")
+
+    try:
+        proxy.start()
+        while True:
+            time.sleep(5)
+            print(f"   📦 relayés: {proxy.forwarded}  perdus: {proxy.dropped}")
+    except KeyboardInterrupt:
+        proxy.stop()
+        print("\n🛑 Proxy arrêté")